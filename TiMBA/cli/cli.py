@@ -1,15 +1,20 @@
 from pathlib import Path
 import click
+import json
 import os
 import datetime as dt
-from TiMBA.main_runner.main_runner import main
+from TiMBA.main_runner.main_runner import run_worlds, compile_input, resume, monte_carlo
 from TiMBA.data_management.ParameterCollector import ParameterCollector
-from TiMBA.parameters import INPUT_WORLD_PATH
+from TiMBA.data_management.DataManager import DataManager
+from TiMBA.parameters import INPUT_WORLD_PATH, get_world_name
+from TiMBA.parameters.Defines import MonteCarloParameters
 import warnings
 warnings.simplefilter(action='ignore', category=FutureWarning)
 from TiMBA.user_io.default_parameters import (default_year, default_max_period, default_calc_product_price,
                                               default_calc_world_price, default_transportation_impexp_factor, default_MB,
-                                              global_material_balance, serialization_flag, constants,
+                                              default_optimization_backend, default_dynamization_backend,
+                                              default_read_workers, default_jobs,
+                                              global_material_balance, serialization_flag, checkpoint_flag, constants,
                                               dynamization_activated, cleaned_opt_quantity, capped_prices,
                                               verbose_optimization_logger, verbose_calculation_logger,
                                               read_additional_information_file)
@@ -40,13 +45,43 @@ from TiMBA.user_io.default_parameters import (default_year, default_max_period,
 @click.option('-GMB', '--global_material_balance', 'global_material_balance', default=global_material_balance,
               show_default=True, required=False, type=bool,
               help='Flag to activate global material balance balancing all wood flows globally')
+@click.option('-OB', '--optimization_backend', 'optimization_backend', default=default_optimization_backend,
+              show_default=True, required=False, type=str,
+              help="Flag to specify the optimization backend. Choose cvxpy to rebuild the optimization problem in each "
+                   "period and osqp to assemble and solve the problem directly with osqp (the osqp solver is only "
+                   "updated in following periods with unchanged problem structure). Following periods are only warm "
+                   "started from the solution of the previous period with osqp.")
+@click.option('-DB', '--dynamization_backend', 'dynamization_backend', default=default_dynamization_backend,
+              show_default=True, required=False, type=str,
+              help="Flag to specify the dynamization backend. Choose pandas for the dynamization functions of "
+                   "model_helpers and numpy for the fused numpy dynamization kernel (same results, faster for many "
+                   "repeated runs).")
+@click.option('-RW', '--read_workers', 'read_workers', default=default_read_workers,
+              show_default=True, required=False, type=click.IntRange(min=1),
+              help="Number of processes parsing the sheets of the input files in parallel. 1 reads the sheets "
+                   "sequentially.")
+@click.option('-J', '--jobs', 'jobs', default=default_jobs,
+              show_default=True, required=False, type=click.IntRange(min=1),
+              help="Number of worlds computed in parallel processes. Each world writes its output to its own run "
+                   "directory and logs to its own log file. 1 computes the worlds one after another.")
 @click.option('-TF', '--trans_imp_exp_factor', 'transportation_impexp_factor', 
               default=default_transportation_impexp_factor, 
               show_default=True, required=True, type=float,
               help="Computation factor for Transportation Import/Export.")
 @click.option('-S', '--serialization', 'serialization', default=serialization_flag, 
               show_default=True, required=False, type=bool,
-              help="If true input data will be read from stored pkl files.")
+              help="If true input data will be read from stored pkl files. Preprocessed input data are cached by "
+                   "the content of the input files and preprocessed again if the input files change.")
+@click.option('-CK', '--checkpoint', 'checkpoint', default=checkpoint_flag,
+              show_default=True, required=False, type=bool,
+              help="If true the state of the run is saved after each period in the run directory (directory of the "
+                   "period output), so that the run can be resumed with --resume-from.")
+@click.option('--resume-from', 'resume_from', required=False, type=click.Path(
+    exists=True, file_okay=False, path_type=Path),
+              help="Run directory of a run with checkpoints. The run is resumed after the period given by --period "
+                   "with the options of the run, other options are ignored.")
+@click.option('--period', 'resume_period', required=False, type=click.IntRange(min=0),
+              help="Period of the checkpoint to resume from (default: last period with checkpoint).")
 @click.option('-D', '--dynamization', 'dynamization_activated', default=dynamization_activated, 
               show_default=True, required=False, type=bool,
               help="If true dynamization of TiMBA will be activated, if not the model will not develop further.")
@@ -68,43 +103,145 @@ from TiMBA.user_io.default_parameters import (default_year, default_max_period,
 
 
 def cli(year, max_period, calc_product_price, calc_world_price, material_balance, global_material_balance,
-        transportation_impexp_factor, serialization, dynamization_activated, cleaned_opt_quantity, capped_prices,
+        optimization_backend, dynamization_backend, read_workers, jobs, transportation_impexp_factor, serialization,
+        checkpoint, resume_from, resume_period, dynamization_activated, cleaned_opt_quantity, capped_prices,
         verbose_optimization_logger, verbose_calculation_logger, folderpath):
-    
+    PACKAGEDIR = Path(__file__).parents[1]
+    if resume_from is not None:
+        print(f"Resume run from:", resume_from, "\n")
+        resume(run_dir=str(resume_from), package_dir=PACKAGEDIR, period=resume_period)
+        return
+
     user_input_cli = {"year": year, "max_period": max_period, "product_price": calc_product_price,
                       "world_price": calc_world_price, "transportation_factor": transportation_impexp_factor,
                       "material_balance": material_balance, "global_material_balance": global_material_balance,
-                      "serialization": serialization, "constants": constants,
+                      "optimization_backend": optimization_backend, "dynamization_backend": dynamization_backend,
+                      "read_workers": read_workers, "serialization": serialization, "checkpoint": checkpoint,
+                      "constants": constants,
                       "dynamization_activated": dynamization_activated, "cleaned_opt_quantity": cleaned_opt_quantity,
                       "capped_prices": capped_prices, "verbose_optimization_logger": verbose_optimization_logger,
                       "verbose_calculation_logger": verbose_calculation_logger,
                       "addInfo": read_additional_information_file}
     
     Parameters = ParameterCollector(user_input=user_input_cli, folderpath=folderpath)
-    PACKAGEDIR = Path(__file__).parents[1]
-    world_list = os.listdir(INPUT_WORLD_PATH)
-    for world in world_list:
-        current_dt = dt.datetime.now().strftime("%Y%m%dT%H-%M-%S")
-        print(f"The model starts now:", (dt.datetime.now().strftime("%m/%d/%Y, %H:%M:%S")),"\n")
-        print(f"Path:", INPUT_WORLD_PATH)
-        print(f"Name of input file:", world[:len(world) - 5],"\n")
-        print(f"User input for model settings:\n",
-              f"Start year: {Parameters.year}\n",
-              f"Number of periods: {Parameters.max_period}\n",
-              f"Calculation of prices by: {Parameters.calc_product_prices}\n",
-              f"Calculation of world prices by: {Parameters.calc_world_prices}\n",
-              f"Material balance: {Parameters.material_balance}\n",
-              f"Input data through serialization: {Parameters.serialization}\n",
-              f"Dynamization activated: {Parameters.dynamization_activated}\n",
-              f"Prices are capped: {Parameters.capped_prices}\n",
-              f"Optimization gives verbose logs: {Parameters.verbose_optimization_logger}\n",
-              f"TiMBA gives verbose logs: {Parameters.verbose_calculation_logger}\n",
-              f"Read additional informations: {Parameters.addInfo}\n")
-        main(UserIO=Parameters,
-             world_version=world,
-             time_stamp=current_dt,
-             package_dir=PACKAGEDIR,
-             sc_name=world[:len(world) - 5])
+    world_list = DataManager.get_input_worlds(INPUT_WORLD_PATH)
+    print(f"Path:", INPUT_WORLD_PATH)
+    print(f"Worlds computed in parallel: {min(jobs, len(world_list))}\n")
+    print(f"User input for model settings:\n",
+          f"Start year: {Parameters.year}\n",
+          f"Number of periods: {Parameters.max_period}\n",
+          f"Calculation of prices by: {Parameters.calc_product_prices}\n",
+          f"Calculation of world prices by: {Parameters.calc_world_prices}\n",
+          f"Material balance: {Parameters.material_balance}\n",
+          f"Optimization backend: {Parameters.optimization_backend}\n",
+          f"Dynamization backend: {Parameters.dynamization_backend}\n",
+          f"Processes reading input sheets: {Parameters.read_workers}\n",
+          f"Input data through serialization: {Parameters.serialization}\n",
+          f"Checkpoints after each period: {Parameters.checkpoint}\n",
+          f"Dynamization activated: {Parameters.dynamization_activated}\n",
+          f"Prices are capped: {Parameters.capped_prices}\n",
+          f"Optimization gives verbose logs: {Parameters.verbose_optimization_logger}\n",
+          f"TiMBA gives verbose logs: {Parameters.verbose_calculation_logger}\n",
+          f"Read additional informations: {Parameters.addInfo}\n")
+    summaries = run_worlds(UserIO=Parameters, world_list=world_list, package_dir=PACKAGEDIR, jobs=jobs)
+    if any(summary["status"].startswith("failed") for summary in summaries):
+        raise SystemExit(1)
+
+
+@click.command(name="compile-input")
+@click.option('-Y', '--year', default=default_year,
+              show_default=True, required=True, type=int,
+              help="Starting year.")
+@click.option('-RW', '--read_workers', 'read_workers', default=default_read_workers,
+              show_default=True, required=False, type=click.IntRange(min=1),
+              help="Number of processes parsing the sheets of the input files in parallel. 1 reads the sheets "
+                   "sequentially.")
+@click.option('-FP', '--folderpath', 'folderpath', required=False, type=click.Path(
+    file_okay=False, writable=True, path_type=Path), help="Path to directory with Input/Output folder.")
+def compile_input_cli(year, read_workers, folderpath):
+    """
+    Compile the input data of all worlds into the input cache. Runs with serialization restore the compiled input
+    data memory-mapped as long as the input files do not change.
+    """
+    user_input_cli = {"year": year, "max_period": default_max_period, "product_price": default_calc_product_price,
+                      "world_price": default_calc_world_price,
+                      "transportation_factor": default_transportation_impexp_factor, "material_balance": default_MB,
+                      "global_material_balance": global_material_balance,
+                      "optimization_backend": default_optimization_backend,
+                      "dynamization_backend": default_dynamization_backend, "read_workers": read_workers,
+                      "serialization": True, "checkpoint": checkpoint_flag, "constants": constants,
+                      "dynamization_activated": dynamization_activated,
+                      "cleaned_opt_quantity": cleaned_opt_quantity, "capped_prices": capped_prices,
+                      "verbose_optimization_logger": verbose_optimization_logger,
+                      "verbose_calculation_logger": verbose_calculation_logger,
+                      "addInfo": read_additional_information_file}
+
+    Parameters = ParameterCollector(user_input=user_input_cli, folderpath=folderpath)
+    for world in DataManager.get_input_worlds(INPUT_WORLD_PATH):
+        print(f"Compile input data of:", get_world_name(world))
+        compile_input(UserIO=Parameters, world_version=world)
+
+
+@click.command(name="monte-carlo")
+@click.option('-P', '--parameters', 'parameters_path', required=True, type=click.Path(
+    exists=True, dir_okay=False, path_type=Path),
+              help="json file with the list of uncertain parameters, e.g. [{\"domain\": \"Demand\", \"column\": "
+                   "\"DElast\", \"distribution\": \"normal\", \"arguments\": {\"loc\": 1, \"scale\": 0.1}, "
+                   "\"mode\": \"scale\", \"per_row\": false}]. Distributions: normal, lognormal, uniform, "
+                   "triangular; modes: scale, shift, replace.")
+@click.option('-N', '--samples', 'num_samples', required=True, type=click.IntRange(min=1),
+              help="Number of Monte Carlo samples.")
+@click.option('--seed', 'seed', default=MonteCarloParameters.DEFAULT_SEED.value,
+              show_default=True, required=False, type=int,
+              help="Seed of the Monte Carlo run (samples are reproducible with the same seed).")
+@click.option('-J', '--jobs', 'jobs', default=default_jobs,
+              show_default=True, required=False, type=click.IntRange(min=1),
+              help="Number of processes computing samples.")
+@click.option('-BS', '--batch_size', 'batch_size', default=MonteCarloParameters.BATCH_SIZE.value,
+              show_default=True, required=False, type=click.IntRange(min=1),
+              help="Number of samples computed in one task of a process. Results are written after each batch.")
+@click.option('-Y', '--year', default=default_year,
+              show_default=True, required=True, type=int,
+              help="Starting year.")
+@click.option('-MP', '--max_period', 'max_period', default=default_max_period,
+              show_default=True, required=True, type=int,
+              help="Maximum amount of periods to forecast.")
+@click.option('-OB', '--optimization_backend', 'optimization_backend', default=default_optimization_backend,
+              show_default=True, required=False, type=str,
+              help="Flag to specify the optimization backend (cvxpy or osqp).")
+@click.option('-DB', '--dynamization_backend', 'dynamization_backend', default=default_dynamization_backend,
+              show_default=True, required=False, type=str,
+              help="Flag to specify the dynamization backend (pandas or numpy).")
+@click.option('-S', '--serialization', 'serialization', default=serialization_flag,
+              show_default=True, required=False, type=bool,
+              help="If true input data will be read from stored pkl files or the input cache.")
+@click.option('-FP', '--folderpath', 'folderpath', required=False, type=click.Path(
+    file_okay=False, writable=True, path_type=Path), help="Path to directory with Input/Output folder.")
+def monte_carlo_cli(parameters_path, num_samples, seed, jobs, batch_size, year, max_period, optimization_backend,
+                    dynamization_backend, serialization, folderpath):
+    """
+    Monte Carlo uncertainty analysis of all worlds. The input data of each world are read in once, the uncertain
+    parameters are drawn for each sample and the samples are computed in parallel processes.
+    """
+    with open(parameters_path, "r") as parameters_file:
+        parameters = json.load(parameters_file)
+    user_input_cli = {"year": year, "max_period": max_period, "product_price": default_calc_product_price,
+                      "world_price": default_calc_world_price,
+                      "transportation_factor": default_transportation_impexp_factor, "material_balance": default_MB,
+                      "global_material_balance": global_material_balance,
+                      "optimization_backend": optimization_backend, "dynamization_backend": dynamization_backend,
+                      "read_workers": default_read_workers, "serialization": serialization,
+                      "checkpoint": checkpoint_flag, "constants": constants,
+                      "dynamization_activated": dynamization_activated,
+                      "cleaned_opt_quantity": cleaned_opt_quantity, "capped_prices": capped_prices,
+                      "verbose_optimization_logger": False, "verbose_calculation_logger": False,
+                      "addInfo": read_additional_information_file}
+
+    Parameters = ParameterCollector(user_input=user_input_cli, folderpath=folderpath)
+    for world in DataManager.get_input_worlds(INPUT_WORLD_PATH):
+        print(f"Monte Carlo run of:", get_world_name(world), f"({num_samples} samples, {jobs} processes)")
+        monte_carlo(UserIO=Parameters, world_version=world, parameters=parameters, num_samples=num_samples,
+                    seed=seed, workers=jobs, batch_size=batch_size)
 
 
 if __name__ == '__main__':
@@ -70,6 +70,16 @@ class DataContainer:
     def update_domain_name(self, value):
         self.domain = value
 
+    @property
+    def data_periods(self) -> pd.DataFrame:
+        """
+        Results of all periods, built on demand from the results stored per period (period_results).
+        """
+        if "period_results" not in self.__dict__:
+            # containers serialized before the period results were introduced
+            return self.__dict__.get("data_periods")
+        return self.period_results.get_data_periods()
+
 
 class InterfaceWorldData(DataContainer, ABC):
     """
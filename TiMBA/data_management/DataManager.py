@@ -1,30 +1,39 @@
 import pandas as pd
 import numpy as np
+import scipy.sparse as sp
 
-from TiMBA.helpers.utils import DomainIterator, mask_data
+from TiMBA.helpers.utils import DomainIterator, mask_data, get_domain_codes
 from TiMBA.parameters.Domains import Domains, RestOfWorld
 from TiMBA.data_management.DataContainer import DataContainer, InterfaceWorldData, AdditionalInformation
-from TiMBA.parameters.Defines import Constants
+from TiMBA.data_management.PeriodResults import PeriodResults
+from TiMBA.parameters.Defines import Constants, InputFormat, SQLParameters
 from TiMBA.data_management.ParameterCollector import ParameterCollector
 from TiMBA.parameters.REGEX_patterns import PERIOD_PATTERN
+from TiMBA.parameters import get_world_name
 from TiMBA.parameters.paths import RESULTS_OUTPUT, RESULTS_OUTPUT_AGG, FOREST_OUTPUT, WORLD_PRICE_OUTPUT, MANUFACTURE_OUTPUT
+from TiMBA.parameters.paths import PERIOD_OUTPUT, MONTE_CARLO_OUTPUT
 from TiMBA.parameters.Defines import VarNames
 from TiMBA.logic.model_helpers import extract_product_groups
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
 from pathlib import Path
 from os import path
+import hashlib
+import json
 import os
+import sqlite3
 
 
 class DataManager:
 
     @staticmethod
-    def load_data(filepath, table_name, input_source):
+    def load_data(filepath, table_name, input_source, read_plan: dict = None):
         if input_source.lower() == "excel":
-            return DataManager.read_excel(filepath, table_name)
+            return DataManager.read_excel(filepath, table_name, read_plan)
         elif input_source.lower() == "csv":
-            return DataManager.read_csv(filepath)
+            return DataManager.read_csv(filepath, table_name, read_plan)
         elif input_source.lower() == "sql":
-            return DataManager.load_table()
+            return DataManager.load_table(filepath, table_name, read_plan)
         else:
             raise TypeError(f"Input source type {input_source} is not defined.")
 
@@ -55,17 +64,274 @@ class DataManager:
         Data.set_attribute(name, value)
 
     @staticmethod
-    def read_excel(input_filepath, table_name):
-        xlsx_connection = pd.ExcelFile(input_filepath)
-        return xlsx_connection.parse(table_name)
+    def read_excel(input_filepath, table_name, read_plan: dict = None):
+        """
+        Read sheets from Excel file. The workbook is opened once (read-only) and all requested sheets are parsed in one
+        pass.
+        :param input_filepath: path of the Excel file
+        :param table_name: sheet name, list of sheet names or None for all sheets
+        :param read_plan: keyword arguments for parsing each sheet (e.g. usecols), by sheet name
+        :return: DataFrame of the sheet or dict of DataFrames for a list of sheet names or None
+        """
+        with pd.ExcelFile(input_filepath) as xlsx_connection:
+            if read_plan is None:
+                return xlsx_connection.parse(table_name)
+            if isinstance(table_name, str):
+                return xlsx_connection.parse(table_name, **read_plan.get(table_name, {}))
+            if table_name is None:
+                table_name = xlsx_connection.sheet_names
+            return {sheet_name: xlsx_connection.parse(sheet_name, **read_plan.get(sheet_name, {}))
+                    for sheet_name in table_name}
 
     @staticmethod
-    def read_csv(input_filepath):
-        return pd.read_csv(input_filepath)
+    def get_input_source(filepath) -> str:
+        """
+        Input source of the input file: directories with one csv file per sheet are read as csv, files as Excel.
+        :param filepath: path of the input file or directory
+        """
+        database_path = os.path.dirname(filepath)
+        if database_path.lower().endswith(InputFormat.SQL_EXTENSION.value) and os.path.isfile(database_path):
+            return InputFormat.SQL.value
+        if os.path.isdir(filepath):
+            return InputFormat.CSV.value
+        return InputFormat.EXCEL.value
+
+    @staticmethod
+    def input_exists(filepath) -> bool:
+        """
+        Check if the input file, directory or world in a SQLite database (<database>.sqlite/<world>) exists.
+        :param filepath: path of the input file, directory or world in a SQLite database
+        """
+        if DataManager.get_input_source(filepath) == InputFormat.SQL.value:
+            database_path, world = os.path.split(filepath)
+            return world in DataManager.get_sql_worlds(database_path)
+        return os.path.exists(filepath)
+
+    @staticmethod
+    def get_input_worlds(input_path) -> list:
+        """
+        List the input worlds of the input directory. Worlds are Excel files, directories with one csv file per sheet
+        and worlds in SQLite databases (listed as <database>.sqlite/<world>).
+        :param input_path: input directory
+        """
+        input_worlds = []
+        for world in os.listdir(input_path):
+            if world.lower().endswith(InputFormat.SQL_EXTENSION.value):
+                input_worlds.extend(f"{world}/{sql_world}"
+                                    for sql_world in DataManager.get_sql_worlds(os.path.join(input_path, world)))
+            else:
+                input_worlds.append(world)
+        return input_worlds
+
+    @staticmethod
+    def read_csv(input_filepath, table_name=None, read_plan: dict = None):
+        """
+        Read sheets from a directory with one csv file per sheet (<sheet name>.csv), mirroring the sheets of an Excel
+        file. A single csv file is read as is.
+        :param input_filepath: path of the directory or csv file
+        :param table_name: sheet name, list of sheet names or None for all sheets
+        :param read_plan: keyword arguments for parsing each sheet (e.g. usecols), by sheet name
+        :return: DataFrame of the sheet or dict of DataFrames for a list of sheet names or None
+        """
+        if not os.path.isdir(input_filepath):
+            return pd.read_csv(input_filepath)
+        if read_plan is None:
+            read_plan = {}
+        if isinstance(table_name, str):
+            return DataManager.read_csv_sheet(input_filepath, table_name, **read_plan.get(table_name, {}))
+        if table_name is None:
+            table_name = DataManager.get_sheet_names(input_filepath)
+        return {sheet_name: DataManager.read_csv_sheet(input_filepath, sheet_name, **read_plan.get(sheet_name, {}))
+                for sheet_name in table_name}
+
+    @staticmethod
+    def read_csv_sheet(input_dirpath, sheet_name: str, **kwargs) -> pd.DataFrame:
+        """
+        Read one csv sheet with the C parser. All cells are parsed as strings and converted to numbers where possible.
+        Columns with only numbers are numeric, other columns keep integral numbers as int, so that the sheet matches
+        the sheet read from Excel.
+        :param input_dirpath: directory of the csv sheets
+        :param sheet_name: sheet name
+        :param kwargs: keyword arguments for parsing the sheet (e.g. usecols)
+        """
+        sheet_data = pd.read_csv(os.path.join(input_dirpath, f"{sheet_name}{InputFormat.CSV_EXTENSION.value}"),
+                                 dtype=str, engine="c", **kwargs)
+
+        def convert_column(column: pd.Series) -> pd.Series:
+            numeric = pd.to_numeric(column, errors="coerce")
+            is_number = numeric.notna()
+            if is_number.equals(column.notna()):
+                return numeric
+            values = column.to_numpy(dtype=object, copy=True)
+            values[is_number.to_numpy()] = [int(value) if value.is_integer() else value
+                                            for value in numeric[is_number].astype(float).tolist()]
+            return pd.Series(values, index=column.index, dtype=object)
+
+        return pd.DataFrame({column_num: convert_column(sheet_data.iloc[:, column_num])
+                             for column_num in range(sheet_data.shape[1])}).set_axis(sheet_data.columns, axis=1)
+
+    @staticmethod
+    def get_sql_worlds(database_path) -> list:
+        """
+        List the worlds stored in the SQLite database.
+        :param database_path: path of the SQLite database
+        """
+        with closing(sqlite3.connect(database_path)) as connection:
+            if not DataManager.sql_table_exists(connection, SQLParameters.WORLD_TABLE.value):
+                return []
+            return [world for world, in connection.execute(
+                f'SELECT "{SQLParameters.WORLD_COLUMN.value}" FROM "{SQLParameters.WORLD_TABLE.value}" '
+                f'ORDER BY "{SQLParameters.WORLD_COLUMN.value}"')]
+
+    @staticmethod
+    def get_sql_world_hash(filepath) -> str:
+        """
+        Hash of the content of a world in a SQLite database, stored when the world is written.
+        :param filepath: path of the world in the SQLite database (<database>.sqlite/<world>)
+        """
+        database_path, world = os.path.split(filepath)
+        with closing(sqlite3.connect(database_path)) as connection:
+            world_hash, = connection.execute(
+                f'SELECT "{SQLParameters.HASH_COLUMN.value}" FROM "{SQLParameters.WORLD_TABLE.value}" '
+                f'WHERE "{SQLParameters.WORLD_COLUMN.value}" = ?', (world,)).fetchone()
+        return world_hash
+
+    @staticmethod
+    def get_sql_columns(columns: list) -> str:
+        return ", ".join(f'"{column}"' for column in columns)
+
+    @staticmethod
+    def sql_table_exists(connection, table_name: str) -> bool:
+        return connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                                  (table_name,)).fetchone() is not None
 
     @staticmethod
-    def load_table():
-        raise NotImplementedError("No SQL-Table load currently implemented.")
+    def load_table(filepath, table_name=None, read_plan: dict = None, max_period: int = None, regions: list = None,
+                   commodities: list = None):
+        """
+        Read sheets of a world from a SQLite database. Each main domain is a table holding the sheets of all worlds,
+        indexed on region code, commodity code and period. Only the rows of the requested periods, regions and
+        commodities are loaded; rows without code or period (sheet description, period headers) are always loaded.
+        :param filepath: path of the world in the SQLite database (<database>.sqlite/<world>)
+        :param table_name: sheet name, list of sheet names or None for all sheets
+        :param read_plan: keyword arguments for parsing each sheet (usecols), by sheet name
+        :param max_period: last period loaded from the exogenous changes, None for all periods
+        :param regions: region codes loaded, None for all regions
+        :param commodities: commodity codes loaded, None for all commodities
+        :return: DataFrame of the sheet or dict of DataFrames for a list of sheet names or None
+        """
+        database_path, world = os.path.split(filepath)
+        if read_plan is None:
+            read_plan = {}
+        with closing(sqlite3.connect(database_path)) as connection:
+            sheet_columns = {sheet_name: json.loads(columns) for sheet_name, columns in connection.execute(
+                f'SELECT "{SQLParameters.SHEET_COLUMN.value}", "{SQLParameters.SHEET_COLUMNS_COLUMN.value}" '
+                f'FROM "{SQLParameters.SHEET_TABLE.value}" WHERE "{SQLParameters.WORLD_COLUMN.value}" = ?', (world,))}
+            if not sheet_columns:
+                raise KeyError(f"World {world} is not stored in {database_path}.")
+
+            def read_sheet(sheet_name: str) -> pd.DataFrame:
+                use_column = read_plan.get(sheet_name, {}).get("usecols")
+                columns = [column for column in sheet_columns[sheet_name]
+                           if use_column is None or (use_column(column) if callable(use_column)
+                                                     else column in use_column)]
+                conditions, parameters = [f'"{SQLParameters.WORLD_COLUMN.value}" = ?'], [world]
+                for index_column, values in [(SQLParameters.REGION_COLUMN.value, regions),
+                                             (SQLParameters.COMMODITY_COLUMN.value, commodities)]:
+                    if values is not None:
+                        conditions.append(f'("{index_column}" IS NULL OR "{index_column}" IN '
+                                          f'({", ".join("?" * len(values))}))')
+                        parameters.extend(values)
+                if max_period is not None:
+                    conditions.append(f'("{SQLParameters.PERIOD_COLUMN.value}" IS NULL OR '
+                                      f'"{SQLParameters.PERIOD_COLUMN.value}" <= ?)')
+                    parameters.append(max_period)
+                sheet_data = pd.read_sql_query(
+                    f'SELECT {DataManager.get_sql_columns(columns)} FROM "{sheet_name}" '
+                    f'WHERE {" AND ".join(conditions)} ORDER BY "{SQLParameters.ROW_COLUMN.value}"',
+                    connection, params=parameters)
+                return sheet_data.fillna(np.nan)
+
+            if isinstance(table_name, str):
+                return read_sheet(table_name)
+            if table_name is None:
+                table_name = list(sheet_columns)
+            return {sheet_name: read_sheet(sheet_name) for sheet_name in table_name}
+
+    @staticmethod
+    def write_table(input_filepath, database_path, world: str = None):
+        """
+        Write the sheets of a world (Excel file or directory with one csv file per sheet) to a SQLite database. Each
+        main domain is a table holding the sheets of all worlds, indexed on region code, commodity code and period.
+        An existing world with the same name is replaced.
+        :param input_filepath: path of the world file or directory
+        :param database_path: path of the SQLite database
+        :param world: name of the world in the database, by default the name of the world file
+        """
+        if world is None:
+            world = get_world_name(os.path.basename(os.path.normpath(input_filepath)))
+        world_sheets = DataManager.load_data(input_filepath, None, DataManager.get_input_source(input_filepath))
+        domains = {str(domain): domain for domain in DomainIterator.get_domain(DomainIterator.MAIN_DOMAINS)}
+        world_hash = hashlib.sha256()
+        index_columns = [SQLParameters.WORLD_COLUMN.value, SQLParameters.ROW_COLUMN.value,
+                         SQLParameters.REGION_COLUMN.value, SQLParameters.COMMODITY_COLUMN.value,
+                         SQLParameters.PERIOD_COLUMN.value]
+
+        with closing(sqlite3.connect(database_path)) as connection, connection:
+            connection.execute(f'CREATE TABLE IF NOT EXISTS "{SQLParameters.WORLD_TABLE.value}" '
+                               f'("{SQLParameters.WORLD_COLUMN.value}" TEXT PRIMARY KEY, '
+                               f'"{SQLParameters.HASH_COLUMN.value}" TEXT)')
+            connection.execute(f'CREATE TABLE IF NOT EXISTS "{SQLParameters.SHEET_TABLE.value}" '
+                               f'("{SQLParameters.WORLD_COLUMN.value}" TEXT, "{SQLParameters.SHEET_COLUMN.value}" TEXT, '
+                               f'"{SQLParameters.SHEET_COLUMNS_COLUMN.value}" TEXT, '
+                               f'PRIMARY KEY ("{SQLParameters.WORLD_COLUMN.value}", '
+                               f'"{SQLParameters.SHEET_COLUMN.value}"))')
+            connection.execute(f'DELETE FROM "{SQLParameters.SHEET_TABLE.value}" '
+                               f'WHERE "{SQLParameters.WORLD_COLUMN.value}" = ?', (world,))
+
+            for sheet_name, sheet_data in world_sheets.items():
+                world_hash.update(sheet_name.encode())
+                world_hash.update(sheet_data.to_csv(index=False).encode())
+                sheet_columns = [str(column) for column in sheet_data.columns]
+                sheet_data = sheet_data.set_axis(sheet_columns, axis=1)
+                sheet_table = sheet_data.astype(object)
+                description_marker = np.flatnonzero(sheet_table.iloc[:, 0] == InputFormat.DESCRIPTION_MARKER.value)
+                is_content = np.arange(len(sheet_table)) >= (description_marker[-1] + 1 if len(description_marker)
+                                                             else 0)
+
+                sheet_table[SQLParameters.WORLD_COLUMN.value] = world
+                sheet_table[SQLParameters.ROW_COLUMN.value] = np.arange(len(sheet_table))
+                for index_column, code_attribute in [(SQLParameters.REGION_COLUMN.value, "region_code"),
+                                                     (SQLParameters.COMMODITY_COLUMN.value, "commodity_code")]:
+                    if sheet_name in domains:
+                        codes = get_domain_codes(sheet_data, domains[sheet_name], code_attribute)
+                        sheet_table[index_column] = codes.where(is_content, None)
+                    else:
+                        sheet_table[index_column] = None
+                periods = sheet_table.iloc[:, 0].astype(str).str.extract(PERIOD_PATTERN)[0].astype(float).ffill()
+                sheet_table[SQLParameters.PERIOD_COLUMN.value] = periods.where(is_content, None)
+
+                if DataManager.sql_table_exists(connection, sheet_name):
+                    connection.execute(f'DELETE FROM "{sheet_name}" WHERE "{SQLParameters.WORLD_COLUMN.value}" = ?',
+                                       (world,))
+                    table_columns = [column for _, column, *_ in connection.execute(
+                        f'PRAGMA table_info("{sheet_name}")')]
+                    for column in sheet_columns:
+                        if column not in table_columns:
+                            connection.execute(f'ALTER TABLE "{sheet_name}" ADD COLUMN "{column}"')
+                else:
+                    connection.execute(f'CREATE TABLE "{sheet_name}" '
+                                       f'({DataManager.get_sql_columns(index_columns + sheet_columns)})')
+                    for index_column in index_columns[2:]:
+                        connection.execute(f'CREATE INDEX "{sheet_name}_{index_column}" ON "{sheet_name}" '
+                                           f'("{SQLParameters.WORLD_COLUMN.value}", "{index_column}")')
+                sheet_table[index_columns + sheet_columns].to_sql(sheet_name, connection, if_exists="append",
+                                                                  index=False)
+                connection.execute(f'INSERT INTO "{SQLParameters.SHEET_TABLE.value}" VALUES (?, ?, ?)',
+                                   (world, sheet_name, json.dumps(sheet_columns)))
+
+            connection.execute(f'INSERT OR REPLACE INTO "{SQLParameters.WORLD_TABLE.value}" VALUES (?, ?)',
+                               (world, world_hash.hexdigest()))
 
     @staticmethod
     def write_to_csv(Data: DataContainer, attribute: str, target_filepath: str, mode: str = "a+", sep: str = ",",
@@ -75,14 +341,17 @@ class DataManager:
     @staticmethod
     def serialize_to_pickle(obj, target_filepath: str):
         """
-        Write ("wb") object as pickle file to target path.
+        Write ("wb") object as pickle file to target path. The file is written under a temporary name and renamed when
+        complete, so that processes writing the same path (worlds computed in parallel) do not leave a corrupt file.
         :param obj: Object to save
         :param target_filepath: file path to save the object
         """
         import pickle
         import gzip
-        with gzip.open(target_filepath, "wb") as pkl_file:
+        tmp_filepath = f"{target_filepath}.{os.getpid()}.tmp"
+        with gzip.open(tmp_filepath, "wb") as pkl_file:
             pickle.dump(obj, pkl_file)
+        os.replace(tmp_filepath, target_filepath)
 
     @staticmethod
     def restore_from_pickle(src_filepath: str):
@@ -97,25 +366,94 @@ class DataManager:
         return obj
 
     @staticmethod
-    def read_world_data(Data: DataContainer, domain_name: str) -> None:
+    def read_world_data(Data: DataContainer, domain_name: str, world_sheets: dict = None) -> None:
         """
         Load world.xlsx and save to DataContainer.
         :param Data: DataContainer to be filled with data from Excel
         :param domain_name: Domain specific name
+        :param world_sheets: Sheets already read from world.xlsx (dict of DataFrames). If None, the sheet is loaded.
         """
-        Data.data = DataManager.load_data(Data.filepath, domain_name, "Excel")
+        if world_sheets is None:
+            read_plan = dict(DomainIterator.get_domain_read_plan(DomainIterator.MAIN_DOMAINS))
+            Data.data = DataManager.load_data(Data.filepath, domain_name, DataManager.get_input_source(Data.filepath),
+                                              read_plan)
+        else:
+            Data.data = world_sheets[domain_name]
         Data.update_domain_name(domain_name)
 
     @staticmethod
-    def read_world(WorldData: InterfaceWorldData):
+    def read_world(WorldData: InterfaceWorldData, world_sheets: dict = None):
         """
-        Load world.xlsx and saved them to InterfaceWorldData
+        Load world.xlsx (or directory with one csv file per sheet) and saved them to InterfaceWorldData
         :param WorldData: InterfaceworldData to be filled with data from Excel
-        """
-        for domain_name in DomainIterator.get_domain_names(DomainIterator.MAIN_DOMAINS):
+        :param world_sheets: Sheets already read from world.xlsx (dict of DataFrames). If None, the sheets are loaded.
+        """
+        read_plan = dict(DomainIterator.get_domain_read_plan(DomainIterator.MAIN_DOMAINS))
+        domain_names = list(read_plan)
+        if world_sheets is None:
+            world_sheets = DataManager.load_data(WorldData.filepath, domain_names,
+                                                 DataManager.get_input_source(WorldData.filepath), read_plan)
+        for domain_name in domain_names:
             WorldData.check_attr(domain_name, temporary=True)
             WorldData.set_attribute(domain_name, DataContainer(WorldData.filepath))
-            DataManager.read_world_data(WorldData[domain_name], domain_name)
+            DataManager.read_world_data(WorldData[domain_name], domain_name, world_sheets)
+
+    @staticmethod
+    def get_sheet_names(filepath) -> list:
+        """
+        Sheet names of the input file (Excel file, directory with one csv file per sheet or world in a SQLite database)
+        without parsing the sheets.
+        :param filepath: path of the input file
+        """
+        input_source = DataManager.get_input_source(filepath)
+        if input_source == InputFormat.SQL.value:
+            database_path, world = os.path.split(filepath)
+            with closing(sqlite3.connect(database_path)) as connection:
+                return [sheet_name for sheet_name, in connection.execute(
+                    f'SELECT "{SQLParameters.SHEET_COLUMN.value}" FROM "{SQLParameters.SHEET_TABLE.value}" '
+                    f'WHERE "{SQLParameters.WORLD_COLUMN.value}" = ?', (world,))]
+        if input_source == InputFormat.CSV.value:
+            return sorted(os.path.splitext(filename)[0] for filename in os.listdir(filepath)
+                          if filename.lower().endswith(InputFormat.CSV_EXTENSION.value))
+        with pd.ExcelFile(filepath) as xlsx_connection:
+            return xlsx_connection.sheet_names
+
+    @staticmethod
+    def read_sheet(filepath, sheet_name: str, read_plan: dict = None) -> pd.DataFrame:
+        return DataManager.load_data(filepath, sheet_name, DataManager.get_input_source(filepath), read_plan)
+
+    @staticmethod
+    def read_sheets(read_tasks: list, read_workers: int) -> list:
+        """
+        Parse sheets in parallel processes. Each process opens the input file and parses one sheet at a time; the
+        DataFrames are sent back pickled (column blocks).
+        :param read_tasks: list of (filepath, sheet name, read plan)
+        :param read_workers: number of processes
+        :return: list of DataFrames in order of the read tasks
+        """
+        with ProcessPoolExecutor(max_workers=min(read_workers, len(read_tasks))) as executor:
+            return list(executor.map(DataManager.read_sheet, *zip(*read_tasks)))
+
+    @staticmethod
+    def read_input_sheets(WorldData: InterfaceWorldData, AdditionalInfo: AdditionalInformation,
+                          WorldPrices: DataContainer, read_workers: int):
+        """
+        Read the sheets of world.xlsx, additional information and world prices in parallel processes.
+        :param WorldData: World data collection
+        :param AdditionalInfo: Additional information collection
+        :param WorldPrices: contain data about world prices
+        :param read_workers: number of processes
+        :return: world sheets, additional information sheets and world price sheets (dicts of DataFrames)
+        """
+        read_plan = dict(DomainIterator.get_domain_read_plan(DomainIterator.MAIN_DOMAINS))
+        input_sheet_names = [(WorldData.filepath, list(read_plan), read_plan),
+                             (AdditionalInfo.filepath, DataManager.get_sheet_names(AdditionalInfo.filepath), None),
+                             (WorldPrices.filepath, [InputFormat.WORLD_PRICE_SHEET.value], None)]
+        read_tasks = [(filepath, sheet_name, sheet_read_plan)
+                      for filepath, sheet_names, sheet_read_plan in input_sheet_names for sheet_name in sheet_names]
+        sheets = iter(DataManager.read_sheets(read_tasks, read_workers))
+        return tuple({sheet_name: next(sheets) for sheet_name in sheet_names}
+                     for _, sheet_names, _ in input_sheet_names)
 
     @staticmethod
     def retrieve_periods(Data: DataContainer):
@@ -239,73 +577,70 @@ class DataManager:
         """
         Align all relevant dataframes for further calculations to the uniform length of the base_matrix.
         Aligned dataframes are saved as a new attribute "data_aligned" to each Domains of ALIGN_DOMAINS
-        For ExogChange-Domains, each period is aligned separatly and period info are added
+        For ExogChange-Domains, all periods are aligned in one merge against the period x region x commodity index of
+        the base_matrix, data_aligned holds one block of rows for each period (period-major) and period info are added
         :param WorldData: World data collection
         """
+        base_key = [Domains.Regions.region_code, Domains.Commodities.commodity_code]
+        aligned_period = "aligned_period"
         for domain in DomainIterator.get_domain(DomainIterator.ALIGN_DOMAINS):
             domain_name = str(domain)
             domain_region_code = domain.region_code
             domain_commodity_code = domain.commodity_code
             if 'ExogChange' in domain_name:
-                for year in sorted(set(WorldData[domain_name].data['Period'])):
-                    subset = WorldData[domain_name].data[WorldData[domain_name].data['Period'] == year]
-                    data_aligned = pd.merge(
-                        WorldData.data_aligned, subset,
-                        left_on=[Domains.Regions.region_code, Domains.Commodities.commodity_code],
-                        right_on=[domain_region_code, domain_commodity_code], how='left'
-                    )
-                    period_length = subset['ForecastYears'].unique()
-                    data_aligned.loc[:, 'Period'] = data_aligned['Period'].fillna(year)
-                    data_aligned.loc[:, 'ForecastYears'] = data_aligned['ForecastYears'].fillna(period_length[0])
-                    if not hasattr(WorldData[domain_name], "data_aligned"):
-                        WorldData[domain_name].set_attribute("data_aligned", data_aligned.copy())
-                    else:
-                        WorldData[domain_name].data_aligned = pd.concat(
-                            [WorldData[domain_name].data_aligned, data_aligned.copy()], axis=0).reset_index(drop=True)
+                data = WorldData[domain_name].data
+                period_length = data.drop_duplicates("Period").set_index("Period")["ForecastYears"]
+                periods = sorted(set(data["Period"]))
+                period_index = WorldData.data_aligned.iloc[
+                    np.tile(np.arange(len(WorldData.data_aligned)), len(periods))].reset_index(drop=True)
+                period_index[aligned_period] = np.repeat(np.array(periods, dtype=object), len(WorldData.data_aligned))
+
+                data_aligned = pd.merge(period_index, data, left_on=[aligned_period] + base_key,
+                                        right_on=["Period", domain_region_code, domain_commodity_code], how='left')
+                data_aligned["Period"] = data_aligned["Period"].fillna(data_aligned[aligned_period])
+                data_aligned["ForecastYears"] = data_aligned["ForecastYears"].fillna(
+                    data_aligned[aligned_period].map(period_length))
+                WorldData[domain_name].set_attribute("data_aligned", data_aligned.drop(columns=aligned_period))
             else:
                 WorldData[domain_name].set_attribute("data_aligned", WorldData.data_aligned.merge(
-                    WorldData[domain_name].data,
-                    left_on=[Domains.Regions.region_code, Domains.Commodities.commodity_code],
+                    WorldData[domain_name].data, left_on=base_key,
                     right_on=[domain_region_code, domain_commodity_code], how='left'))
 
     @staticmethod
-    def align_forest(Forest: InterfaceWorldData.Forest, ExogChangeForest: InterfaceWorldData.ExogChangeForest,
-                     Commodities: InterfaceWorldData.Commodities):
+    def align_forest(Forest: InterfaceWorldData.Forest, ExogChangeForest: InterfaceWorldData.ExogChangeForest):
         """
-        Align data-DataFrame of Forest in World Data Collection for all regions except zy-region and
-        add new attribute "data_aligned" in Forest of World Data Collection, covering all combinations of
-        products and regions
+        Add new attribute "data_aligned" in Forest and ExogChangeForest of World Data Collection with one row for each
+        region (zy-region excluded), ExogChangeForest ordered by period. Forest data are broadcast to the aligned rows
+        of all regions and commodities only where needed (see get_forest_aligned).
         :param Forest: Domain Forest of World Data Collection
         :param ExogChangeForest: Domain ExogChangeForest of World Data Collection
-        :param Commodities: Domain Commodities of World Data Collection
         """
-        data_aligned_forest, data_aligned_exogchange_forest = pd.DataFrame(), pd.DataFrame()
-        for region in Forest.data[Domains.Forest.region_code]:
-            forest_region = Forest.data[Forest.data[Domains.Forest.region_code] == region]
-
-            data_aligned_forest = pd.concat([
-                data_aligned_forest, pd.concat([forest_region] * Commodities.df_length)]).reset_index(drop=True)
-        Forest.set_attribute("data_aligned", data_aligned_forest)
-
-        for year in sorted(set(ExogChangeForest.data['Period'])):
-            exogchange_forest_subset = ExogChangeForest.data[ExogChangeForest.data['Period'] == year]
-            for region in exogchange_forest_subset[Domains.ExogChangeForest.region_code]:
-                exogchange_forest_region = exogchange_forest_subset[exogchange_forest_subset[
-                                                                        Domains.ExogChangeForest.region_code] == region]
+        Forest.set_attribute("data_aligned", Forest.data.copy().reset_index(drop=True))
+        ExogChangeForest.set_attribute("data_aligned", ExogChangeForest.data.sort_values(
+            "Period", kind="stable").reset_index(drop=True))
 
-                data_aligned_exogchange_forest = pd.concat([
-                    data_aligned_exogchange_forest, pd.concat([exogchange_forest_region] *
-                                                              Commodities.df_length)]).reset_index(drop=True)
-        ExogChangeForest.set_attribute("data_aligned", data_aligned_exogchange_forest)
+    @staticmethod
+    def get_forest_aligned(WorldData: InterfaceWorldData, column: str):
+        """
+        Broadcasts a column of the forest data (one row for each region) to the aligned rows of all regions and
+        commodities (data_aligned). Rows of regions without forest data (zy-region) are set to 0.
+        :param WorldData: World Data Collection
+        :param column: column of Forest.data_aligned
+        :return: aligned vector of the forest column
+        """
+        region_position = pd.Index(WorldData.Forest.data_aligned[Domains.Forest.region_code]).get_indexer(
+            np.array(WorldData.data_aligned[Domains.Regions.region_code]))
+        forest_column = np.array(WorldData.Forest.data_aligned[column], dtype=float)
+        return np.where(region_position >= 0, forest_column[region_position], 0)
 
     @staticmethod
     def update_fuelwood_forest_param(WorldData:InterfaceWorldData):
         """
-        Overwrites column fraction_fuelwood in data_aligned of Forest in World Data Collection with
+        Adds new attribute "fraction_fuelwood_aligned" in Forest of World Data Collection with
         vector containing fraction_fuelwood for product 80 (fuelwood), 1 for product 78, 81, 82 (raw materials), and
-        0 for other products (intermediate and semi-finished products). Commodity codes adapt dynamically to the input
-        data. Obtained vector is used calculations for maximal harvestable forest stock (optimization constraint) and
-        dynamization of Forest Domain.
+        0 for other products (intermediate and semi-finished products) and the zy-region. Commodity codes adapt
+        dynamically to the input data. Obtained vector is used calculations for maximal harvestable forest stock
+        (optimization constraint) and dynamization of Forest Domain.
         :param WorldData: World Data Collection
         """
         zy_region_var = VarNames.ZY_REGION.value
@@ -318,32 +653,36 @@ class DataManager:
                                   (WorldData.Supply.data[Domains.Supply.commodity_code] <= othindrnd)]
             [Domains.Supply.commodity_code])))
 
-        index_fuelwood = WorldData.data_aligned[
-            WorldData.data_aligned[Domains.Commodities.commodity_code] == fuelw].index
-        raw_material_from_forest = pd.concat([pd.DataFrame(index_fuelwood).rename(columns={0: "IndexFuelwood"}),
-                                             WorldData.Forest.data[Domains.Forest.fraction_fuelwood]], axis=1).fillna(0)
-        raw_material_from_forest = WorldData.data_aligned.reset_index().merge(
-            raw_material_from_forest, left_on=["index"], right_on=["IndexFuelwood"], how="left")
+        commodity_vector = WorldData.data_aligned[Domains.Commodities.commodity_code]
+        fuelwood_select = np.array(commodity_vector == fuelw)
+        raw_material_select = np.array(commodity_vector.isin(list_raw_material))
+        forest_select = np.array(WorldData.data_aligned[Domains.Regions.region_code].isin(
+            WorldData.Forest.data_aligned[Domains.Forest.region_code]))
 
-        updated_raw_material_from_forest = pd.DataFrame()
+        # fraction_fuelwood of Forest for fuelwood, 1 for other raw materials and 0 for other products
+        fraction_fuelwood = np.where(raw_material_select & forest_select, 1.0, 0.0)
+        fraction_fuelwood[fuelwood_select] = np.nan_to_num(DataManager.get_forest_aligned(
+            WorldData, Domains.Forest.fraction_fuelwood)[fuelwood_select])
 
-        for region in WorldData.Regions.data[Domains.Regions.region_code]:
-            for commodity in WorldData.Commodities.data[Domains.Commodities.commodity_code]:
-                temporary_var = raw_material_from_forest[
-                    (raw_material_from_forest[Domains.Regions.region_code] == region) &
-                    (raw_material_from_forest[Domains.Commodities.commodity_code] == commodity)]
-
-                if pd.Series(temporary_var[Domains.Commodities.commodity_code]).isin(pd.Series(
-                        list_raw_material)).item():
-                    updated_raw_material_from_forest = pd.concat([updated_raw_material_from_forest, pd.DataFrame(
-                            temporary_var.loc[temporary_var[Domains.Commodities.commodity_code] == commodity,
-                                              Domains.Forest.fraction_fuelwood]).fillna(1)])
-                else:
-                    updated_raw_material_from_forest = pd.concat([updated_raw_material_from_forest, pd.DataFrame(
-                        temporary_var.loc[temporary_var[Domains.Commodities.commodity_code] == commodity,
-                                          Domains.Forest.fraction_fuelwood]).fillna(0)])
+        WorldData.Forest.fraction_fuelwood_aligned = fraction_fuelwood
 
-        WorldData.Forest.data_aligned[Domains.Forest.fraction_fuelwood] = updated_raw_material_from_forest
+    @staticmethod
+    def migrate_forest_layout(WorldData: InterfaceWorldData):
+        """
+        Collapses data_aligned of Forest and ExogChangeForest in World Data Collections serialized with former versions
+        (forest rows replicated for each commodity) to one row for each region (see align_forest) and adds
+        fraction_fuelwood_aligned. World Data Collections with one row for each region are skipped.
+        :param WorldData: World Data Collection
+        """
+        if (not WorldData.Forest.data_aligned[Domains.Forest.region_code].duplicated().any() and
+                hasattr(WorldData.Forest, "fraction_fuelwood_aligned")):
+            return
+        del WorldData.Forest["data_aligned"]
+        del WorldData.ExogChangeForest["data_aligned"]
+        DataManager.align_forest(WorldData.Forest, WorldData.ExogChangeForest)
+        DataManager.update_fuelwood_forest_param(WorldData)
+        WorldData.Forest.data_aligned.fillna(0, inplace=True)
+        WorldData.ExogChangeForest.data_aligned.fillna(0, inplace=True)
 
     @staticmethod
     def add_default_io(WorldData: InterfaceWorldData):
@@ -366,7 +705,8 @@ class DataManager:
     def create_io_matrix(WorldData: InterfaceWorldData, update: bool = False, default_io: bool = False):
         """
         Builds a matrix of input-output-coefficients (io) for all combinations of regions and commodities;
-        shape = (len(commodities) * len(regions)) * (len(commodities) * len(regions)); Missing io-coefficients are
+        shape = (len(commodities) * len(regions)) * (len(commodities) * len(regions)); The matrix is stored as sparse
+        block diagonal matrix (scipy.sparse.csr_matrix) with one block for each region; Missing io-coefficients are
         replaced using default io-coefficients; Save matrix as new attribute "ioMatrix" (= with zy-region) and
         "ioMatrixshort" (= without zy-region) in ManufactureCoefficients of World
         data collection
@@ -411,19 +751,17 @@ class DataManager:
 
             flat_io_matrix = flat_io_matrix_updated
 
-        large_io_matrix = np.zeros([0, len(WorldData.Regions.data) * len(WorldData.Commodities.data)])
-        for i in range(len(WorldData.Regions.data)):
-            matrix_main = np.array(flat_io_matrix[i * len(WorldData.Commodities.data):(i + 1) * len(
-                WorldData.Commodities.data)].T)
-            matrix_before = np.zeros([len(WorldData.Commodities.data), i * len(WorldData.Commodities.data)])
-            matrix_after = np.zeros([len(WorldData.Commodities.data), len(WorldData.Regions.data) * len(
-                WorldData.Commodities.data) - (i + 1) * len(WorldData.Commodities.data)])
-            matrix_row = np.concatenate([matrix_before, matrix_main, matrix_after], axis=1)
-            large_io_matrix = np.concatenate([large_io_matrix, matrix_row], axis=0)
+        # Block diagonal matrix with one commodity x commodity block for each region (row: input, column: output)
+        COMMODITY_LEN = len(WorldData.Commodities.data)
+        IO_LEN = len(WorldData.Regions.data) * COMMODITY_LEN
+        flat_io_matrix = sp.coo_matrix(np.array(flat_io_matrix[:IO_LEN], dtype=float))
+        large_io_matrix = sp.csr_matrix(
+            (flat_io_matrix.data,
+             ((flat_io_matrix.row // COMMODITY_LEN) * COMMODITY_LEN + flat_io_matrix.col, flat_io_matrix.row)),
+            shape=(IO_LEN, IO_LEN))
 
-        short_io_matrix = np.array(pd.DataFrame(large_io_matrix).iloc[
-                                          : WorldData.data_aligned.shape[0] - WorldData.Commodities.df_length,
-                                          :WorldData.data_aligned.shape[0] - WorldData.Commodities.df_length])
+        SHORT_IO_LEN = WorldData.data_aligned.shape[0] - WorldData.Commodities.df_length
+        short_io_matrix = large_io_matrix[:SHORT_IO_LEN, :SHORT_IO_LEN]
 
         if not update:
             WorldData.ManufactureCoefficients.set_attribute("ioMatrix", large_io_matrix)
@@ -478,6 +816,47 @@ class DataManager:
             domain = str(domain)
             WorldData[domain].data_aligned.fillna(0, inplace=True)
 
+    @staticmethod
+    def create_exog_change_tensor(WorldData: InterfaceWorldData):
+        """
+        Adds new attributes "data_tensor" and "tensor_fields" to all ExogChange-Domains of World Data Collection. The
+        numeric columns of data_aligned (period-major, one block of rows for each period) are stored once as tensor of
+        shape (periods, rows, fields), tensor_fields holds the position of each column in the last axis. Domains with
+        an existing tensor are skipped.
+        :param WorldData: World Data Collection
+        """
+        for domain in DomainIterator.get_domain(DomainIterator.EXOG_CHANGE_DOMAINS):
+            domain = str(domain)
+            if hasattr(WorldData[domain], "data_tensor"):
+                continue
+            data_aligned = WorldData[domain].data_aligned
+            period = pd.to_numeric(data_aligned["Period"]).to_numpy()
+            num_periods = len(np.unique(period))
+            if len(data_aligned) % num_periods or not (
+                    period.reshape(num_periods, -1) == period.reshape(num_periods, -1)[:, :1]).all():
+                raise ValueError(f"Aligned data of {domain} are not ordered in one block of rows for each period.")
+
+            tensor_fields, tensor_columns = {}, []
+            for column_num, column_name in enumerate(data_aligned.columns):
+                column = data_aligned.iloc[:, column_num]
+                numeric_column = pd.to_numeric(column, errors="coerce")
+                if column_name not in tensor_fields and (numeric_column.notna() | column.isna()).all():
+                    tensor_fields[column_name] = len(tensor_columns)
+                    tensor_columns.append(numeric_column.to_numpy(dtype=float))
+            data_tensor = np.stack(tensor_columns, axis=-1).reshape(num_periods, -1, len(tensor_columns))
+            WorldData[domain].set_attribute("tensor_fields", tensor_fields)
+            WorldData[domain].set_attribute("data_tensor", data_tensor)
+
+    @staticmethod
+    def get_exog_change_fields(ExogChange: DataContainer) -> dict:
+        """
+        Zero-copy views of the fields of an ExogChange tensor (see create_exog_change_tensor).
+        :param ExogChange: ExogChange-Domain of World Data Collection
+        :return: dict with column name as key and view of shape (periods, rows) as value
+        """
+        return {column_name: ExogChange.data_tensor[:, :, field_num]
+                for column_name, field_num in ExogChange.tensor_fields.items()}
+
     @staticmethod
     def rename_header(WorldData: InterfaceWorldData):
         """
@@ -504,29 +883,31 @@ class DataManager:
         WorldData.set_attribute("WorldPrices", world_price_container)
 
     @staticmethod
-    def read_additional_information(WorldData: InterfaceWorldData, AdditionalInfo: AdditionalInformation):
+    def read_additional_information(WorldData: InterfaceWorldData, AdditionalInfo: AdditionalInformation,
+                                    add_info_sheets: dict = None):
         """
         Read in additional information. If all commodities from input file are captured 
         in additional information than the infos from additional infromation will be loaded.
         If not you got an error massage that you should update the additional information file.
         :param WorldData: World data collection for world data container
         :param AdditionalInfo: Additional Information about commodities, elements and countries
+        :param add_info_sheets: Sheets already read from the additional information (dict of DataFrames). If None, the
+         sheets are loaded.
         """
-        
-        for sheet_name in pd.ExcelFile(AdditionalInfo.filepath).sheet_names:
+        if add_info_sheets is None:
+            add_info_sheets = DataManager.load_data(AdditionalInfo.filepath, None,
+                                                    DataManager.get_input_source(AdditionalInfo.filepath))
+        for sheet_name, sheet_data in add_info_sheets.items():
             if "Commodity_" in sheet_name:
                 commodity_data_world = WorldData.Commodities.data
-                commodity_data_add_info = DataManager.load_data(AdditionalInfo.filepath, sheet_name, "Excel")
                 new_sheet_name = sheet_name.split('_')[0]
 
-                if commodity_data_world['CommodityCode'].astype('int64').equals(
-                        commodity_data_add_info['GFPMCom-Code']):
-                    AdditionalInfo[new_sheet_name].data = DataManager.load_data(
-                        AdditionalInfo.filepath, sheet_name, "Excel")
+                if commodity_data_world['CommodityCode'].astype('int64').equals(sheet_data['GFPMCom-Code']):
+                    AdditionalInfo[new_sheet_name].data = sheet_data
                     AdditionalInfo[new_sheet_name].update_domain_name(new_sheet_name)
 
             else:
-                AdditionalInfo[sheet_name].data = DataManager.load_data(AdditionalInfo.filepath, sheet_name, "Excel")
+                AdditionalInfo[sheet_name].data = sheet_data
                 AdditionalInfo[sheet_name].update_domain_name(sheet_name)
 
             if sheet_name == "CommodityList":
@@ -573,13 +954,18 @@ class DataManager:
                   "AdditionalInformation file or set the addinfo flag in userio to false.\n")
 
     @staticmethod
-    def read_world_prices(Data: DataContainer):
+    def read_world_prices(Data: DataContainer, world_price_sheets: dict = None):
         """
         Read world prices from previous scenarios.
         :param Data: Current DataContainer in particular ExogenousChange
+        :param world_price_sheets: Sheets already read from the world price file (dict of DataFrames). If None, the
+         sheet is loaded.
         """
-        sheet_name = "worldprice" # TODO Hard code (future work)
-        Data.data = DataManager.load_data(Data.filepath, sheet_name, "Excel")
+        sheet_name = InputFormat.WORLD_PRICE_SHEET.value
+        if world_price_sheets is None:
+            Data.data = DataManager.load_data(Data.filepath, sheet_name, DataManager.get_input_source(Data.filepath))
+        else:
+            Data.data = world_price_sheets[sheet_name]
         Data.update_domain_name(sheet_name)
 
     @staticmethod
@@ -594,34 +980,34 @@ class DataManager:
         period_container[period] = deepcopy(WorldData)
 
     @staticmethod
-    def update_period_data(Data: DataContainer, period: int, accessor: str):
+    def update_period_data(Data: DataContainer, period: int, accessor: str, num_periods: int = 1):
         """
-        Finds the period number as a string and displays it, if available.
-        :param Data: Current DataContainer in particular ExogenousChange
+        Stores the data of the current period in the period results of the DataContainer (one slot for each period,
+        data_periods is built on demand). The results are reset in the base period.
+        :param Data: Current DataContainer
         :param period: number of current period
-        :param accessor: string "period"
-        :return: number (int) of the current period
+        :param accessor: name of the attribute with the data of the period ("data" or "data_aligned")
+        :param num_periods: number of periods of the model run (size of the period results)
         """
-        if "Period" not in Data[accessor].columns or (period == 0):
-            Data[accessor]["Period"] = period
-            Data.set_attribute("data_periods", Data[accessor].copy())
-        else:
-            Data[accessor]["Period"] = period
-            Data.data_periods = pd.concat([Data.data_periods, Data[accessor].copy()], axis=0)
-            Data.data_periods.reset_index(drop=True, inplace=True)
+        Data[accessor]["Period"] = period
+        if (period == 0) or not hasattr(Data, "period_results"):
+            Data["period_results"] = PeriodResults(num_periods)
+        Data.period_results.store(Data[accessor], period)
 
     @staticmethod
-    def update_periods(WorldData: InterfaceWorldData, period: int):
+    def update_periods(WorldData: InterfaceWorldData, period: int, num_periods: int = 1):
         """
-        update the current number of period to WorldDataContainer
+        Stores the results of the current period for all updated domains, world prices and optimization helpers.
         :param WorldData: current WorldDataContainer
         :param period: number of current period
-        :return: number (int) of current period in pd.DataFrame
+        :param num_periods: number of periods of the model run (size of the period results)
         """
         for domain_name in DomainIterator.get_domain_names(DomainIterator.UPDATE_DOMAINS):
-            DataManager.update_period_data(WorldData[domain_name], period, accessor="data_aligned")
-        DataManager.update_period_data(WorldData.WorldPrices, period, accessor="data")
-        DataManager.update_period_data(WorldData["OptimizationHelpers"], period, accessor="data")
+            DataManager.update_period_data(WorldData[domain_name], period, accessor="data_aligned",
+                                           num_periods=num_periods)
+        DataManager.update_period_data(WorldData.WorldPrices, period, accessor="data", num_periods=num_periods)
+        DataManager.update_period_data(WorldData["OptimizationHelpers"], period, accessor="data",
+                                       num_periods=num_periods)
 
     @staticmethod
     def get_period_forecast_data(WorldData: InterfaceWorldData):
@@ -687,7 +1073,19 @@ class DataManager:
         Build output table for forest from data_periods.
         :param WorldData: World data collection
         """
-        forest_output = WorldData.Forest.data_periods[[
+        forest_output = DataManager.select_forest_output(WorldData.Forest.data_periods)
+
+        WorldData.Forest.set_attribute("forest_output", forest_output)
+
+    @staticmethod
+    def select_forest_output(ForestData: pd.DataFrame) -> pd.DataFrame:
+        """
+        Select the output columns of forest data (all periods or a single period). Columns computed by the
+        dynamization (growth rates and supply from forest) do not exist in the base period and are left empty.
+        :param ForestData: data of the forest domain including the period
+        :return: forest output table
+        """
+        return ForestData.reindex(columns=[
             Domains.Forest.region_code,
             VarNames.PERIOD_COLNAME.value,
             Domains.Forest.forest_stock,
@@ -699,9 +1097,7 @@ class DataManager:
             Domains.Forest.fraction_fuelwood,
             Domains.Forest.forest_growth_without_harvest,
             Domains.Forest.supply_from_forest,
-        ]]
-
-        WorldData.Forest.set_attribute("forest_output", forest_output)
+        ])
 
     @staticmethod
     def get_manufacture_output(WorldData: InterfaceWorldData):
@@ -709,7 +1105,18 @@ class DataManager:
         Build output table for manufacturing from data_periods.
         :param WorldData: World data collection
         """
-        manufacture_output = WorldData.ManufactureCost.data_periods[[
+        manufacture_output = DataManager.select_manufacture_output(WorldData.ManufactureCost.data_periods)
+
+        WorldData.ManufactureCost.set_attribute("manufacture_output", manufacture_output)
+
+    @staticmethod
+    def select_manufacture_output(ManufactureData: pd.DataFrame) -> pd.DataFrame:
+        """
+        Select the output columns of manufacturing data (all periods or a single period).
+        :param ManufactureData: data of the manufacture cost domain including the period
+        :return: manufacture output table
+        """
+        return ManufactureData[[
             Domains.ManufactureCost.region_code,
             Domains.ManufactureCost.commodity_code,
             VarNames.PERIOD_COLNAME.value,
@@ -718,7 +1125,44 @@ class DataManager:
             VarNames.TOTAL_PRODUCTION_COST.value
         ]]
 
-        WorldData.ManufactureCost.set_attribute("manufacture_output", manufacture_output)
+    @staticmethod
+    def get_period_output(WorldData: InterfaceWorldData, period: int) -> dict:
+        """
+        Collect the output tables of a single stored period (optimization results, forest, manufacturing and world
+        prices) to be written while the model is running.
+        :param WorldData: World data collection
+        :param period: number of the stored period
+        :return: dict with the output tables of the period
+        """
+        return {
+            "results": WorldData.OptimizationHelpers.period_results.get_period(period),
+            "forest": DataManager.select_forest_output(WorldData.Forest.period_results.get_period(period)),
+            "manufacture": DataManager.select_manufacture_output(
+                WorldData.ManufactureCost.period_results.get_period(period)),
+            "world_prices": WorldData.WorldPrices.period_results.get_period(period)
+        }
+
+    @staticmethod
+    def get_period_output_path(time_stamp: str, world_version: str) -> str:
+        """
+        Directory of the output tables written period by period.
+        :param time_stamp: Time stamp of the model start
+        :param world_version: Name of the world input file
+        :return: absolute path of the directory
+        """
+        period_output = f"{PERIOD_OUTPUT}{time_stamp}_{get_world_name(world_version)}"
+        return path.abspath(path.join(*Path(__file__).parts[:-2], period_output))
+
+    @staticmethod
+    def get_monte_carlo_output_path(time_stamp: str, world_version: str) -> str:
+        """
+        Directory of the output tables of a Monte Carlo run.
+        :param time_stamp: Time stamp of the model start
+        :param world_version: Name of the world input file
+        :return: absolute path of the directory
+        """
+        monte_carlo_output = f"{MONTE_CARLO_OUTPUT}{time_stamp}_{get_world_name(world_version)}"
+        return path.abspath(path.join(*Path(__file__).parts[:-2], monte_carlo_output))
 
     @staticmethod
     def save_world_prices(WorldData: InterfaceWorldData, WorldPrices: DataContainer, shadow_world_price: pd.DataFrame,
@@ -757,11 +1201,11 @@ class DataManager:
         :param logger: Model logger
         :param output_path: dict storing ouput paths for pkl files
         """
-        results_output = f"{RESULTS_OUTPUT}{time_stamp}_{world_version[:-5]}.csv"
-        results_output_agg = f"{RESULTS_OUTPUT_AGG}{time_stamp}_{world_version[:-5]}.csv"
-        forest_output = f"{FOREST_OUTPUT}{time_stamp}_{world_version[:-5]}.csv"
-        manufacture_output = f"{MANUFACTURE_OUTPUT}{time_stamp}_{world_version[:-5]}.csv"
-        world_price_output = f"{WORLD_PRICE_OUTPUT}{time_stamp}_{world_version[:-5]}.csv"
+        results_output = f"{RESULTS_OUTPUT}{time_stamp}_{get_world_name(world_version)}.csv"
+        results_output_agg = f"{RESULTS_OUTPUT_AGG}{time_stamp}_{get_world_name(world_version)}.csv"
+        forest_output = f"{FOREST_OUTPUT}{time_stamp}_{get_world_name(world_version)}.csv"
+        manufacture_output = f"{MANUFACTURE_OUTPUT}{time_stamp}_{get_world_name(world_version)}.csv"
+        world_price_output = f"{WORLD_PRICE_OUTPUT}{time_stamp}_{get_world_name(world_version)}.csv"
 
         results_output = path.abspath(path.join(*Path(__file__).parts[:-2], results_output))
         results_output_agg = path.abspath(path.join(*Path(__file__).parts[:-2], results_output_agg))
@@ -806,15 +1250,20 @@ class DataManager:
         :param WorldPrices: contain data about world prices
         :param WorldData: World data collection
         """
-        DataManager.read_world_prices(WorldPrices)
-        DataManager.read_world(WorldData)
+        world_sheets, add_info_sheets, world_price_sheets = None, None, None
+        if UserOptions.read_workers > 1:
+            world_sheets, add_info_sheets, world_price_sheets = DataManager.read_input_sheets(
+                WorldData, AdditionalInfo, WorldPrices, UserOptions.read_workers)
+            Logger.info(f"Input sheets read by {UserOptions.read_workers} processes")
+        DataManager.read_world_prices(WorldPrices, world_price_sheets)
+        DataManager.read_world(WorldData, world_sheets)
         DataManager.drop_sheet_description(WorldData)
         DataManager.split_base_content(WorldData)
         DataManager.verify_base_year(WorldData, UserOptions, Logger)
         DataManager.get_period_forecast_data(WorldData)
         DataManager.rename_header(WorldData)
         DataManager.drop_empty_columns(WorldData)
-        DataManager.read_additional_information(WorldData, AdditionalInfo)
+        DataManager.read_additional_information(WorldData, AdditionalInfo, add_info_sheets)
         DataManager.specification_preprocess(WorldData, AdditionalInfo)
         DataManager.get_world_prices(WorldData)
         # TODO (future work) 
@@ -837,9 +1286,10 @@ class DataManager:
         DataManager.get_column_length(WorldData, Domains.Commodities)
         DataManager.create_base_matrix(WorldData)
         DataManager.align_df(WorldData)
-        DataManager.align_forest(WorldData.Forest, WorldData.ExogChangeForest, WorldData.Commodities)
+        DataManager.align_forest(WorldData.Forest, WorldData.ExogChangeForest)
         DataManager.update_fuelwood_forest_param(WorldData)
         DataManager.fill_na(WorldData)
+        DataManager.create_exog_change_tensor(WorldData)
         DataManager.add_additional_code(WorldData, AdditionalInfo)
 
     @staticmethod
@@ -0,0 +1,124 @@
+import importlib
+import json
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from TiMBA.data_management.DataContainer import DataContainer
+
+
+class InputBundle:
+    """
+    Columnar directory of preprocessed input data. Numeric arrays (columns of DataFrames, IO matrices, aligned vectors)
+    are stored as .npy files and restored memory-mapped; the structure of the data containers is described in a JSON
+    manifest. Object columns and attributes without array representation are stored as pickled files.
+    """
+    MANIFEST_NAME = "manifest.json"
+    JSON_TYPES = (str, int, float, bool, type(None))
+
+    @staticmethod
+    def compile(obj, bundle_path: str):
+        """
+        Write object (data container with all attributes) as bundle to target directory.
+        :param obj: Object to save
+        :param bundle_path: directory of the bundle
+        """
+        os.makedirs(bundle_path, exist_ok=True)
+        files = []
+
+        def save_file(value, file_type: str) -> str:
+            file_name = f"{len(files)}.{file_type}"
+            files.append(file_name)
+            file_path = os.path.join(bundle_path, file_name)
+            if file_type == "npy":
+                np.save(file_path, value, allow_pickle=value.dtype == object)
+            else:
+                with open(file_path, "wb") as pkl_file:
+                    pickle.dump(value, pkl_file)
+            return file_name
+
+        def encode_labels(labels: pd.Index):
+            labels = [label.item() if isinstance(label, np.generic) else label for label in labels]
+            if all(type(label) in InputBundle.JSON_TYPES for label in labels):
+                return labels
+            return None
+
+        def encode(value):
+            if isinstance(value, DataContainer):
+                return {"type": "container",
+                        "class": f"{value.__class__.__module__}:{value.__class__.__qualname__}",
+                        "attributes": {name: encode(attribute) for name, attribute in vars(value).items()}}
+            if isinstance(value, pd.DataFrame):
+                columns = encode_labels(value.columns)
+                if columns is not None and all(isinstance(dtype, np.dtype) for dtype in value.dtypes):
+                    if isinstance(value.index, pd.RangeIndex):
+                        index = {"type": "range", "start": value.index.start, "stop": value.index.stop,
+                                 "step": value.index.step}
+                    else:
+                        index = encode(value.index.to_numpy())
+                    return {"type": "frame", "columns": columns, "index": index,
+                            "arrays": [encode(value.iloc[:, column_num].to_numpy())
+                                       for column_num in range(value.shape[1])]}
+            if isinstance(value, np.ndarray):
+                return {"type": "array", "file": save_file(value, "npy"), "object": value.dtype == object}
+            if sp.isspmatrix_csr(value) or sp.isspmatrix_csc(value):
+                return {"type": "sparse", "format": value.format, "shape": list(value.shape),
+                        "data": encode(value.data), "indices": encode(value.indices), "indptr": encode(value.indptr)}
+            if type(value) in InputBundle.JSON_TYPES:
+                return {"type": "value", "value": value}
+            return {"type": "pickle", "file": save_file(value, "pkl")}
+
+        manifest = {"content": encode(obj), "files": files}
+        with open(os.path.join(bundle_path, InputBundle.MANIFEST_NAME), "w") as manifest_file:
+            json.dump(manifest, manifest_file)
+
+    @staticmethod
+    def restore(bundle_path: str, mmap: bool = True):
+        """
+        Read object from bundle in source directory. Standalone arrays are memory-mapped (read-only). Numeric columns
+        of DataFrames are memory-mapped copy-on-write and not consolidated, so processes restoring the same bundle
+        share the pages of the columns and only pages modified by the model are copied.
+        :param bundle_path: directory of the bundle
+        :param mmap: memory-map arrays, if False the arrays are read into memory (writable)
+        """
+        with open(os.path.join(bundle_path, InputBundle.MANIFEST_NAME), "r") as manifest_file:
+            manifest = json.load(manifest_file)
+
+        def load_array(node: dict, mmap_mode: str = "r") -> np.ndarray:
+            file_path = os.path.join(bundle_path, node["file"])
+            if node["object"] or not mmap:
+                return np.load(file_path, allow_pickle=node["object"])
+            return np.load(file_path, mmap_mode=mmap_mode)
+
+        def decode(node: dict):
+            node_type = node["type"]
+            if node_type == "container":
+                module_name, class_name = node["class"].split(":")
+                container_class = getattr(importlib.import_module(module_name), class_name)
+                container = container_class.__new__(container_class)
+                container.__dict__.update({name: decode(attribute) for name, attribute in node["attributes"].items()})
+                return container
+            if node_type == "frame":
+                if node["index"]["type"] == "range":
+                    index = pd.RangeIndex(node["index"]["start"], node["index"]["stop"], node["index"]["step"])
+                else:
+                    index = pd.Index(np.array(load_array(node["index"])))
+                frame = pd.DataFrame({column_num: np.asarray(load_array(array, mmap_mode="c"))
+                                      for column_num, array in enumerate(node["arrays"])}, index=index, copy=False)
+                frame.columns = node["columns"]
+                return frame
+            if node_type == "array":
+                return load_array(node)
+            if node_type == "sparse":
+                sparse_matrix = sp.csr_matrix if node["format"] == "csr" else sp.csc_matrix
+                return sparse_matrix((decode(node["data"]), decode(node["indices"]), decode(node["indptr"])),
+                                     shape=tuple(node["shape"]))
+            if node_type == "value":
+                return node["value"]
+            with open(os.path.join(bundle_path, node["file"]), "rb") as pkl_file:
+                return pickle.load(pkl_file)
+
+        return decode(manifest["content"])
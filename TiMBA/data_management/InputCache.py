@@ -0,0 +1,142 @@
+import hashlib
+import os
+import shutil
+
+from TiMBA.data_management.DataManager import DataManager
+from TiMBA.data_management.InputBundle import InputBundle
+from TiMBA.parameters.Defines import CacheParameters, InputFormat
+
+
+class InputCache:
+    """
+    Cache of preprocessed input data (World data, additional information and world prices). Entries are keyed by a
+    hash of the input files and the parameters affecting the read-in and preprocessing, so that changed input
+    invalidates the entry. Each entry holds one InputBundle for each content, restored memory-mapped. The cache size is
+    capped by evicting the least recently used entries.
+    """
+    CONTENT_NAMES = ("WorldDataContent", "AddInfoContent", "WorldPriceContent")
+    TMP_SUFFIX = ".tmp"
+
+    def __init__(self, cache_path: str, max_size: int = CacheParameters.INPUT_CACHE_MAX_SIZE.value):
+        """
+        :param cache_path: directory of the cache entries
+        :param max_size: maximal size of all cache entries in bytes
+        """
+        self.cache_path = cache_path
+        self.max_size = max_size
+
+    @staticmethod
+    def get_key(input_filepaths: list, parameters: dict = None) -> str:
+        """
+        Hash of the content of the input files and the preprocessing parameters. Input directories (one csv file per
+        sheet) are hashed by the names and content of their files, worlds in a SQLite database by the content hash
+        stored with the world.
+        :param input_filepaths: paths of the input files (world, additional information, world prices)
+        :param parameters: parameters affecting the read-in and preprocessing
+        :return: hex digest used as key of the cache entry
+        """
+        if parameters is None:
+            parameters = {}
+        input_hash = hashlib.sha256(f"{CacheParameters.INPUT_CACHE_VERSION.value}".encode())
+        for filepath in input_filepaths:
+            if DataManager.get_input_source(filepath) == InputFormat.SQL.value:
+                input_hash.update(DataManager.get_sql_world_hash(filepath).encode())
+        for filepath in InputCache.get_input_files(input_filepaths):
+            input_hash.update(os.path.basename(filepath).encode())
+            with open(filepath, "rb") as input_file:
+                for chunk in iter(lambda: input_file.read(CacheParameters.HASH_CHUNK_SIZE.value), b""):
+                    input_hash.update(chunk)
+        input_hash.update(repr(sorted(parameters.items())).encode())
+        return input_hash.hexdigest()
+
+    @staticmethod
+    def get_input_files(input_filepaths: list) -> list:
+        input_files = []
+        for filepath in input_filepaths:
+            if DataManager.get_input_source(filepath) == InputFormat.SQL.value:
+                continue
+            if os.path.isdir(filepath):
+                input_files.extend(os.path.join(filepath, filename) for filename in sorted(os.listdir(filepath))
+                                   if os.path.isfile(os.path.join(filepath, filename)))
+            else:
+                input_files.append(filepath)
+        return input_files
+
+    def get_entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_path, key)
+
+    def get_entry_bundle_paths(self, key: str) -> list:
+        return [os.path.join(self.get_entry_path(key), content_name) for content_name in self.CONTENT_NAMES]
+
+    def get_entry_size(self, key: str) -> int:
+        return sum(os.path.getsize(os.path.join(dir_path, filename))
+                   for dir_path, _, filenames in os.walk(self.get_entry_path(key)) for filename in filenames)
+
+    def restore(self, key: str):
+        """
+        Restore preprocessed input data from the cache entry. Restored entries are marked as recently used.
+        :param key: key of the cache entry
+        :return: tuple of WorldDataContent, AddInfoContent and WorldPriceContent, None if no entry exists
+        """
+        if not self.restore_paths_exist(key):
+            return None
+        os.utime(self.get_entry_path(key))
+        return tuple(InputBundle.restore(bundle_path) for bundle_path in self.get_entry_bundle_paths(key))
+
+    def restore_paths_exist(self, key: str) -> bool:
+        return all(os.path.exists(os.path.join(bundle_path, InputBundle.MANIFEST_NAME))
+                   for bundle_path in self.get_entry_bundle_paths(key))
+
+    def store(self, key: str, contents: tuple):
+        """
+        Serialize preprocessed input data to a new cache entry and evict least recently used entries. The entry is
+        compiled into a temporary directory of the process and moved into place, so that processes storing the same
+        entry concurrently (worlds computed in parallel) never restore an incomplete entry.
+        :param key: key of the cache entry
+        :param contents: tuple of WorldDataContent, AddInfoContent and WorldPriceContent
+        :return: keys of evicted entries
+        """
+        entry_path = self.get_entry_path(key)
+        tmp_path = f"{entry_path}.{os.getpid()}{self.TMP_SUFFIX}"
+        if os.path.exists(tmp_path):
+            shutil.rmtree(tmp_path)
+        for content, content_name in zip(contents, self.CONTENT_NAMES):
+            InputBundle.compile(content, os.path.join(tmp_path, content_name))
+        if os.path.exists(entry_path) and self.restore_paths_exist(key):
+            # Entry already stored by another process
+            shutil.rmtree(tmp_path)
+        else:
+            if os.path.exists(entry_path):
+                shutil.rmtree(entry_path, ignore_errors=True)
+            try:
+                os.replace(tmp_path, entry_path)
+            except OSError:
+                # Entry stored by another process in the meantime
+                shutil.rmtree(tmp_path, ignore_errors=True)
+        return self.evict(keep_key=key)
+
+    def evict(self, keep_key: str = None) -> list:
+        """
+        Remove least recently used cache entries until the cache size does not exceed max_size.
+        :param keep_key: key of an entry which is never removed (latest entry)
+        :return: keys of removed entries
+        """
+        if not os.path.isdir(self.cache_path):
+            return []
+        entries = []
+        for key in os.listdir(self.cache_path):
+            entry_path = self.get_entry_path(key)
+            if os.path.isdir(entry_path) and not key.endswith(self.TMP_SUFFIX):
+                entries.append((os.path.getmtime(entry_path), key, self.get_entry_size(key)))
+
+        cache_size = sum(entry_size for _, _, entry_size in entries)
+        evicted_keys = []
+        for _, key, entry_size in sorted(entries):
+            if cache_size <= self.max_size:
+                break
+            if key == keep_key:
+                continue
+            shutil.rmtree(self.get_entry_path(key))
+            cache_size -= entry_size
+            evicted_keys.append(key)
+        return evicted_keys
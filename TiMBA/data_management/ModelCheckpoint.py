@@ -0,0 +1,106 @@
+import os
+import pickle
+import shutil
+
+from TiMBA.data_management.InputBundle import InputBundle
+from TiMBA.parameters.Defines import CheckpointParameters
+
+
+class ModelCheckpoint:
+    """
+    Checkpoints of a model run, one for each computed period, stored in the run directory (directory of the period
+    output). A checkpoint holds the data needed to continue the run with the following period: World data (aligned
+    domain data, world prices, period results), additional information and world prices as InputBundle, and the run
+    state (user options, world version, time stamp and the solution of the period for the warm start) as pickled file.
+    Checkpoints are written to a temporary directory and renamed when complete, so that runs failing while writing a
+    checkpoint leave the previous checkpoints usable.
+    """
+    CONTENT_NAMES = ("WorldDataContent", "AddInfoContent", "WorldPriceContent")
+    STATE_NAME = "state.pkl"
+    # Optimization problem and solver of the last period (rebuilt in the following period)
+    EXCLUDED_ATTRIBUTES = ("OptimizationResults",)
+
+    def __init__(self, run_dir: str, run_info: dict = None):
+        """
+        :param run_dir: directory of the model run
+        :param run_info: information about the run stored with the state of each checkpoint (user options, world
+        version, time stamp)
+        """
+        self.run_dir = run_dir
+        self.run_info = {} if run_info is None else run_info
+        self.checkpoint_path = os.path.join(run_dir, CheckpointParameters.CHECKPOINT_DIR.value)
+
+    def get_period_path(self, period: int) -> str:
+        return os.path.join(self.checkpoint_path, f"period_{period}")
+
+    def get_periods(self) -> list:
+        """
+        Periods with complete checkpoints in ascending order.
+        """
+        if not os.path.isdir(self.checkpoint_path):
+            return []
+        periods = []
+        for dir_name in os.listdir(self.checkpoint_path):
+            period = dir_name[len("period_"):]
+            if (dir_name.startswith("period_") and period.isdigit() and
+                    os.path.exists(os.path.join(self.checkpoint_path, dir_name, self.STATE_NAME))):
+                periods.append(int(period))
+        return sorted(periods)
+
+    @staticmethod
+    def exclude_attributes(WorldData):
+        """
+        Shallow copy of the World data collection without the attributes excluded from checkpoints.
+        :param WorldData: World data collection
+        """
+        checkpoint_data = WorldData.__class__.__new__(WorldData.__class__)
+        checkpoint_data.__dict__.update({name: attribute for name, attribute in vars(WorldData).items()
+                                         if name not in ModelCheckpoint.EXCLUDED_ATTRIBUTES})
+        return checkpoint_data
+
+    def store(self, period: int, contents: tuple, state: dict):
+        """
+        Write the checkpoint of a computed period (replaces an existing checkpoint of the period).
+        :param period: number of the computed period
+        :param contents: tuple of WorldDataContent, AddInfoContent and WorldPriceContent
+        :param state: model state needed to continue the run (stored with the run information)
+        """
+        period_path = self.get_period_path(period)
+        tmp_path = f"{period_path}.tmp"
+        if os.path.exists(tmp_path):
+            shutil.rmtree(tmp_path)
+        WorldDataContent, AddInfoContent, WorldPriceContent = contents
+        contents = (self.exclude_attributes(WorldDataContent), AddInfoContent, WorldPriceContent)
+        for content, content_name in zip(contents, self.CONTENT_NAMES):
+            InputBundle.compile(content, os.path.join(tmp_path, content_name))
+        with open(os.path.join(tmp_path, self.STATE_NAME), "wb") as state_file:
+            pickle.dump(dict(self.run_info, **state), state_file, protocol=pickle.HIGHEST_PROTOCOL)
+        if os.path.exists(period_path):
+            shutil.rmtree(period_path)
+        os.replace(tmp_path, period_path)
+
+    def restore(self, period: int):
+        """
+        Read the checkpoint of a computed period. Arrays are read into memory, as the model updates the data in the
+        following periods.
+        :param period: number of the computed period
+        :return: tuple of WorldDataContent, AddInfoContent and WorldPriceContent, and the run state
+        """
+        if period not in self.get_periods():
+            raise FileNotFoundError(f"No checkpoint for period {period} in: {self.checkpoint_path} "
+                                    f"(checkpoints of periods: {self.get_periods()})")
+        period_path = self.get_period_path(period)
+        contents = tuple(InputBundle.restore(os.path.join(period_path, content_name), mmap=False)
+                         for content_name in self.CONTENT_NAMES)
+        with open(os.path.join(period_path, self.STATE_NAME), "rb") as state_file:
+            state = pickle.load(state_file)
+        return contents, state
+
+    def remove_following(self, period: int):
+        """
+        Remove checkpoints of periods after the given period (outdated when a run is resumed from the period).
+        :param period: number of the period
+        """
+        for checkpoint_period in self.get_periods():
+            if checkpoint_period > period:
+                shutil.rmtree(self.get_period_path(checkpoint_period))
@@ -2,6 +2,8 @@ from pathlib import Path
 
 from typing import Union
 
+from TiMBA.parameters.Defines import VarNames
+
 
 class ParameterCollector:
     """
@@ -25,7 +27,11 @@ class ParameterCollector:
         self._transportation_imp_exp_bound_factor = user_input['transportation_factor']
         self._material_balance = user_input['material_balance']
         self._global_material_balance = user_input['global_material_balance']
+        self._optimization_backend = user_input['optimization_backend']
+        self._dynamization_backend = user_input['dynamization_backend']
+        self._read_workers = user_input['read_workers']
         self._serialization = user_input['serialization']
+        self._checkpoint = user_input['checkpoint']
         self._constants = user_input['constants']
         self._dynamization_activated = user_input['dynamization_activated']
         self._capped_prices = user_input['capped_prices']
@@ -94,6 +100,30 @@ class ParameterCollector:
     def global_material_balance(self, value: str):
         self._global_material_balance = value
 
+    @property
+    def optimization_backend(self) -> str:
+        return self._optimization_backend
+
+    @optimization_backend.setter
+    def optimization_backend(self, value: str):
+        self._optimization_backend = value
+
+    @property
+    def dynamization_backend(self) -> str:
+        return self._dynamization_backend
+
+    @dynamization_backend.setter
+    def dynamization_backend(self, value: str):
+        self._dynamization_backend = value
+
+    @property
+    def read_workers(self) -> int:
+        return self._read_workers
+
+    @read_workers.setter
+    def read_workers(self, value: int):
+        self._read_workers = value
+
     @property
     def serialization(self) -> bool:
         return self._serialization
@@ -102,6 +132,14 @@ class ParameterCollector:
     def serialization(self, value: bool):
         self._serialization = value
 
+    @property
+    def checkpoint(self) -> bool:
+        return self._checkpoint
+
+    @checkpoint.setter
+    def checkpoint(self, value: bool):
+        self._checkpoint = value
+
     @property
     def constants(self) -> list:
         return self._constants
@@ -182,7 +220,12 @@ class ParameterCollector:
         assert isinstance(self.calc_world_prices, str)
         assert isinstance(self.material_balance, str)
         assert isinstance(self.global_material_balance, bool)
+        assert isinstance(self.optimization_backend, str)
+        assert self.optimization_backend in [VarNames.CVXPY_BACKEND.value, VarNames.OSQP_BACKEND.value]
+        assert isinstance(self.dynamization_backend, str)
+        assert isinstance(self.read_workers, int) and self.read_workers > 0
         assert isinstance(self.serialization, bool)
+        assert isinstance(self.checkpoint, bool)
         assert isinstance(self.constants, list)
         assert isinstance(self.dynamization_activated, bool)
         assert isinstance(self.capped_prices, bool)
@@ -0,0 +1,47 @@
+import pandas as pd
+
+
+class PeriodResults:
+    """
+    Results of a domain for all periods of the model run. The data of each period are copied into their own slot,
+    preallocated for the periods of the run, so that storing a period does not copy the data of previous periods. The
+    table of all periods (data_periods) is only built on demand and kept until the next period is stored.
+    """
+    def __init__(self, num_periods: int):
+        """
+        :param num_periods: number of periods of the model run (including the base period)
+        """
+        self.slots = [None] * num_periods
+        self.data_periods = None
+
+    def store(self, data: pd.DataFrame, period: int):
+        """
+        Copy the data of a period into the slot of the period.
+        :param data: data of the period
+        :param period: number of the period
+        """
+        if period >= len(self.slots):
+            self.slots.extend([None] * (period + 1 - len(self.slots)))
+        self.slots[period] = data.copy()
+        self.data_periods = None
+
+    def get_period(self, period: int) -> pd.DataFrame:
+        """
+        Data of a stored period (without copy).
+        :param period: number of the period
+        """
+        if period >= len(self.slots) or self.slots[period] is None:
+            raise KeyError(f"No results stored for period {period}")
+        return self.slots[period]
+
+    def get_periods(self) -> list:
+        return [period for period, slot in enumerate(self.slots) if slot is not None]
+
+    def get_data_periods(self) -> pd.DataFrame:
+        """
+        Table of all stored periods, concatenated once on demand.
+        """
+        if self.data_periods is None:
+            self.data_periods = pd.concat([slot for slot in self.slots if slot is not None], axis=0)
+            self.data_periods.reset_index(drop=True, inplace=True)
+        return self.data_periods
@@ -3,12 +3,13 @@ import pandas as pd
 from functools import wraps
 
 from TiMBA.parameters.Defines import VarNames
+from TiMBA.parameters.REGEX_patterns import UNNAMED_COLUMN_PATTERN
 from TiMBA.parameters.Domains import Domains
 from TiMBA.data_management.DataContainer import DataContainer
 from TiMBA.parameters.domain_specifiers.AbstractDomainSpecifier import DomainSpecifier
 from TiMBA.parameters.domain_lists import (main_domains_list, final_domains_list, domains_to_split_list,
                                            domains_to_align_list, domains_to_optimize_list, domains_to_update_list,
-                                           drop_description_domains_list)
+                                           drop_description_domains_list, exog_change_domains_list)
 
 from typing import Callable, Any, Tuple, Optional, Union, List, Type
 from warnings import warn
@@ -60,6 +61,68 @@ def get_domain_header(domain: DomainSpecifier) -> Optional[Tuple[Any, Any]]:
         return None, None
 
 
+def get_last_column_index(domain: DomainSpecifier) -> Optional[int]:
+    """
+    Retrieves the last column position of the Excel sheet used by a domain and its sub domains, from the unnamed
+    columns in header_description and the positional column_index of the splitting.
+    :param domain: Domain (main domain or sub domain)
+    :return: last used column position, None if no column position is specified
+    """
+    column_positions = [int(UNNAMED_COLUMN_PATTERN.fullmatch(column).group(1))
+                        for column in getattr(domain, "header_description", {})
+                        if UNNAMED_COLUMN_PATTERN.fullmatch(column)]
+    if getattr(domain, "column_index", None) is not None:
+        column_positions.append(domain.column_index)
+    for sub_domain in getattr(domain, "domain_split_list", []):
+        sub_domain_position = get_last_column_index(sub_domain)
+        if sub_domain_position is not None:
+            column_positions.append(sub_domain_position)
+    return max(column_positions) if column_positions else None
+
+
+def get_domain_read_plan(domain: DomainSpecifier) -> Optional[Tuple[Any, Any]]:
+    """
+    Derives the read plan (keyword arguments for reading the Excel sheet) of a main domain from its domain specifier.
+    Columns without header behind the last used column are not read. Positions of all columns up to the last used
+    column are kept for the positional splitting of the domain.
+    :param domain: Main domain
+    :return: domain name and read plan
+    """
+    last_column_index = get_last_column_index(domain)
+    if last_column_index is None:
+        return str(domain), {}
+
+    def use_column(column_name: str) -> bool:
+        unnamed_column = UNNAMED_COLUMN_PATTERN.fullmatch(str(column_name))
+        return unnamed_column is None or int(unnamed_column.group(1)) <= last_column_index
+
+    return str(domain), {"usecols": use_column}
+
+
+def get_domain_codes(sheet_data: pd.DataFrame, domain: DomainSpecifier, code_attribute: str) -> pd.Series:
+    """
+    Retrieves the code (region or commodity code) of each row of a sheet. Rows of split domains take the code from the
+    column of their sub domain, rows of sub domains without the code attribute have no code.
+    :param sheet_data: sheet of the domain as read from the input file
+    :param domain: Domain (main domain or sub domain)
+    :param code_attribute: name of the code attribute (region_code, commodity_code)
+    :return: codes by row
+    """
+    code_columns = [column for column, header in getattr(domain, "header_description", {}).items()
+                    if header == getattr(domain, code_attribute, None) and column in sheet_data.columns]
+    if code_columns:
+        return sheet_data[code_columns[0]].astype(object)
+
+    codes = pd.Series(None, index=sheet_data.index, dtype=object)
+    for sub_domain in getattr(domain, "domain_split_list", []):
+        if sub_domain.mask_axis == 0:
+            mask = sheet_data.iloc[:, sub_domain.column_index] == sub_domain.splitting_mask
+        else:
+            mask = pd.Series(True, index=sheet_data.index)
+        codes = codes.fillna(get_domain_codes(sheet_data[mask], sub_domain, code_attribute))
+    return codes
+
+
 def get_info_slope_intercept_calculation(domain: DomainSpecifier) -> Optional[Tuple[Any, Any, Any, Any]]:
     price_col_name = VarNames.PRICE_COLNAME.value
     quantity_col_name = VarNames.QUANTITY_COLNAME.value
@@ -106,6 +169,7 @@ class DomainIterator:
     DESCRIPTION_DOMAINS = drop_description_domains_list
     SPLIT_DOMAINS = domains_to_split_list
     ALIGN_DOMAINS = domains_to_align_list
+    EXOG_CHANGE_DOMAINS = exog_change_domains_list
     OPTIMIZATION_DOMAINS = domains_to_optimize_list
     UPDATE_DOMAINS = domains_to_update_list
 
@@ -117,6 +181,10 @@ class DomainIterator:
     def get_domain_start_index(domains_list):
         return decorate_domain_iteration(domains_list)(get_domain_start_index)()
 
+    @staticmethod
+    def get_domain_read_plan(domains_list):
+        return decorate_domain_iteration(domains_list)(get_domain_read_plan)()
+
     @staticmethod
     def get_domain_header(domains_list):
         return decorate_domain_iteration(domains_list)(get_domain_header)()
@@ -0,0 +1,392 @@
+import numpy as np
+import pandas as pd
+
+from TiMBA.data_management.DataContainer import InterfaceWorldData
+from TiMBA.data_management.DataManager import DataManager
+from TiMBA.helpers.utils import Domains
+from TiMBA.parameters.Defines import Shifter, ConversionParameters, VarNames
+from TiMBA.logic.model_helpers import clip_negative_forest, get_supply_raw_commodities
+
+
+def get_column(Data: pd.DataFrame, column: str) -> np.ndarray:
+    """
+    Column of data_aligned as float array (without copy for float columns).
+    :param Data: data_aligned of a domain
+    :param column: name of the column
+    """
+    return np.asarray(Data[column], dtype=float)
+
+
+def power(base: np.ndarray, exponent, out: np.ndarray, python_float: bool = False) -> np.ndarray:
+    """
+    Power of base computed in out. The pandas functions compute with python floats for object columns (forest), where
+    the power differs from the numpy power in the last digit.
+    :param base: base of the power
+    :param exponent: exponent (scalar or array)
+    :param out: buffer for the result (may be base)
+    :param python_float: compute the power with python floats
+    :return: out
+    """
+    if python_float:
+        out[:] = np.power(base.astype(object), exponent)
+        return out
+    np.copyto(out, base)
+    out **= exponent
+    return out
+
+
+def periodic_growth(ChangeData: np.ndarray, period_length: int, out: np.ndarray,
+                    python_float: bool = False) -> np.ndarray:
+    """
+    Periodic growth rate from annual growth rate ((1 + ChangeData) ** period_length - 1), computed in out.
+    :param ChangeData: annual growth rate
+    :param period_length: years of the period
+    :param out: buffer for the result
+    :param python_float: compute the power with python floats
+    :return: out
+    """
+    np.add(ChangeData, 1, out=out)
+    power(out, period_length, out=out, python_float=python_float)
+    return np.subtract(out, 1, out=out)
+
+
+def shifted_update(ChangeData: np.ndarray, DomainData: np.ndarray, shifter_exception: int, out: np.ndarray,
+                   mask: np.ndarray) -> np.ndarray:
+    """
+    Exogenous change where data are updated, DomainData where exogenous change equals shifter_exception, computed in
+    out.
+    :param ChangeData: exogenous change of the period
+    :param DomainData: data used if exogenous change equals shifter_exception
+    :param shifter_exception: value of exogenous change marking unchanged data
+    :param out: buffer for the result
+    :param mask: boolean buffer
+    :return: out
+    """
+    np.equal(ChangeData, shifter_exception, out=mask)
+    np.copyto(out, ChangeData)
+    np.copyto(out, DomainData, where=mask)
+    return out
+
+
+class DynamizationKernel(object):
+    """
+    Fused numpy implementation of the dynamization of demand, supply, forest, manufacturing and trade. The pandas
+    functions in model_helpers (dynamize_demand, dynamize_supply, dynamize_forest, dynamize_manufacturing_cost,
+    dynamize_manufacturing_coeff and dynamize_transportation) remain the reference implementation. Commodity masks,
+    region mappings and views of the exogenous change tensors are prepared once, all periodic shifts are computed in
+    one pass in preallocated buffers and written to data_aligned of the domains. The order of operations follows the
+    pandas functions, so that results are identical to the last digit (the optimization is sensitive to small
+    differences in the dynamized data).
+    """
+    def __init__(self, WorldData: InterfaceWorldData):
+        """
+        :param WorldData: World data collection with exogenous change tensors (DataManager.create_exog_change_tensor)
+        """
+        self.Data = WorldData
+        self.demand_change = DataManager.get_exog_change_fields(WorldData.ExogChangeDemand)
+        self.supply_change = DataManager.get_exog_change_fields(WorldData.ExogChangeSupply)
+        self.forest_change = DataManager.get_exog_change_fields(WorldData.ExogChangeForest)
+        self.manu_cost_change = DataManager.get_exog_change_fields(WorldData.ExogChangeManufactureCost)
+        self.manu_coeff_change = DataManager.get_exog_change_fields(WorldData.ExogChangeManufactureCoefficients)
+        self.export_change = DataManager.get_exog_change_fields(WorldData.ExogChangeTradeExport)
+        self.import_change = DataManager.get_exog_change_fields(WorldData.ExogChangeTradeImport)
+
+        supply = WorldData.Supply.data_aligned
+        supply_commodities = supply[Domains.Supply.commodity_code]
+        paper_raw_commodities, forest_raw_commodities = get_supply_raw_commodities(WorldData.Supply.data)
+        self.paper_supply = np.array(supply_commodities.isin(paper_raw_commodities))
+        self.forest_raw_supply = np.array(supply_commodities.isin(forest_raw_commodities))
+
+        # Forest (one row for each region) is linked to the supply of the region by the row position of the region
+        forest_regions = WorldData.Forest.data_aligned[Domains.Forest.region_code]
+        supply_regions = supply[Domains.Supply.region_code]
+        self.supply_forest_position = pd.Index(forest_regions).get_indexer(supply_regions)
+        self.supply_in_forest = self.supply_forest_position >= 0
+        # The forest sheet is read with object columns, the pandas functions compute the forest growth in python floats
+        self.forest_python_float = any(WorldData.Forest.data_aligned[column].dtype == object for column in [
+            Domains.Forest.forest_stock, Domains.Forest.forest_area, Domains.Forest.gdp_per_capita_base_period,
+            Domains.Forest.elasticity_growth_rate_forest_stock, Domains.Forest.linear_gdp_forest_area_growth_rate])
+
+        self.supply_buffer = np.empty((9, len(supply)))
+        self.supply_mask = np.empty(len(supply), dtype=bool)
+        self.forest_buffer = np.empty((14, len(forest_regions)))
+        self.forest_mask = np.empty(len(forest_regions), dtype=bool)
+        self.demand_buffer = np.empty((6, len(WorldData.Demand.data_aligned)))
+        self.demand_mask = np.empty(len(WorldData.Demand.data_aligned), dtype=bool)
+        self.trade_buffer = np.empty((7, len(WorldData.TransportationImport.data_aligned)))
+        self.trade_mask = np.empty(len(WorldData.TransportationImport.data_aligned), dtype=bool)
+        self.manu_coeff_buffer = np.empty(len(WorldData.ManufactureCoefficients.data_aligned))
+        self.manu_cost_buffer = np.empty(len(WorldData.ManufactureCost.data_aligned))
+
+    def dynamize(self, period_info: dict, Logger):
+        """
+        Dynamization of all domains for the current period (same results as the functions of model_helpers).
+        :param period_info: dict storing information on current period (period number, period length, block, year)
+        :param Logger: Logger
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.dynamize_demand(period_info["block"], period_info["length"])
+            self.dynamize_supply(period_info["block"], period_info["length"], Logger)
+            self.dynamize_manufacturing(period_info["block"], period_info["length"])
+            self.dynamize_transportation(period_info["block"], period_info["length"])
+
+    def dynamize_demand(self, period_block: int, period_length: int):
+        Data = self.Data.Demand.data_aligned
+        change = self.demand_change
+        buffer, mask = self.demand_buffer, self.demand_mask
+
+        periodic_trend = periodic_growth(change[Domains.ExogChangeDemand.growth_rate_value][period_block],
+                                         period_length, out=buffer[0])
+        elasticity_price = shifted_update(change[Domains.ExogChangeDemand.elasticity_price][period_block],
+                                          get_column(Data, Domains.Demand.elasticity_price),
+                                          Shifter.except_shifter_zero.value, out=buffer[1], mask=mask)
+        elasticity_gdp = shifted_update(change[Domains.ExogChangeDemand.elasticity_gdp][period_block],
+                                        get_column(Data, Domains.Demand.elasticity_gdp),
+                                        Shifter.except_shifter_zero.value, out=buffer[2], mask=mask)
+        growth_gdp = periodic_growth(change[Domains.ExogChangeDemand.growth_rate_gdp][period_block],
+                                     period_length, out=buffer[3])
+        growth_expected_demand = periodic_growth(
+            change[Domains.ExogChangeDemand.growth_demand_expected][period_block], period_length, out=buffer[4])
+
+        demand_shift = np.add(1, periodic_trend, out=periodic_trend)
+        demand_shift += np.multiply(elasticity_gdp, growth_gdp, out=growth_gdp)
+        demand_shift += np.multiply(get_column(Data, Domains.Demand.elasticity_expectations),
+                                    growth_expected_demand, out=growth_expected_demand)
+        dynamized_demand_quantity = np.multiply(get_column(Data, Domains.Demand.quantity), demand_shift,
+                                                out=demand_shift)
+
+        # Index alignment of former versions: growth of the lower bound is read from the first period block
+        periodic_grDLB = np.add(1, change[Domains.ExogChangeDemand.growth_lower_bound][0], out=buffer[5])
+        periodic_grDLB **= period_length
+        DLB = np.multiply(get_column(Data, Domains.Demand.lower_bound), periodic_grDLB, out=periodic_grDLB)
+
+        Data[Domains.Demand.elasticity_price] = elasticity_price
+        Data[Domains.Demand.elasticity_gdp] = elasticity_gdp
+        Data[Domains.Demand.quantity] = dynamized_demand_quantity
+        Data[Domains.Demand.lower_bound] = DLB
+
+    def dynamize_forest(self, period_block: int, period_length: int, Logger):
+        """
+        Endogenous growth of forest area and stock, computed before the supply is updated.
+        :return: periodic change rate of forest stock and forest area (one row for each region)
+        """
+        Data = self.Data.Forest.data_aligned
+        change = self.forest_change
+        buffer, mask = self.forest_buffer, self.forest_mask
+
+        growth_rate_gdp = periodic_growth(change[Domains.ExogChangeForest.growth_rate_gdp][period_block],
+                                          period_length, out=buffer[0])
+        adjustment_endogenous_growth_rate_stock = periodic_growth(
+            change[Domains.ExogChangeForest.adjustment_endogenous_growth_rate_stock][period_block], period_length,
+            out=buffer[1])
+        StockElastArea = shifted_update(
+            change[Domains.ExogChangeForest.elasticity_growth_rate_stock_on_area][period_block],
+            get_column(Data, Domains.Forest.elasticity_growth_rate_forest_stock),
+            Shifter.except_shifter_zero.value, out=buffer[2], mask=mask)
+        LinForAreaGDPGrowth = shifted_update(
+            change[Domains.ExogChangeForest.growth_rate_linear_GDP_forest_area_growth_rate][period_block],
+            get_column(Data, Domains.Forest.linear_gdp_forest_area_growth_rate),
+            Shifter.except_shifter_zero.value, out=buffer[3], mask=mask)
+        SqForAreaGDPGrowth = shifted_update(
+            change[Domains.ExogChangeForest.growth_rate_squared_GDP_forest_area_growth_rate][period_block],
+            get_column(Data, Domains.Forest.exponential_gdp_forest_area_growth_rate),
+            Shifter.except_shifter_zero.value, out=buffer[4], mask=mask)
+        ratio_inventory_drain = shifted_update(
+            change[Domains.ExogChangeForest.ratio_inventory_drain][period_block],
+            get_column(Data, Domains.Forest.ratio_inventory_drain),
+            Shifter.except_shifter_minus_one.value, out=buffer[5], mask=mask)
+
+        clip_negative_forest(Data, Logger)
+        forest_area_prev = get_column(Data, Domains.Forest.forest_area)
+        forest_stock_prev = get_column(Data, Domains.Forest.forest_stock)
+        forest_stock_prev = np.where(forest_stock_prev == 0, 0.001, forest_stock_prev) # TODO small non zero parameter
+
+        gdp_per_capita = np.divide(get_column(Data, Domains.Forest.gdp_per_capita_base_period),
+                                   ConversionParameters.MIO_FACTOR.value, out=buffer[6])
+        gdp_per_capita *= np.add(1, growth_rate_gdp, out=growth_rate_gdp)
+
+        supply = self.Data.Supply.data_aligned
+        roundwood_supply = np.multiply(get_column(supply, Domains.Supply.quantity),
+                                       self.Data.Forest.fraction_fuelwood_aligned)
+        roundwood_supply[np.isnan(roundwood_supply)] = 0
+        # Grouped sum of pandas (compensated summation) as in dynamize_forest, NaN for regions without supply
+        roundwood_supply = pd.Series(roundwood_supply).groupby(self.supply_forest_position).sum()
+        roundwood_supply = roundwood_supply.reindex(range(len(Data))).to_numpy()
+        roundwood_supply = roundwood_supply * period_length / ConversionParameters.MIO_FACTOR.value
+
+        area_growth = np.multiply(LinForAreaGDPGrowth, gdp_per_capita, out=LinForAreaGDPGrowth)
+        area_growth += get_column(Data, Domains.Forest.alpha)
+        area_growth *= np.exp(np.multiply(SqForAreaGDPGrowth, gdp_per_capita, out=SqForAreaGDPGrowth),
+                              out=SqForAreaGDPGrowth)
+        periodic_area_growth = periodic_growth(
+            shifted_update(change[Domains.ExogChangeForest.growth_rate_area][period_block], area_growth,
+                           Shifter.except_shifter_minus_one.value, out=buffer[7], mask=mask),
+            period_length, out=buffer[7], python_float=self.forest_python_float)
+        forest_area_new = np.add(1, periodic_area_growth, out=buffer[8])
+        forest_area_new *= forest_area_prev
+
+        stock_growth_without_harvest = np.divide(forest_stock_prev, forest_area_prev, out=buffer[9])
+        power(stock_growth_without_harvest, StockElastArea, out=stock_growth_without_harvest,
+              python_float=self.forest_python_float)
+        np.multiply(get_column(Data, Domains.Forest.gamma), stock_growth_without_harvest,
+                    out=stock_growth_without_harvest)
+        periodic_stock_growth_without_harvest = periodic_growth(
+            shifted_update(change[Domains.ExogChangeForest.growth_rate_stock][period_block],
+                           stock_growth_without_harvest, Shifter.except_shifter_minus_one.value, out=buffer[10],
+                           mask=mask),
+            period_length, out=buffer[10], python_float=self.forest_python_float)
+
+        stock_growth = np.add(periodic_area_growth, periodic_stock_growth_without_harvest, out=buffer[11])
+        stock_growth += adjustment_endogenous_growth_rate_stock
+        stock_growth *= forest_stock_prev
+        forest_stock_new = np.add(forest_stock_prev, stock_growth, out=stock_growth)
+        forest_stock_new -= np.multiply(ratio_inventory_drain, roundwood_supply, out=ratio_inventory_drain)
+
+        if Domains.Forest.max_forest_density in Data.columns:
+            max_forest_density = get_column(Data, Domains.Forest.max_forest_density)
+            forest_stock_max = max_forest_density * forest_area_new / ConversionParameters.MIO_FACTOR.value
+            np.copyto(forest_stock_new, forest_stock_max, where=(
+                    (max_forest_density != Shifter.except_shifter_minus_one.value) &
+                    (forest_stock_new > forest_stock_max)))
+
+        periodic_change_rate_stock = np.subtract(forest_stock_new, forest_stock_prev, out=buffer[12])
+        periodic_change_rate_stock /= forest_stock_prev
+        periodic_change_rate_area = np.subtract(forest_area_new, forest_area_prev, out=buffer[13])
+        periodic_change_rate_area /= forest_area_prev
+
+        Data[Domains.Forest.forest_area] = np.maximum(forest_area_new, 0.001) # TODO small non zero parameter
+        Data[Domains.Forest.forest_stock] = np.maximum(forest_stock_new, 0.001) # TODO small non zero parameter
+        Data[Domains.Forest.gdp_per_capita_base_period] = gdp_per_capita * ConversionParameters.MIO_FACTOR.value
+        Data[Domains.Forest.periodic_growth_rate_of_forest_area] = periodic_area_growth
+        Data[Domains.Forest.forest_growth_without_harvest] = periodic_stock_growth_without_harvest
+        Data[Domains.Forest.supply_from_forest] = roundwood_supply
+
+        return periodic_change_rate_stock, periodic_change_rate_area
+
+    def dynamize_supply(self, period_block: int, period_length: int, Logger):
+        Data = self.Data.Supply.data_aligned
+        change = self.supply_change
+        buffer, mask = self.supply_buffer, self.supply_mask
+
+        elasticity_price = shifted_update(change[Domains.ExogChangeSupply.elasticity_price][period_block],
+                                          get_column(Data, Domains.Supply.elasticity_price),
+                                          Shifter.except_shifter_zero.value, out=buffer[0], mask=mask)
+        periodic_trend = periodic_growth(change[Domains.ExogChangeSupply.growth_rate_value][period_block],
+                                         period_length, out=buffer[1])
+        gdp_periodic_growth = periodic_growth(change[Domains.ExogChangeSupply.growth_rate_gdp][period_block],
+                                              period_length, out=buffer[2])
+        # Index alignment of former versions: shifts are only defined in the first period block
+        growth_shifts = []
+        for buffer_row, (elasticity, growth_rate) in enumerate([
+                (Domains.Supply.elasticity_fourth, Domains.ExogChangeSupply.growth_rate_fourth_shift),
+                (Domains.Supply.elasticity_fifth, Domains.ExogChangeSupply.growth_rate_fifth_shift),
+                (Domains.Supply.elasticity_sixth, Domains.ExogChangeSupply.growth_rate_sixth_shift)], start=3):
+            growth_shift = np.multiply(get_column(Data, elasticity), change[growth_rate][0], out=buffer[buffer_row])
+            if period_block > 0:
+                growth_shift.fill(np.nan)
+            growth_shifts.append(periodic_growth(growth_shift, period_length, out=growth_shift))
+
+        periodic_change_rate_stock, periodic_change_rate_area = self.dynamize_forest(period_block, period_length,
+                                                                                     Logger)
+
+        # Forest growth of each region (one row for each region) is broadcast to the supply of the region
+        fuelwood_roundwood_supply_shift = buffer[6]
+        stock_periodic_growth = np.where(self.supply_in_forest,
+                                         periodic_change_rate_stock[self.supply_forest_position], 0)
+        stock_periodic_growth[np.isnan(stock_periodic_growth)] = 0
+        area_periodic_growth = np.where(self.supply_in_forest,
+                                        periodic_change_rate_area[self.supply_forest_position], 0)
+        area_periodic_growth[np.isnan(area_periodic_growth)] = 0
+        np.multiply(get_column(Data, Domains.Supply.elasticity_stock), stock_periodic_growth,
+                    out=fuelwood_roundwood_supply_shift)
+        np.add(1, fuelwood_roundwood_supply_shift, out=fuelwood_roundwood_supply_shift)
+        fuelwood_roundwood_supply_shift += np.multiply(get_column(Data, Domains.Supply.elasticity_area),
+                                                       area_periodic_growth, out=area_periodic_growth)
+        fuelwood_roundwood_supply_shift[~self.forest_raw_supply] = 0
+
+        paper_supply_shift = np.multiply(get_column(Data, Domains.Supply.elasticity_gdp), gdp_periodic_growth,
+                                         out=gdp_periodic_growth)
+        np.add(1, paper_supply_shift, out=paper_supply_shift)
+        paper_supply_shift[~self.paper_supply] = 0
+
+        periodic_shift = np.add(1, periodic_trend, out=periodic_trend)
+        supply_shifter = np.add(paper_supply_shift, fuelwood_roundwood_supply_shift, out=buffer[7])
+        supply_shifter *= periodic_shift
+        supply_shifter -= 1
+        growth_rate_upper_bound = periodic_growth(
+            shifted_update(change[Domains.ExogChangeSupply.growth_rate_upper_bound][period_block], supply_shifter,
+                           Shifter.except_shifter_minus_one.value, out=buffer[8], mask=mask),
+            period_length, out=buffer[8])
+
+        supply_quantity = get_column(Data, Domains.Supply.quantity)
+        dynamized_supply_fuelwood_roundwood = np.multiply(supply_quantity, fuelwood_roundwood_supply_shift,
+                                                          out=fuelwood_roundwood_supply_shift)
+        dynamized_supply_fuelwood_roundwood[~self.forest_raw_supply] = 0
+        dynamized_supply_quantity = np.multiply(supply_quantity, paper_supply_shift, out=paper_supply_shift)
+        dynamized_supply_quantity += dynamized_supply_fuelwood_roundwood
+        dynamized_supply_quantity *= periodic_shift
+        np.maximum(dynamized_supply_quantity, 0, out=dynamized_supply_quantity)
+
+        Data[Domains.Supply.elasticity_price] = elasticity_price
+        Data[Domains.Supply.quantity] = dynamized_supply_quantity
+        Data["growth_rate_upper_bound"] = growth_rate_upper_bound # TODO hard code
+        Data[Domains.Supply.elasticity_fourth] = growth_shifts[0]
+        Data[Domains.Supply.elasticity_fifth] = growth_shifts[1]
+        Data[Domains.Supply.elasticity_sixth] = growth_shifts[2]
+
+    def dynamize_manufacturing(self, period_block: int, period_length: int):
+        DataCost = self.Data.ManufactureCost.data_aligned
+        periodic_growth_manucost = periodic_growth(
+            self.manu_cost_change[Domains.ExogChangeManufactureCost.growth_rate_net_manufacture_cost][period_block],
+            period_length, out=self.manu_cost_buffer)
+        dynamized_manucosts = np.add(1, periodic_growth_manucost, out=periodic_growth_manucost)
+        np.multiply(get_column(DataCost, Domains.ManufactureCost.net_manufacturing_cost), dynamized_manucosts,
+                    out=dynamized_manucosts)
+        DataCost[Domains.ManufactureCost.net_manufacturing_cost] = dynamized_manucosts
+
+        DataCoeff = self.Data.ManufactureCoefficients.data_aligned
+        dynamized_manu_coeff = np.multiply(
+            self.manu_coeff_change[Domains.ExogChangeManufactureCoefficients.change_input_output][period_block],
+            period_length, out=self.manu_coeff_buffer)
+        np.add(get_column(DataCoeff, Domains.ManufactureCoefficients.quantity), dynamized_manu_coeff,
+               out=dynamized_manu_coeff)
+        dynamized_manu_coeff[dynamized_manu_coeff < 0] = 0
+        DataCoeff[Domains.ManufactureCoefficients.quantity] = dynamized_manu_coeff
+
+    def dynamize_transportation(self, period_block: int, period_length: int):
+        DataExport = self.Data.TransportationExport.data_aligned
+        DataImport = self.Data.TransportationImport.data_aligned
+        buffer, mask = self.trade_buffer, self.trade_mask
+
+        export_trade_inertia_bounds = shifted_update(
+            self.export_change[Domains.ExogChangeTradeExport.trade_inertia_bounds][period_block],
+            get_column(DataExport, Domains.TransportationExport.trade_inertia_bounds),
+            Shifter.except_shifter_zero.value, out=buffer[0], mask=mask)
+        import_trade_inertia_bounds = shifted_update(
+            self.import_change[Domains.ExogChangeTradeImport.trade_inertia_bounds][period_block],
+            get_column(DataImport, Domains.TransportationImport.trade_inertia_bounds),
+            Shifter.except_shifter_zero.value, out=buffer[1], mask=mask)
+        delta_export_ad_valorem_tax_rate = np.multiply(
+            self.export_change[Domains.ExogChangeTradeExport.change_export_tax_rate][period_block], period_length,
+            out=buffer[2])
+        delta_import_ad_valorem_tax_rate = np.multiply(
+            self.import_change[Domains.ExogChangeTradeImport.change_import_tax_rate][period_block], period_length,
+            out=buffer[3])
+        freight_cost = np.multiply(
+            self.import_change[Domains.ExogChangeTradeImport.change_freight_cost][period_block], period_length,
+            out=buffer[4])
+        np.add(get_column(DataImport, Domains.TransportationImport.freight_cost), freight_cost, out=freight_cost)
+
+        # TODO define variable names for import costs in delimination to freight costs and ad valorem tax rates (future work)
+        import_tax = np.multiply(get_column(DataImport, Domains.TransportationImport.import_ad_valorem_tax_rate),
+                                 delta_import_ad_valorem_tax_rate, out=delta_import_ad_valorem_tax_rate)
+        import_tax *= np.add(freight_cost, get_column(DataImport, Domains.TransportationImport.price), out=buffer[5])
+        export_tax = np.multiply(get_column(DataExport, Domains.TransportationExport.export_ad_valorem_tax_rate),
+                                 delta_export_ad_valorem_tax_rate, out=delta_export_ad_valorem_tax_rate)
+        export_tax *= get_column(DataExport, Domains.TransportationExport.price)
+        transport_cost = np.add(freight_cost, import_tax, out=buffer[6])
+        transport_cost += export_tax
+
+        DataImport[Domains.TransportationImport.trade_inertia_bounds] = import_trade_inertia_bounds
+        DataExport[Domains.TransportationExport.trade_inertia_bounds] = export_trade_inertia_bounds
+        DataImport[VarNames.TRANSPORT_COSTS.value] = transport_cost
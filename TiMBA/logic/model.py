@@ -1,11 +1,14 @@
 import cvxpy.error
+import cvxpy.settings
 import pandas as pd
 import numpy as np
 import cvxpy as cp
+import scipy.sparse as sp
 from logging import Logger
 
-from TiMBA.results_logging.ResultsWriter import ResultsWriter
+from TiMBA.results_logging.ResultsWriter import ResultsWriter, PeriodResultsWriter
 from TiMBA.data_management.DataManager import DataManager
+from TiMBA.data_management.ModelCheckpoint import ModelCheckpoint
 from TiMBA.data_management.DataContainer import (
     DataContainer, InterfaceWorldData, AdditionalInformation, WorldPriceData)
 from TiMBA.data_validation.DataValidator import DataValidator
@@ -17,8 +20,12 @@ from TiMBA.logic.model_helpers import (
     calc_slope_inverted, calc_slope_regular, calc_intercept, dynamize_demand, dynamize_manufacturing_coeff,
     dynamize_manufacturing_cost, dynamize_supply, dynamize_transportation, actual_period, production_price_calculation,
     transport_cost_calculation, forest_param_alpha, forest_param_gamma, constraint_get_position,
-    extract_product_groups, calc_product_shadow_price, calc_world_shadow_price, calc_product_price,
-    shadow_price_correction, save_price_data)
+    extract_product_groups, get_material_balance_row_index, calc_product_shadow_price, calc_world_shadow_price,
+    calc_product_price, shadow_price_correction, save_price_data)
+from TiMBA.logic.osqp_backend import (
+    OSQPProblem, OSQPQuantity, osqp_variable_bounds, osqp_trade_bound_deviation, osqp_max_harvest,
+    osqp_material_balance, osqp_material_balance_zy, osqp_global_material_balance, osqp_primal_warm_start)
+from TiMBA.logic.dynamization_kernel import DynamizationKernel
 from TiMBA.logic.tests import (verify_trade_balance, verify_material_balance, verify_global_material_balance,
                         verify_supply_upper_bound, verify_trade_bounds)
 
@@ -32,6 +39,8 @@ class TiMBA(object):
                  WorldPriceData: WorldPriceData,
                  LogHandler: Logger,
                  ResultHandler: ResultsWriter,
+                 PeriodResultHandler: PeriodResultsWriter = None,
+                 Checkpoint: ModelCheckpoint = None,
                  ):
         self.Data = Data
         self.UserOptions = UserOptions
@@ -39,14 +48,27 @@ class TiMBA(object):
         self.WorldPriceData = WorldPriceData
         self.Logger = LogHandler
         self.ResultHandler = ResultHandler
+        # Output tables written period by period (optional)
+        self.PeriodResultHandler = PeriodResultHandler
+        # Checkpoints after each period to resume the run (optional)
+        self.Checkpoint = Checkpoint
         self.period_df = actual_period(self.Data.periods_forecast, self.UserOptions.year, self.UserOptions.max_period)
+        # Input data serialized with forest data replicated for each commodity or without exogenous change tensors
+        DataManager.migrate_forest_layout(self.Data)
+        DataManager.create_exog_change_tensor(self.Data)
 
         # Runner Variables
         self.present_period = None
         self.period_length = None
 
+        # Solved problem of the previous period (only used with the osqp optimization backend)
+        self.osqp_problem = None
+
+        # Fused numpy dynamization (only used with the numpy dynamization backend)
+        self.dynamization_kernel = None
+
     def compute(self, max_iteration: int, rel_accuracy: int, abs_accuracy: int, dynamization_activated: bool,
-                constants: list, capped_prices: bool):
+                constants: list, capped_prices: bool, start_period: int = 0):
         """Loop model calculation over existing periods (execute methods and store results of the model)
         :param max_iteration: Maximal number of periods
         :param rel_accuracy: relative accuracy of the solver
@@ -54,12 +76,15 @@ class TiMBA(object):
         :param dynamization_activated: dynamization of the model on or off #TODO remove after validation?
         :param constants: list where the user can choose to run model with constant prices, slopes or intercepts #TODO remove after validation?
         :param capped_prices: flag for correction of production prices (demprices=prodprices) #TODO remove after validation?
+        :param start_period: first period to compute (periods before are restored from a checkpoint)
         """
         for self.present_period, period_block, self.period_length, self.actual_year in zip(
                 self.period_df["Period"], #TODO Hard code (future work)
                 self.period_df["PeriodBlock"],
                 self.period_df["PeriodLength"],
                 self.period_df["ActualYear"]):
+            if self.present_period < start_period:
+                continue
             print()
             self.Logger.info(f"Computing model for Period: {self.present_period}, Period length: {self.period_length},"
                              f" ActualYear: {self.actual_year}")
@@ -102,10 +127,42 @@ class TiMBA(object):
             except BaseException as b_err:
                 self.Logger.error(f"Optimization failed for period {self.present_period}.", exc_info=True)
                 break
-            DataManager.update_periods(self.Data, period=self.present_period)
+            DataManager.update_periods(self.Data, period=self.present_period, num_periods=len(self.period_df))
+            if self.PeriodResultHandler is not None:
+                self.PeriodResultHandler.write_period(DataManager.get_period_output(self.Data, self.present_period),
+                                                      period=self.present_period)
+            if self.Checkpoint is not None:
+                self.Checkpoint.store(self.present_period, (self.Data, self.AdditionalInfo, self.WorldPriceData),
+                                      self.get_checkpoint_state())
+                self.Logger.info(f"Checkpoint of period {self.present_period} saved")
+        else:
+            if self.PeriodResultHandler is not None:
+                self.PeriodResultHandler.complete()
 
+        if self.Data.OptimizationHelpers.data_periods is None:
+            self.Logger.warning(f"No period computed, no additional output generated")
+            return
         DataManager.get_additional_output(self.Data, self.Data.OptimizationHelpers.data_periods, self.Data.Regions.data)
 
+    def get_checkpoint_state(self) -> dict:
+        """
+        Model state needed to continue the run after the present period: the solution of the osqp backend used to warm
+        start the following period (other optimization backends are not warm started).
+        :return: model state
+        """
+        warm_start = None
+        if self.osqp_problem is not None and self.osqp_problem.dual_value is not None:
+            warm_start = self.osqp_problem.get_warm_start_state()
+        return {"period": self.present_period, "warm_start": warm_start}
+
+    def restore_checkpoint_state(self, state: dict):
+        """
+        Restore the model state saved with a checkpoint (see get_checkpoint_state).
+        :param state: model state
+        """
+        if state["warm_start"] is not None:
+            self.osqp_problem = OSQPProblem.restore_warm_start_state(state["warm_start"])
+
     def follow_periods_compute(self, capped_prices: bool):
         """
         Computation and overwrite attributes of following periods. Update IO-matrix, production prices, fuelwood from forest,
@@ -124,7 +181,7 @@ class TiMBA(object):
 
         ImportData = self.Data.TransportationImport.data_aligned
         ExportData = self.Data.TransportationExport.data_aligned
-        WorldPrice = self.Data.WorldPrices.data_periods
+        WorldPrice = self.Data.WorldPrices.period_results.get_period(self.present_period - 1)
         RegionsData = self.Data.Regions.df_length
 
         #TODO keep next comment for possible calculation alternatives with exegenous world price
@@ -132,8 +189,7 @@ class TiMBA(object):
 
         importing_regions = pd.DataFrame(np.where(np.array(ImportData[Domains.TransportationImport.quantity]) > 
                                                   Constants.NON_ZERO_PARAMETER.value, 1, 0))[0]
-        world_price = pd.concat([WorldPrice[WorldPrice["Period"] == self.present_period - 1]["WorldPrice"] #TODO Hard coded (future work)
-                                 ] * RegionsData).reset_index(drop=True)
+        world_price = pd.concat([WorldPrice["WorldPrice"]] * RegionsData).reset_index(drop=True) #TODO Hard coded (future work)
         import_price = world_price + ImportData[transp_cost_col_name]
 
         ImportData[Domains.TransportationImport.price] = import_price * importing_regions
@@ -203,23 +259,20 @@ class TiMBA(object):
             present_period = self.present_period
 
             domain_col_name = VarNames.DOMAIN_COLNAME.value
-            period_col_name = VarNames.PERIOD_COLNAME.value
             price_col_name = VarNames.PRICE_COLNAME.value
             slope_col_name = VarNames.SLOPE_COLNAME.value
             intercept_col_name = VarNames.INTERCEPT_COLNAME.value
+            if present_period > 0:
+                base_period_results = self.Data.OptimizationHelpers.period_results.get_period(0)
 
             if constant_prices and (present_period > 0):
                 self.Data[domain_name].data_aligned[price] = (
-                    self.Data.OptimizationHelpers.data_periods[
-                        (self.Data.OptimizationHelpers.data_periods[domain_col_name] == domain_name) &
-                        (self.Data.OptimizationHelpers.data_periods[period_col_name] == 0)][price_col_name]
+                    base_period_results[base_period_results[domain_col_name] == domain_name][price_col_name]
                 ).reset_index(drop=True)
 
             if constant_slopes and (present_period > 0):
                 self.Data[domain_name].data_aligned[slope_col_name] = (
-                    self.Data.OptimizationHelpers.data_periods[
-                        (self.Data.OptimizationHelpers.data_periods[domain_col_name] == domain_name) &
-                        (self.Data.OptimizationHelpers.data_periods[period_col_name] == 0)][slope_col_name]
+                    base_period_results[base_period_results[domain_col_name] == domain_name][slope_col_name]
                 ).reset_index(drop=True)
             else:
                 if str(Domains.ManufactureCost) in domain_name:
@@ -249,9 +302,7 @@ class TiMBA(object):
 
             if constant_intercepts and (present_period > 0):
                 self.Data[domain_name].data_aligned[intercept_col_name] = (
-                    self.Data.OptimizationHelpers.data_periods[
-                        (self.Data.OptimizationHelpers.data_periods[domain_col_name] == domain_name) &
-                        (self.Data.OptimizationHelpers.data_periods[period_col_name] == 0)][intercept_col_name]
+                    base_period_results[base_period_results[domain_col_name] == domain_name][intercept_col_name]
                 ).reset_index(drop=True)
             else:
                 if str(Domains.ManufactureCost) in domain_name:
@@ -619,12 +670,9 @@ class TiMBA(object):
         :returns np.array: deviation between optimized trade value and bounds; deviation between optimized trade value 
         and previous trade value
         """
-        period_col_name = VarNames.PERIOD_COLNAME.value
         quantity_col_name = VarNames.QUANTITY_COLNAME.value
-        domain_col_name = VarNames.DOMAIN_COLNAME.value
         trade_lower_bnd_var = VarNames.TRADE_LOWER_BOUND.value
         trade_upper_bnd_var = VarNames.TRADE_UPPER_BOUND.value
-        zy_region_var = VarNames.ZY_REGION.value
 
         zero_vector = pd.DataFrame(np.zeros(DOMAIN_LEN))
         one_vector = pd.DataFrame(np.ones(DOMAIN_LEN))
@@ -636,18 +684,13 @@ class TiMBA(object):
 
         # Deviation from trade in previous period (increases and decreases from prev trade)
         #TODO activate by user input
-        prev_trade = self.Data.OptimizationHelpers.data_periods[
-            self.Data.OptimizationHelpers.data_periods[period_col_name] == self.present_period - 1][quantity_col_name]
+        prev_trade = self.Data.OptimizationHelpers.period_results.get_period(self.present_period - 1)[quantity_col_name]
         prev_trade = np.array(prev_trade).reshape(ALL_DOMAINS_LEN, 1)
         delta_prev_trade_increase = cp.multiply((opt_quantity - prev_trade), trade_vector)
         delta_prev_trade_decrease = cp.multiply((prev_trade - opt_quantity), trade_vector)
 
         # No flexible trade bounds for regions without trade
-        trade_mask = self.Data.OptimizationHelpers.data[
-            ([x in [str(Domains.TransportationExport),
-                    str(Domains.TransportationImport)] for x in self.Data.OptimizationHelpers.data[domain_col_name]]) &
-            (self.Data.OptimizationHelpers.data[quantity_col_name] <= Constants.NON_ZERO_PARAMETER.value) &
-            (self.Data.OptimizationHelpers.data[Domains.Supply.region_code] != zy_region_var)].index
+        trade_mask = self.get_trade_bound_index()
 
         constraints += [opt_quantity[trade_mask] >= opt_lbs[trade_mask]]
         constraint_get_position(constraints_position, trade_lower_bnd_var, constraints, constraint_counter)
@@ -657,6 +700,22 @@ class TiMBA(object):
         self.Logger.info(f"Constraint trade bounds done. Delta trade for lower and upper bounds computed.")
         return delta_trade_upper_bound, delta_trade_lower_bound, delta_prev_trade_increase, delta_prev_trade_decrease
 
+    def get_trade_bound_index(self):
+        """
+        Retrieves the index of trade quantities strictly bounded in following periods (regions without trade, zy-region
+        excluded). Deviations from trade bounds are only allowed (and penalized) for the remaining trade quantities.
+        :return: index of strictly bounded trade quantities in OptimizationHelpers.data
+        """
+        domain_col_name = VarNames.DOMAIN_COLNAME.value
+        quantity_col_name = VarNames.QUANTITY_COLNAME.value
+        zy_region_var = VarNames.ZY_REGION.value
+
+        return self.Data.OptimizationHelpers.data[
+            ([x in [str(Domains.TransportationExport),
+                    str(Domains.TransportationImport)] for x in self.Data.OptimizationHelpers.data[domain_col_name]]) &
+            (self.Data.OptimizationHelpers.data[quantity_col_name] <= Constants.NON_ZERO_PARAMETER.value) &
+            (self.Data.OptimizationHelpers.data[Domains.Supply.region_code] != zy_region_var)].index
+
     def constraint_supply(self, constraints: list, constraints_position: dict, constraint_counter: list,
                           opt_quantity: cp.Variable, opt_ubs: np.array, DOMAIN_LEN: int):
         """
@@ -715,7 +774,7 @@ class TiMBA(object):
         self.Logger.info(f"Constraint lower bound for demand done.")
 
     def constraint_max_harvest(self, constraints: list, constraints_position: dict, constraint_counter: list,
-                               opt_quantity: cp.Variable, DOMAIN_LEN: int):
+                               opt_quantity: cp.Variable, constraint_data: dict, DOMAIN_LEN: int):
         """
         Defines optimization constraint for the maximal harvestable wood quantity (upper bound) for each country
         in compliance with the available stock. The variable fraction_fuelwood is modified to capture fraction of all
@@ -725,357 +784,58 @@ class TiMBA(object):
         extraction
         :param constraint_counter: counter tracking of the number of constraints in constraints_position
         :param opt_quantity: independent variable
+        :param constraint_data: dict with period specific constraint data (np.arrays)
         :param DOMAIN_LEN: aligned length of optimized domains
         """
         max_harvest_var = VarNames.MAX_HARVEST.value
-        for region in self.Data.Regions.data[Domains.Regions.region_code].iloc[:self.Data.Regions.df_length - 1]:
-            #TODO could be implemented as a specific iterator (iterate over all regions with zy and all countries without zy)
-            region_index = self.Data.data_aligned[self.Data.data_aligned[Domains.Regions.region_code] == region].index
-            total_harvest = self.Data.Forest.data_aligned[Domains.Forest.ratio_inventory_drain].iloc[
-                                region_index.min()] * cp.sum(
-                cp.multiply(opt_quantity[4 * DOMAIN_LEN + region_index.min(): 4 * DOMAIN_LEN + region_index.max() + 1],
-                            np.array(pd.DataFrame(self.Data.Forest.data_aligned[Domains.Forest.fraction_fuelwood].iloc[
-                                                      region_index]))) / ConversionParameters.MIO_FACTOR.value)
-
-            available_stock = self.Data.Forest.data_aligned[Domains.Forest.forest_stock].iloc[region_index.min()]
-
-            constraints += [total_harvest <= available_stock]
+        harvest_coefficient = constraint_data["harvest_coefficient"]
+        forest_stock = constraint_data["forest_stock"]
+        region_aggregation, region_start_index = self.get_region_aggregation()
+        total_harvest = region_aggregation @ cp.multiply(opt_quantity[4 * DOMAIN_LEN: 5 * DOMAIN_LEN],
+                                                         harvest_coefficient)
+        available_stock = forest_stock[region_start_index]
+
+        constraints += [total_harvest <= available_stock]
         constraint_get_position(constraints_position, max_harvest_var, constraints, constraint_counter)
         self.Logger.info(f"Constraint maximum harvestable forest stock done.")
 
     def constraint_material_balance(self, constraints: list, constraints_position: dict, constraint_counter: list,
-                                    opt_quantity: cp.Variable, DOMAIN_LEN: int):
+                                    opt_quantity: cp.Variable, constraint_data: dict, DOMAIN_LEN: int):
         """
         Defines optimization constraint for the material balance for each country and each product group (raw_prod,
         interm_prod, fin_prod, fuelw and othindrnd). Choice for different types of material balances by user input:
-        RC_specific_MB: region and commodity specific material balance (one constraint per product and country)
-        RCG_specific_MB: region and commodity group specific material balance (raw, final and intermediate products 
-        are grouped in one constraint for each country)
-        optional_MB: #TODO check relevance
-        C_specific_MB: Commodity group specific material balance (raw, final and intermediate products are grouped 
-        in one constraint for all countries; default).
-        From a mathematical point of view all MB are the same. Only for the optimization process these types are 
-        relevant.
+        RC_specific_MB: region and commodity specific material balance (one row per product and country, rows ordered
+        by region)
+        RCG_specific_MB: region and commodity group specific material balance (one constraint for each commodity group
+        with one row per product and country)
+        optional_MB: #TODO check relevance (same constraints as RCG_specific_MB)
+        C_specific_MB: Commodity group specific material balance (one row per product and country, rows ordered by
+        commodity; default).
+        From a mathematical point of view all MB are the same. Each type is built as sparse matrix equalities
+        (see get_material_balance_rows); the types only differ in the row order and the grouping of the rows which
+        determines the extraction of shadow prices.
         :param constraints: list where constraints are saved for the optimization
         :param constraints_position: dict where information (constraint name and position) are saved for the result
          extraction
         :param constraint_counter: counter tracking of the number of constraints in constraints_position
         :param opt_quantity: unknown quantity value to optimize
+        :param constraint_data: dict with period specific constraint data (np.arrays)
         :param DOMAIN_LEN: aligned length of optimized domains
         """
-        domain_col_name = VarNames.DOMAIN_COLNAME.value
-        c_specific_mb_var = VarNames.C_SPECIFIC_MB.value
-        rc_specific_mb_var = VarNames.RC_SPECIFIC_MB.value
-        rcg_specific_mb_var = VarNames.RCG_SPECIFIC_MB.value
-        optional_mb_var = VarNames.OPT_MB.value
-
-        (raw_prod_vector, interm_prod_vector, fin_prod_vector, fuelw_vector, othindrnd_vector,
-         raw_prod, interm_prod, fin_prod, fuelw, othindrnd
-         ) = extract_product_groups(world_data=self.Data, commodity_data=self.Data.Commodities,
-                                    region_data=self.Data.Regions, all_regions=False, only_commodity_codes=False)
         material_balance_var = VarNames.MATERIAL_BALANCE.value
-        if (self.UserOptions.material_balance == rc_specific_mb_var or
-                self.UserOptions.material_balance == rcg_specific_mb_var or
-                self.UserOptions.material_balance == optional_mb_var):
-
-            for region in self.Data.Regions.data[Domains.Regions.region_code].iloc[:self.Data.Regions.df_length - 1]:
-
-                region_index_max = max(self.Data.data_aligned[self.Data.data_aligned[
-                                                                  Domains.Regions.region_code] == region].index) + 1
-                region_index_min = min(self.Data.data_aligned[self.Data.data_aligned[
-                                                                  Domains.Regions.region_code] == region].index)
-                io_matrix_region = np.array(pd.DataFrame(self.Data.ManufactureCoefficients.ioMatrix).iloc[
-                                            region_index_min:region_index_max, region_index_min:region_index_max])
-
-                demand_opt_region = opt_quantity[region_index_min:region_index_max]
-                export_opt_region = opt_quantity[DOMAIN_LEN + region_index_min: DOMAIN_LEN + region_index_max]
-                import_opt_region = opt_quantity[2 * DOMAIN_LEN + region_index_min: 2 * DOMAIN_LEN + region_index_max]
-                manuD_opt_region = opt_quantity[3 * DOMAIN_LEN + region_index_min: 3 * DOMAIN_LEN + region_index_max]
-                supply_opt_region = opt_quantity[4 * DOMAIN_LEN + region_index_min: 4 * DOMAIN_LEN + region_index_max]
-                manuS_opt_quantity = self.Data.ManufactureCoefficients.ioMatrix @ opt_quantity[
-                                                                                  3 * DOMAIN_LEN: 4 * DOMAIN_LEN]
-
-                optimization_data = self.Data.OptimizationHelpers.data[
-                    [Domains.Regions.region_code, domain_col_name, Domains.Commodities.commodity_code]]
-
-                # raw materials
-                raw_prod_supply_index_region = optimization_data[
-                    (optimization_data[Domains.Regions.region_code] == region) &
-                    (optimization_data[domain_col_name] == self.Data.Supply.domain) &
-                    ([x in raw_prod for x in optimization_data[Domains.Commodities.commodity_code]])].index
-
-                raw_prod_import_index_region = optimization_data[
-                    (optimization_data[Domains.Regions.region_code] == region) &
-                    (optimization_data[domain_col_name] == self.Data.TransportationImport.domain) &
-                    ([x in raw_prod for x in optimization_data[Domains.Commodities.commodity_code]])].index
-
-                raw_prod_export_index_region = optimization_data[
-                    (optimization_data[Domains.Regions.region_code] == region) &
-                    (optimization_data[domain_col_name] == self.Data.TransportationExport.domain) &
-                    ([x in raw_prod for x in optimization_data[Domains.Commodities.commodity_code]])].index
-
-                raw_prod_demand_index_region = optimization_data[
-                    (optimization_data[Domains.Regions.region_code] == region) &
-                    (optimization_data[domain_col_name] == self.Data.Demand.domain) &
-                    ([x in raw_prod for x in optimization_data[Domains.Commodities.commodity_code]])].index
-
-                # Intermediate products
-                interm_prod_import_index_region = optimization_data[
-                    (optimization_data[Domains.Regions.region_code] == region) &
-                    (optimization_data[domain_col_name] == self.Data.TransportationImport.domain) &
-                    ([x in interm_prod for x in optimization_data[Domains.Commodities.commodity_code]])].index
-
-                interm_prod_export_index_region = optimization_data[
-                    (optimization_data[Domains.Regions.region_code] == region) &
-                    (optimization_data[domain_col_name] == self.Data.TransportationExport.domain) &
-                    ([x in interm_prod for x in optimization_data[Domains.Commodities.commodity_code]])].index
-
-                interm_prod_manu_index_region = optimization_data[
-                    (optimization_data[Domains.Regions.region_code] == region) &
-                    (optimization_data[domain_col_name] == self.Data.ManufactureCost.domain) &
-                    ([x in interm_prod for x in optimization_data[Domains.Commodities.commodity_code]])].index
-
-                interm_prod_demand_index_region = optimization_data[
-                    (optimization_data[Domains.Regions.region_code] == region) &
-                    (optimization_data[domain_col_name] == self.Data.Demand.domain) &
-                    ([x in interm_prod for x in optimization_data[Domains.Commodities.commodity_code]])].index
-
-                # final products
-                fin_prod_import_index_region = optimization_data[
-                    (optimization_data[Domains.Regions.region_code] == region) &
-                    (optimization_data[domain_col_name] == self.Data.TransportationImport.domain) &
-                    ([x in fin_prod for x in optimization_data[Domains.Commodities.commodity_code]])].index
-
-                fin_prod_export_index_region = optimization_data[
-                    (optimization_data[Domains.Regions.region_code] == region) &
-                    (optimization_data[domain_col_name] == self.Data.TransportationExport.domain) &
-                    ([x in fin_prod for x in optimization_data[Domains.Commodities.commodity_code]])].index
-
-                fin_prod_manu_index_region = optimization_data[
-                    (optimization_data[Domains.Regions.region_code] == region) &
-                    (optimization_data[domain_col_name] == self.Data.ManufactureCost.domain) &
-                    ([x in fin_prod for x in optimization_data[Domains.Commodities.commodity_code]])].index
-
-                fin_prod_demand_index_region = optimization_data[
-                    (optimization_data[Domains.Regions.region_code] == region) &
-                    (optimization_data[domain_col_name] == self.Data.Demand.domain) &
-                    ([x in fin_prod for x in optimization_data[Domains.Commodities.commodity_code]])].index
-
-                # fuelwood
-                fuelw_supply_index_region = optimization_data[
-                    (optimization_data[Domains.Regions.region_code] == region) &
-                    (optimization_data[domain_col_name] == self.Data.Supply.domain) &
-                    (optimization_data[Domains.Commodities.commodity_code] == fuelw)].index
-
-                fuelw_import_index_region = optimization_data[
-                    (optimization_data[Domains.Regions.region_code] == region) &
-                    (optimization_data[domain_col_name] == self.Data.TransportationImport.domain) &
-                    (optimization_data[Domains.Commodities.commodity_code] == fuelw)].index
-
-                fuelw_export_index_region = optimization_data[
-                    (optimization_data[Domains.Regions.region_code] == region) &
-                    (optimization_data[domain_col_name] == self.Data.TransportationExport.domain) &
-                    (optimization_data[Domains.Commodities.commodity_code] == fuelw)].index
-
-                fuelw_demand_index_region = optimization_data[
-                    (optimization_data[Domains.Regions.region_code] == region) &
-                    (optimization_data[domain_col_name] == self.Data.Demand.domain) &
-                    (optimization_data[Domains.Commodities.commodity_code] == fuelw)].index
-
-                # other industrial roundwood
-                othindrnd_supply_index_region = optimization_data[
-                    (optimization_data[Domains.Regions.region_code] == region) &
-                    (optimization_data[domain_col_name] == self.Data.Supply.domain) &
-                    (optimization_data[Domains.Commodities.commodity_code] == othindrnd)].index
-
-                othindrnd_demand_index_region = optimization_data[
-                    (optimization_data[Domains.Regions.region_code] == region) &
-                    (optimization_data[domain_col_name] == self.Data.Demand.domain) &
-                    (optimization_data[Domains.Commodities.commodity_code] == othindrnd)].index
-
-                #TODO check if te following passages could be split in single functions for each type of MB.
-                if self.UserOptions.material_balance == rc_specific_mb_var:
-                    """
-                    Region and commodity specific material balance: one constraint for each product in each region.
-                    constraint number = len(commodities) * len(regions)
-                    Not used for validation due to the long processing time of the large constraint number
-                    """
-
-                    for commodity in self.Data.Commodities.data[Domains.Commodities.commodity_code]:
-                        help_vector = np.array(self.Data.Commodities.data[Domains.Commodities.commodity_code]
-                                               ).reshape([len(self.Data.Commodities.data), 1])
-                        help_vector = np.where(help_vector == commodity, 1, 0)
-                        region_vector = self.Data.data_aligned[region_index_min: region_index_max]
-                        commodity_index = region_vector[
-                            region_vector[Domains.Commodities.commodity_code] == commodity].index
-
-                        demand_opt_commodity = opt_quantity[commodity_index]
-                        export_opt_commodity = opt_quantity[DOMAIN_LEN + commodity_index]
-                        import_opt_commodity = opt_quantity[2 * DOMAIN_LEN + commodity_index]
-                        manu_opt_commodity = opt_quantity[3 * DOMAIN_LEN + commodity_index]
-                        supply_opt_commodity = opt_quantity[4 * DOMAIN_LEN + commodity_index]
-
-                        # raw materials
-                        if [x in raw_prod for x in list([commodity])][0]:
-                            constraints += [import_opt_commodity + supply_opt_commodity ==
-                                            cp.sum(cp.multiply(io_matrix_region @ manuD_opt_region, help_vector))
-                                            + export_opt_commodity
-                                            ]
-                        # fuelwood
-                        if commodity == fuelw:
-                            constraints += [import_opt_commodity + supply_opt_commodity ==
-                                            demand_opt_commodity + export_opt_commodity
-                                            ]
-                        # other_industrial_wood
-                        if commodity == othindrnd:
-                            constraints += [supply_opt_commodity == demand_opt_commodity
-                                            ]
-                        # intermediate_products
-                        if [x in interm_prod for x in list([commodity])][0]:
-                            constraints += [import_opt_commodity + manu_opt_commodity ==
-                                            cp.sum(cp.multiply(io_matrix_region @ manuD_opt_region, help_vector))
-                                            + export_opt_commodity
-                                            ]
-                        # final products
-                        if [x in fin_prod for x in list([commodity])][0]:
-                            constraints += [import_opt_commodity
-                                            + manu_opt_commodity ==
-                                            demand_opt_commodity
-                                            + export_opt_commodity
-                                            ]
-
-                if self.UserOptions.material_balance == rcg_specific_mb_var:
-                    """
-                    Region and commodity specific material balance: one constraint for each commodity group in each. 
-                    region with helper vectors
-                    constraint number: 5 commodity groups * len(regions)
-                    Used for validation with calculated prices
-                    """
-                    # raw materials
-                    constraints += [cp.multiply(import_opt_region, raw_prod_vector)
-                                    + cp.multiply(supply_opt_region, raw_prod_vector) ==
-                                    cp.multiply(io_matrix_region @ manuD_opt_region, raw_prod_vector)
-                                    + cp.multiply(export_opt_region, raw_prod_vector)
-                                    ]
-
-                    # intermediate products
-                    constraints += [cp.multiply(import_opt_region, interm_prod_vector)
-                                    + cp.multiply(manuD_opt_region, interm_prod_vector) ==
-                                    cp.multiply(io_matrix_region @ manuD_opt_region, interm_prod_vector)
-                                    + cp.multiply(export_opt_region, interm_prod_vector)
-                                    ]
-
-                    # final products
-                    constraints += [cp.multiply(import_opt_region, fin_prod_vector)
-                                    + cp.multiply(manuD_opt_region, fin_prod_vector) ==
-                                    cp.multiply(demand_opt_region, fin_prod_vector)
-                                    + cp.multiply(export_opt_region, fin_prod_vector)
-                                    ]
-
-                    # fuelwood
-                    constraints += [cp.multiply(import_opt_region, fuelw_vector)
-                                    + cp.multiply(supply_opt_region, fuelw_vector) ==
-                                    cp.multiply(demand_opt_region, fuelw_vector)
-                                    + cp.multiply(export_opt_region, fuelw_vector)
-                                    ]
-
-                    # other industrial roundwood
-                    constraints += [cp.multiply(supply_opt_region, othindrnd_vector) ==
-                                    cp.multiply(demand_opt_region, othindrnd_vector)
-                                    ]
-
-                if self.UserOptions.material_balance == optional_mb_var:
-                    """
-                    Optional material balance: commodity group and region specific material balance with indexes instead 
-                    of help vectors as RCG_specific_MB.
-                    constraint number: 5 commodity groups * len(regions)
-                    Not used for validation as C_specific_MB yield comparable shadow prices with higher processing speed 
-                    """
-                    # raw materials new version
-                    constraints += [opt_quantity[raw_prod_import_index_region]
-                                    + opt_quantity[raw_prod_supply_index_region] ==
-                                    manuS_opt_quantity[raw_prod_demand_index_region]
-                                    + opt_quantity[raw_prod_export_index_region]
-                                    ]
-
-                    # intermediate products new version
-                    constraints += [opt_quantity[interm_prod_import_index_region]
-                                    + opt_quantity[interm_prod_manu_index_region] ==
-                                    manuS_opt_quantity[interm_prod_demand_index_region]
-                                    + opt_quantity[interm_prod_export_index_region]
-                                    ]
-
-                    # final products new version
-                    constraints += [opt_quantity[fin_prod_import_index_region]
-                                    + opt_quantity[fin_prod_manu_index_region] ==
-                                    opt_quantity[fin_prod_demand_index_region]
-                                    + opt_quantity[fin_prod_export_index_region]
-                                    ]
-
-                    # fuelwood new version
-                    constraints += [opt_quantity[fuelw_import_index_region]
-                                    + opt_quantity[fuelw_supply_index_region] ==
-                                    opt_quantity[fuelw_demand_index_region]
-                                    + opt_quantity[fuelw_export_index_region]
-                                    ]
-
-                    # other industrial roundwood new version
-                    constraints += [opt_quantity[othindrnd_supply_index_region] ==
-                                    opt_quantity[othindrnd_demand_index_region]
-                                    ]
-
-        if self.UserOptions.material_balance == c_specific_mb_var:
-            """
-            Commodity specific material balance: one constraint for each commodity over all regions.
-            constraint number: len(commodities)
-            Used for validation of shadow prices
-            """
-            # Define io_matrix and manu_opt
-
-            io_matrix = self.Data.ManufactureCoefficients.ioMatrixshort
-            manu_opt = opt_quantity[3 * DOMAIN_LEN: 4 * DOMAIN_LEN - len(self.Data.Commodities.data)]
-            help_pd = self.Data.data_aligned[Domains.Commodities.commodity_code].iloc[
-                      :(len(self.Data.data_aligned) - len(self.Data.Commodities.data))]
-
-            for commodity in self.Data.Commodities.data[Domains.Commodities.commodity_code]:
-                commodity_index = help_pd[help_pd == commodity].index
-
-                demand_opt_commodity = opt_quantity[commodity_index]
-                export_opt_commodity = opt_quantity[DOMAIN_LEN + commodity_index]
-                import_opt_commodity = opt_quantity[2 * DOMAIN_LEN + commodity_index]
-                manuD_opt_commodity = opt_quantity[3 * DOMAIN_LEN + commodity_index]
-                supply_opt_commodity = opt_quantity[4 * DOMAIN_LEN + commodity_index]
-                manuS_opt_commodity = (io_matrix @ manu_opt)[commodity_index]
-
-                if [x in raw_prod for x in list([commodity])][0]:
-                    constraints += [import_opt_commodity + supply_opt_commodity ==
-                                    manuS_opt_commodity + export_opt_commodity
-                                    ]
-                # fuelwood
-                if commodity == fuelw:
-                    constraints += [import_opt_commodity + supply_opt_commodity ==
-                                    demand_opt_commodity + export_opt_commodity
-                                    ]
-                # other_industrial_wood
-                if commodity == othindrnd:
-                    constraints += [supply_opt_commodity == demand_opt_commodity
-                                    ]
-                # intermediate_products
-                if [x in interm_prod for x in list([commodity])][0]:
-                    constraints += [import_opt_commodity + manuD_opt_commodity ==
-                                    manuS_opt_commodity + export_opt_commodity
-                                    ]
-                # final products
-                if [x in fin_prod for x in list([commodity])][0]:
-                    constraints += [import_opt_commodity + manuD_opt_commodity ==
-                                    demand_opt_commodity + export_opt_commodity
-                                    ]
+        manuS_opt_quantity = self.get_io_product(constraint_data, opt_quantity[3 * DOMAIN_LEN: 4 * DOMAIN_LEN])
+
+        for row_index in self.get_material_balance_rows():
+            material_balance_structure = self.get_material_balance_structure(DOMAIN_LEN=DOMAIN_LEN,
+                                                                             row_index=row_index)
+            constraints += [material_balance_structure["domain_matrix"] @ opt_quantity +
+                            material_balance_structure["io_weight_matrix"] @ manuS_opt_quantity == 0]
 
         constraint_get_position(constraints_position, material_balance_var, constraints, constraint_counter)
         self.Logger.info(f"Material balance constraint for all regions done.")
 
     def constraint_material_balance_zy(self, constraints: list, constraints_position: dict, constraint_counter: list,
-                                       opt_quantity: cp.Variable, DOMAIN_LEN: int):
+                                       opt_quantity: cp.Variable, constraint_data: dict, DOMAIN_LEN: int):
         """
         Defines the combined optimization constraint for material balance for zy-region for each product.
         1. constraint balances out surpluses of demand and supply of all countries with exports and imports from zy.
@@ -1091,6 +851,7 @@ class TiMBA(object):
         extraction
         :param constraint_counter: counter tracking of the number of constraints in constraints_position
         :param opt_quantity: independent variable
+        :param constraint_data: dict with period specific constraint data (np.arrays)
         :param DOMAIN_LEN: aligned length of optimized domains
         """
         zy_material_balance_var = VarNames.MATERIAL_BALANCE_ZY.value
@@ -1129,29 +890,35 @@ class TiMBA(object):
         for commodity in self.Data.Commodities.data[Domains.Commodities.commodity_code]:
             commodity_zy_index = zy_region[zy_region[Domains.Commodities.commodity_code] == commodity].index
 
-            constraints += [opt_quantity[DOMAIN_LEN + commodity_zy_index] == zy_export[commodity_zy_index]]
+            constraints += [opt_quantity[DOMAIN_LEN + commodity_zy_index] ==
+                            constraint_data["export_quantity"][commodity_zy_index]]
 
         constraint_get_position(constraints_position, zy_export_var, constraints, constraint_counter)
 
         for commodity in self.Data.Commodities.data[Domains.Commodities.commodity_code]:
             commodity_zy_index = zy_region[zy_region[Domains.Commodities.commodity_code] == commodity].index
 
-            constraints += [opt_quantity[2 * DOMAIN_LEN + commodity_zy_index] == zy_import[commodity_zy_index]]
+            constraints += [opt_quantity[2 * DOMAIN_LEN + commodity_zy_index] ==
+                            constraint_data["import_quantity"][commodity_zy_index]]
 
         constraint_get_position(constraints_position, zy_import_var, constraints, constraint_counter)
 
         self.Logger.info(f"Material balance constraints for zy-region done.")
 
     def constraint_global_material_balance(self, constraints: list, constraints_position: dict,
-                                           constraint_counter: list, opt_quantity: cp.Variable, DOMAIN_LEN: int):
+                                           constraint_counter: list, opt_quantity: cp.Variable, constraint_data: dict,
+                                           DOMAIN_LEN: int):
         """
-        Defines optimization constraints for a global material balance over all regions. zy-region is used to balance
-        deficits and surplus in exports and imports globally.
+        Defines optimization constraints for a global material balance over all regions (zy-region excluded). zy-region
+        is used to balance deficits and surplus in exports and imports globally (see constraint_material_balance_zy).
+        Trade of the zy-region is fixed to the calibration and is not part of the balance (otherwise zy-region exports
+        and imports would have to be balanced for each commodity group and the problem becomes infeasible).
         :param constraints: list where constraints are saved for the optimization
         :param constraints_position: dict where information (constraint name and position) are saved for the result
         extraction
         :param constraint_counter: counter tracking of the number of constraints in constraints_position
         :param opt_quantity: unknown quantity value to optimize
+        :param constraint_data: dict with period specific constraint data (np.arrays)
         :param DOMAIN_LEN: aligned length of optimized domains
         """
 
@@ -1160,14 +927,8 @@ class TiMBA(object):
          ) = extract_product_groups(world_data=self.Data, commodity_data=self.Data.Commodities,
                                     region_data=self.Data.Regions, all_regions=True, only_commodity_codes=False)
 
-        raw_prod_vector_short = raw_prod_vector[:self.Data.Commodities.df_length]
-        interm_prod_vector_short = interm_prod_vector[:self.Data.Commodities.df_length]
-        fin_prod_vector_short = fin_prod_vector[:self.Data.Commodities.df_length]
-        fuelw_vector_short = fuelw_vector[:self.Data.Commodities.df_length]
-
-        io_matrix = self.Data.ManufactureCoefficients.ioMatrixshort
-        zy_import = opt_quantity[2 * DOMAIN_LEN - self.Data.Commodities.df_length: 2 * DOMAIN_LEN]
-        zy_export = opt_quantity[DOMAIN_LEN - self.Data.Commodities.df_length: DOMAIN_LEN]
+        manuS_opt_quantity = self.get_io_product(constraint_data, opt_quantity[3 * DOMAIN_LEN: 4 * DOMAIN_LEN])[
+                             0: DOMAIN_LEN - self.Data.Commodities.df_length]
         opt_demand = opt_quantity[0: DOMAIN_LEN - self.Data.Commodities.df_length]
         opt_export = opt_quantity[DOMAIN_LEN: 2 * DOMAIN_LEN - self.Data.Commodities.df_length]
         opt_import = opt_quantity[2 * DOMAIN_LEN: 3 * DOMAIN_LEN - self.Data.Commodities.df_length]
@@ -1175,42 +936,35 @@ class TiMBA(object):
         opt_supply = opt_quantity[4 * DOMAIN_LEN: 5 * DOMAIN_LEN - self.Data.Commodities.df_length]
 
         constraints += [cp.sum(cp.multiply(opt_import, raw_prod_vector))
-                        + cp.sum(cp.multiply(zy_import, raw_prod_vector_short))
                         + cp.sum(cp.multiply(opt_supply, raw_prod_vector)) ==
-                        cp.sum(cp.multiply(io_matrix @ opt_manu, raw_prod_vector))
+                        cp.sum(cp.multiply(manuS_opt_quantity, raw_prod_vector))
                         + cp.sum(cp.multiply(opt_export, raw_prod_vector))
-                        + cp.sum(cp.multiply(zy_export, raw_prod_vector_short))
                         ]
 
         constraints += [cp.sum(cp.multiply(opt_import, interm_prod_vector))
-                        + cp.sum(cp.multiply(zy_import, interm_prod_vector_short))
                         + cp.sum(cp.multiply(opt_manu, interm_prod_vector)) ==
-                        cp.sum(cp.multiply(io_matrix @ opt_manu, interm_prod_vector))
+                        cp.sum(cp.multiply(manuS_opt_quantity, interm_prod_vector))
                         + cp.sum(cp.multiply(opt_export, interm_prod_vector))
-                        + cp.sum(cp.multiply(zy_export, interm_prod_vector_short))
                         ]
 
         constraints += [cp.sum(cp.multiply(opt_import, fin_prod_vector))
-                        + cp.sum(cp.multiply(zy_import, fin_prod_vector_short))
                         + cp.sum(cp.multiply(opt_manu, fin_prod_vector)) ==
                         cp.sum(cp.multiply(opt_demand, fin_prod_vector))
                         + cp.sum(cp.multiply(opt_export, fin_prod_vector))
-                        + cp.sum(cp.multiply(zy_export, fin_prod_vector_short))
                         ]
 
         constraints += [cp.sum(cp.multiply(opt_import, fuelw_vector))
-                        + cp.sum(cp.multiply(zy_import, fuelw_vector_short))
                         + cp.sum(cp.multiply(opt_supply, fuelw_vector)) ==
                         cp.sum(cp.multiply(opt_demand, fuelw_vector))
                         + cp.sum(cp.multiply(opt_export, fuelw_vector))
-                        + cp.sum(cp.multiply(zy_export, fuelw_vector_short))
                         ]
 
         constraints += [cp.sum(cp.multiply(opt_supply, othindrnd_vector)) ==
                         cp.sum(cp.multiply(opt_demand, othindrnd_vector))
                         ]
 
-        constraint_get_position(constraints_position, "Global_Material_Balance_test", constraints, constraint_counter)
+        constraint_get_position(constraints_position, VarNames.GLOBAL_MATERIAL_BALANCE.value, constraints,
+                                constraint_counter)
         self.Logger.info(f"Global material balance constraints done.")
 
     def trade_deviation_penalties(self, ALL_DOMAINS_LEN, delta_trade_lower_bound, delta_trade_upper_bound,
@@ -1232,11 +986,29 @@ class TiMBA(object):
         :return trade_prev_deviation_penalty: aligned penalties for deviations from trade quantities in previous period
         :return sum_delta_trade_prev: sum of deviations in trade quantities from trade quantities in previous period
         """
-        domain_col_name = VarNames.DOMAIN_COLNAME.value
-        zy_region_var = VarNames.ZY_REGION.value
         sum_delta_trade_bound = cp.abs(delta_trade_lower_bound) + cp.abs(delta_trade_upper_bound)
         sum_delta_trade_prev = cp.abs(delta_prev_trade_decrease) + cp.abs(delta_prev_trade_increase)
 
+        # Penalty for deviations from trade bounds
+        trade_bound_deviation_penalty, trade_mask = self.get_trade_bound_deviation_penalty(ALL_DOMAINS_LEN)
+
+        # Penalty for deviations from trade in previous period
+        trade_prev_deviation_penalty = pd.DataFrame(np.zeros(ALL_DOMAINS_LEN))
+        trade_prev_deviation_penalty.loc[trade_mask, 0] = Constants.TRADE_PREV_DEVIATION_PENALTY.value
+        trade_prev_deviation_penalty = np.array(trade_prev_deviation_penalty)
+
+        return trade_bound_deviation_penalty, sum_delta_trade_bound, trade_prev_deviation_penalty, sum_delta_trade_prev
+
+    def get_trade_bound_deviation_penalty(self, ALL_DOMAINS_LEN):
+        """
+        Computes the penalties for deviations from trade bounds based on world prices of the previous period.
+        :param ALL_DOMAINS_LEN: aligned length of all optimized domains
+        :return trade_bound_deviation_penalty: aligned penalties for trade bound deviations
+        :return trade_mask: index of penalized trade quantities
+        """
+        domain_col_name = VarNames.DOMAIN_COLNAME.value
+        zy_region_var = VarNames.ZY_REGION.value
+
         trade_mask = self.Data.OptimizationHelpers.data[
             ([x in [
                 str(Domains.TransportationExport),
@@ -1250,8 +1022,7 @@ class TiMBA(object):
 
         prev_wp = pd.DataFrame(
             trade_mask[Domains.TransportationImport.commodity_code]).merge(
-            self.Data.WorldPrices.data_periods[
-                self.Data.WorldPrices.data_periods["Period"] == self.present_period - 1],
+            self.Data.WorldPrices.period_results.get_period(self.present_period - 1),
             left_on=f"{Domains.TransportationImport.commodity_code}",
             right_on=f"{Domains.TransportationImport.commodity_code}",
             how="left")
@@ -1259,36 +1030,24 @@ class TiMBA(object):
         trade_mask = trade_mask.index
         prev_wp = prev_wp.set_index(trade_mask)["WorldPrice"]  # TODO Hard code (future work)
 
-        # Penalty for deviations from trade bounds
         trade_bound_deviation_penalty = pd.DataFrame(np.zeros(ALL_DOMAINS_LEN))
         # trade deviation penalty with previous world prices
         trade_bound_deviation_penalty.loc[trade_mask, 0] = prev_wp.loc[trade_mask]
         trade_bound_deviation_penalty = np.array(trade_bound_deviation_penalty)
         # trade deviation penalty with abitrary weight
         # trade_deviation_penalty.loc[trade_mask, 0] = Constants.TRADE_BOUND_DEVIATION_PENALTY.value
+        return trade_bound_deviation_penalty, trade_mask
 
-        # Penalty for deviations from trade in previous period
-        trade_prev_deviation_penalty = pd.DataFrame(np.zeros(ALL_DOMAINS_LEN))
-        trade_prev_deviation_penalty.loc[trade_mask, 0] = Constants.TRADE_PREV_DEVIATION_PENALTY.value
-        trade_prev_deviation_penalty = np.array(trade_prev_deviation_penalty)
-
-        return trade_bound_deviation_penalty, sum_delta_trade_bound, trade_prev_deviation_penalty, sum_delta_trade_prev
-
-    def setup_optimization_constraints(self, dynamization_activated: bool):
+    def verify_optimization_input(self, opt_lbs: np.ndarray, opt_ubs: np.ndarray, slope: np.ndarray,
+                                  intercept: np.ndarray):
         """
-        Set-up the optimization constraints and save them together with related information for the optimization
-        :param dynamization_activated: dynamization of the model on or off #TODO remove after validation?
-        :return: optimization parameters (opt_quantity), optimization constraints (constraints,
-        constraints_position), slopes and intercepts and domain lengths (DOMAIN_LEN, ALL_DOMAIN_LEN)
+        Infeasibility- and DCP-rules-check of the optimization input (negative bounds, curvature of the objective
+        function). Findings are logged for the respective regions and products.
+        :param opt_lbs: optimization lower bounds
+        :param opt_ubs: optimization upper bounds
+        :param slope: corrected slopes of the objective function
+        :param intercept: corrected intercepts of the objective function
         """
-        DOMAIN_LEN, ALL_DOMAINS_LEN, opt_quantity, slope, intercept = self.optimization_setup()
-        opt_lbs, opt_ubs = self.set_bounds(dynamization_activated=dynamization_activated)
-        opt_lbs, opt_ubs = opt_lbs.reshape(ALL_DOMAINS_LEN, 1), opt_ubs.reshape(ALL_DOMAINS_LEN, 1)
-
-        constraints = []
-        constraints_position = {}
-        constraint_counter = [0]
-
         # Infeasibilty-check of the optimization problem (check for negativ bounds)
         verify_ubs, verify_lbs = pd.DataFrame(opt_ubs), pd.DataFrame(opt_lbs)
         if not verify_ubs[verify_ubs[0] < 0].index.any():
@@ -1331,6 +1090,202 @@ class TiMBA(object):
             # Exogen intercept correction
             # pd.DataFrame(intercept).loc[verify_index] = pd.DataFrame(intercept).loc[verify_index] * -1 #TODO check relevance
 
+    def get_constraint_data(self):
+        """
+        Collects period specific data used in the optimization constraints (aligned to data_aligned) of the cvxpy and
+        the osqp optimization backend.
+        :return: dict with io-matrix, harvest coefficients, forest stocks, export and import quantities
+        """
+        DOMAIN_LEN = len(self.Data.data_aligned)
+
+        # Forest data (one row for each region) are broadcast to the aligned rows. Order of operations as in the
+        # canonicalized cvxpy-expression (solver results are sensitive to rounding)
+        harvest_coefficient = (
+                DataManager.get_forest_aligned(self.Data, Domains.Forest.ratio_inventory_drain) *
+                (self.Data.Forest.fraction_fuelwood_aligned * (1 / ConversionParameters.MIO_FACTOR.value))
+        ).reshape(DOMAIN_LEN, 1)
+        forest_stock = DataManager.get_forest_aligned(self.Data, Domains.Forest.forest_stock).reshape(DOMAIN_LEN, 1)
+
+        export_quantity = np.array(self.Data.TransportationExport.data_aligned[
+                                       Domains.TransportationExport.quantity]).reshape(DOMAIN_LEN, 1)
+        import_quantity = np.array(self.Data.TransportationImport.data_aligned[
+                                       Domains.TransportationImport.quantity]).reshape(DOMAIN_LEN, 1)
+
+        return {"io_matrix": sp.csr_matrix(self.Data.ManufactureCoefficients.ioMatrix),
+                "harvest_coefficient": harvest_coefficient,
+                "forest_stock": forest_stock,
+                "export_quantity": export_quantity,
+                "import_quantity": import_quantity}
+
+    def get_io_coefficient_index(self):
+        """
+        Retrieves row and column indexes of all io-coefficients in the block diagonal ioMatrix which may be non-zero in
+        any period (commodity pairs with manufacture coefficients in the input data, repeated for each region).
+        :return: row and column indexes of the io-coefficients
+        """
+        commodity_index = pd.Index(self.Data.Commodities.data[Domains.Commodities.commodity_code])
+        COMMODITY_LEN = len(commodity_index)
+        io_matrix = sp.coo_matrix(self.Data.ManufactureCoefficients.ioMatrix)
+        manufacture_coefficients = self.Data.ManufactureCoefficients.data_aligned
+
+        input_index = commodity_index.get_indexer(manufacture_coefficients[Domains.Commodities.commodity_code])
+        output_index = commodity_index.get_indexer(
+            manufacture_coefficients[Domains.ManufactureCoefficients.output_commodity])
+        valid_index = (input_index >= 0) & (output_index >= 0)
+        commodity_pairs = np.zeros((COMMODITY_LEN, COMMODITY_LEN), dtype=bool)
+        commodity_pairs[input_index[valid_index], output_index[valid_index]] = True
+
+        io_select = io_matrix.data != 0
+        commodity_pairs[io_matrix.row[io_select] % COMMODITY_LEN, io_matrix.col[io_select] % COMMODITY_LEN] = True
+
+        pair_rows, pair_cols = np.nonzero(commodity_pairs)
+        region_offset = (np.arange(self.Data.Regions.df_length) * COMMODITY_LEN).reshape(-1, 1)
+        return (region_offset + pair_rows).ravel(), (region_offset + pair_cols).ravel()
+
+    def get_io_product(self, constraint_data: dict, manu_quantity):
+        """
+        Computes the input quantities needed for the manufactured quantities (ioMatrix @ manu_quantity).
+        :param constraint_data: dict with period specific constraint data (np.arrays)
+        :param manu_quantity: manufactured quantities of all regions
+        :return: input quantities for manufacturing of all regions
+        """
+        return constraint_data["io_matrix"] @ manu_quantity
+
+    def get_material_balance_rows(self):
+        """
+        Retrieves the aligned index of the rows of each material balance constraint (zy-region excluded) depending on
+        the material balance type:
+        C_specific_MB: one constraint, rows ordered by commodity
+        RC_specific_MB: one constraint, rows ordered by region (aligned order)
+        RCG_specific_MB and optional_MB: one constraint for each commodity group (raw_prod, interm_prod, fin_prod,
+        fuelw and othindrnd), rows ordered by region
+        :return: list with the aligned index of the rows for each material balance constraint
+        """
+        commodities = list(self.Data.Commodities.data[Domains.Commodities.commodity_code])
+        MB_LEN = len(self.Data.data_aligned) - len(commodities)
+
+        if self.UserOptions.material_balance == VarNames.C_SPECIFIC_MB.value:
+            row_index, _ = get_material_balance_row_index(
+                commodity_vector=self.Data.data_aligned[Domains.Commodities.commodity_code].iloc[:MB_LEN],
+                commodity_list=commodities)
+            return [row_index]
+
+        if self.UserOptions.material_balance == VarNames.RC_SPECIFIC_MB.value:
+            return [np.arange(MB_LEN)]
+
+        if self.UserOptions.material_balance in [VarNames.RCG_SPECIFIC_MB.value, VarNames.OPT_MB.value]:
+            product_groups = extract_product_groups(
+                world_data=self.Data, commodity_data=self.Data.Commodities, region_data=self.Data.Regions,
+                all_regions=True, only_commodity_codes=False)[:5]
+            return [np.nonzero(group_vector.ravel()[:MB_LEN])[0] for group_vector in product_groups]
+
+        return []
+
+    def get_material_balance_structure(self, DOMAIN_LEN: int, row_index: np.ndarray):
+        """
+        Builds the sparse coefficient matrices of a material balance constraint with one row for each selected region
+        and commodity (zy-region excluded):
+        domain_matrix @ opt_quantity + io_weight_matrix @ (ioMatrix @ manu_quantity) == 0
+        :param DOMAIN_LEN: aligned length of optimized domains
+        :param row_index: aligned index of the rows (see get_material_balance_rows)
+        :return: dict with domain matrix, io weight matrix and aligned index of the rows
+        """
+        raw_prod, interm_prod, fin_prod, fuelw, othindrnd = [
+            vector.ravel() for vector in extract_product_groups(
+                world_data=self.Data, commodity_data=self.Data.Commodities, region_data=self.Data.Regions,
+                all_regions=True, only_commodity_codes=False)[:5]]
+        ROW_LEN = len(row_index)
+
+        # Coefficients of demand, export, import, manufacture and supply
+        domain_coefficient = [- (fuelw + othindrnd + fin_prod),
+                              - (raw_prod + fuelw + interm_prod + fin_prod),
+                              raw_prod + fuelw + interm_prod + fin_prod,
+                              interm_prod + fin_prod,
+                              raw_prod + fuelw + othindrnd]
+        ROW_INDEX = np.arange(ROW_LEN)
+        domain_matrix = sp.csr_matrix(
+            (np.concatenate([coefficient[row_index] for coefficient in domain_coefficient]),
+             (np.tile(ROW_INDEX, len(domain_coefficient)),
+              np.concatenate([domain_num * DOMAIN_LEN + row_index for domain_num in range(len(domain_coefficient))]))),
+            shape=(ROW_LEN, 5 * DOMAIN_LEN), dtype=float)
+        domain_matrix.eliminate_zeros()
+
+        # Input quantities for manufacturing (raw and intermediate products)
+        io_weight_matrix = sp.csr_matrix((- (raw_prod + interm_prod)[row_index], (ROW_INDEX, row_index)),
+                                         shape=(ROW_LEN, DOMAIN_LEN), dtype=float)
+        io_weight_matrix.eliminate_zeros()
+
+        return {"domain_matrix": domain_matrix,
+                "io_weight_matrix": io_weight_matrix,
+                "row_index": row_index}
+
+    def get_global_material_balance_structure(self, DOMAIN_LEN: int):
+        """
+        Builds the sparse coefficient matrices of the global material balance with one row for each commodity group
+        (raw_prod, interm_prod, fin_prod, fuelw and othindrnd; see constraint_global_material_balance). Quantities are
+        summed over all regions except the zy-region:
+        domain_matrix @ opt_quantity + io_weight_matrix @ (ioMatrix @ manu_quantity) == 0
+        :param DOMAIN_LEN: aligned length of optimized domains
+        :return: dict with domain matrix and io weight matrix
+        """
+        COMMODITY_LEN = self.Data.Commodities.df_length
+        raw_prod, interm_prod, fin_prod, fuelw, othindrnd = [
+            np.concatenate([vector.ravel(), np.zeros(COMMODITY_LEN)]) for vector in extract_product_groups(
+                world_data=self.Data, commodity_data=self.Data.Commodities, region_data=self.Data.Regions,
+                all_regions=True, only_commodity_codes=False)[:5]]
+        no_coefficient = np.zeros(DOMAIN_LEN)
+
+        # Coefficients of demand, export, import, manufacture and supply for each commodity group
+        domain_coefficient = [
+            [no_coefficient, - raw_prod, raw_prod, no_coefficient, raw_prod],
+            [no_coefficient, - interm_prod, interm_prod, interm_prod, no_coefficient],
+            [- fin_prod, - fin_prod, fin_prod, fin_prod, no_coefficient],
+            [- fuelw, - fuelw, fuelw, no_coefficient, fuelw],
+            [- othindrnd, no_coefficient, no_coefficient, no_coefficient, othindrnd]]
+        domain_matrix = sp.csr_matrix(np.array([np.concatenate(row_coefficient)
+                                                for row_coefficient in domain_coefficient]), dtype=float)
+
+        # Input quantities for manufacturing (raw and intermediate products)
+        io_weight_matrix = sp.csr_matrix(np.array([- raw_prod, - interm_prod, no_coefficient, no_coefficient,
+                                                   no_coefficient]), dtype=float)
+
+        return {"domain_matrix": domain_matrix,
+                "io_weight_matrix": io_weight_matrix}
+
+    def get_region_aggregation(self):
+        """
+        Builds the sparse matrix aggregating aligned quantities to region totals with one row for each region
+        (zy-region excluded) and retrieves the first aligned index of each region.
+        :return: region aggregation matrix and aligned start index of each region
+        """
+        harvest_regions = self.Data.Regions.data[Domains.Regions.region_code].iloc[:self.Data.Regions.df_length - 1]
+        region_position = pd.Index(harvest_regions).get_indexer(
+            np.array(self.Data.data_aligned[Domains.Regions.region_code]))
+        aligned_index = np.nonzero(region_position >= 0)[0]
+
+        region_aggregation = sp.csr_matrix(
+            (np.ones(len(aligned_index)), (region_position[aligned_index], aligned_index)),
+            shape=(len(harvest_regions), len(region_position)), dtype=float)
+        region_start_index = aligned_index[np.unique(region_position[aligned_index], return_index=True)[1]]
+        return region_aggregation, region_start_index
+
+    def setup_optimization_constraints(self, dynamization_activated: bool):
+        """
+        Set-up the optimization constraints and save them together with related information for the optimization
+        :param dynamization_activated: dynamization of the model on or off #TODO remove after validation?
+        :return: optimization parameters (opt_quantity), optimization constraints (constraints,
+        constraints_position), slopes and intercepts and domain lengths (DOMAIN_LEN, ALL_DOMAIN_LEN)
+        """
+        DOMAIN_LEN, ALL_DOMAINS_LEN, opt_quantity, slope, intercept = self.optimization_setup()
+        opt_lbs, opt_ubs = self.set_bounds(dynamization_activated=dynamization_activated)
+        opt_lbs, opt_ubs = opt_lbs.reshape(ALL_DOMAINS_LEN, 1), opt_ubs.reshape(ALL_DOMAINS_LEN, 1)
+        self.verify_optimization_input(opt_lbs=opt_lbs, opt_ubs=opt_ubs, slope=slope, intercept=intercept)
+        constraint_data = self.get_constraint_data()
+
+        constraints = []
+        constraints_position = {}
+        constraint_counter = [0]
+
         if self.present_period == 0:
             self.constraint_trade(constraints, constraints_position, constraint_counter, opt_quantity, opt_lbs, opt_ubs,
                                   DOMAIN_LEN)
@@ -1342,15 +1297,16 @@ class TiMBA(object):
         self.constraint_supply(constraints, constraints_position, constraint_counter, opt_quantity, opt_ubs, DOMAIN_LEN)
         self.constraint_manufacture(constraints, constraints_position, constraint_counter, opt_quantity, opt_ubs,
                                     DOMAIN_LEN)
-        self.constraint_max_harvest(constraints, constraints_position, constraint_counter, opt_quantity, DOMAIN_LEN)
+        self.constraint_max_harvest(constraints, constraints_position, constraint_counter, opt_quantity,
+                                    constraint_data, DOMAIN_LEN)
         self.constraint_material_balance(constraints, constraints_position, constraint_counter, opt_quantity,
-                                         DOMAIN_LEN)
+                                         constraint_data, DOMAIN_LEN)
         self.constraint_material_balance_zy(constraints, constraints_position, constraint_counter, opt_quantity,
-                                            DOMAIN_LEN)
+                                            constraint_data, DOMAIN_LEN)
 
         if self.UserOptions.global_material_balance:
             self.constraint_global_material_balance(constraints, constraints_position, constraint_counter, opt_quantity,
-                                                    DOMAIN_LEN)
+                                                    constraint_data, DOMAIN_LEN)
 
         self.constraint_demand(constraints, constraints_position, constraint_counter, opt_quantity, opt_ubs, opt_lbs,
                                DOMAIN_LEN)
@@ -1362,10 +1318,77 @@ class TiMBA(object):
                     constraints_position, opt_ubs, opt_lbs, delta_trade_upper_bound, delta_trade_lower_bound,
                     delta_prev_trade_increase, delta_prev_trade_decrease)
 
+    def setup_osqp_optimization(self, dynamization_activated: bool):
+        """
+        Set-up of the optimization problem for the osqp optimization backend. Objective function and constraints are
+        assembled directly as sparse matrices (min 1/2 x'Px + q'x s.t. l <= Ax <= u) without the canonicalization of
+        cvxpy. Deviations from trade bounds in following periods are modeled with additional deviation variables.
+        :param dynamization_activated: dynamization of the model on or off #TODO remove after validation?
+        :return: osqp problem, optimization constraints (constraints_position), upper and lower bounds and domain
+        lengths (DOMAIN_LEN, ALL_DOMAIN_LEN)
+        """
+        DOMAIN_LEN, ALL_DOMAINS_LEN, _, slope, intercept = self.optimization_setup()
+        opt_lbs, opt_ubs = self.set_bounds(dynamization_activated=dynamization_activated)
+        opt_lbs, opt_ubs = opt_lbs.reshape(ALL_DOMAINS_LEN, 1), opt_ubs.reshape(ALL_DOMAINS_LEN, 1)
+        self.verify_optimization_input(opt_lbs=opt_lbs, opt_ubs=opt_ubs, slope=slope, intercept=intercept)
+        constraint_data = self.get_constraint_data()
+
+        if self.present_period == 0:
+            trade_bound_index = np.arange(DOMAIN_LEN, 3 * DOMAIN_LEN)
+            trade_mask = np.array([], dtype=int)
+            trade_penalty = np.array([])
+        else:
+            trade_bound_index = np.array(self.get_trade_bound_index(), dtype=int)
+            trade_bound_deviation_penalty, trade_mask = self.get_trade_bound_deviation_penalty(ALL_DOMAINS_LEN)
+            trade_mask = np.array(trade_mask, dtype=int)
+            trade_penalty = trade_bound_deviation_penalty.ravel()[trade_mask]
+        TRADE_LEN = len(trade_mask)
+
+        # Maximization of the objective function is transformed into minimization for osqp
+        problem = OSQPProblem(NUM_VARIABLES=ALL_DOMAINS_LEN + 2 * TRADE_LEN)
+        problem.set_objective(
+            quadratic_coefficient=np.concatenate([- slope.ravel(), np.zeros(2 * TRADE_LEN)]),
+            linear_coefficient=np.concatenate([- intercept.ravel(), trade_penalty, trade_penalty]))
+
+        constraints_position = {}
+        constraint_counter = [0]
+        region_code = np.array(self.Data.data_aligned[Domains.Regions.region_code])
+        commodity_code = np.array(self.Data.data_aligned[Domains.Commodities.commodity_code])
+        commodities = list(self.Data.Commodities.data[Domains.Commodities.commodity_code])
+
+        osqp_variable_bounds(problem, constraints_position, constraint_counter, opt_lbs, opt_ubs, trade_bound_index,
+                             DOMAIN_LEN, ALL_DOMAINS_LEN)
+        if self.present_period > 0:
+            osqp_trade_bound_deviation(problem, constraints_position, constraint_counter, opt_lbs, opt_ubs,
+                                       trade_mask, ALL_DOMAINS_LEN)
+        osqp_max_harvest(problem, constraints_position, constraint_counter, *self.get_region_aggregation(),
+                         constraint_data["harvest_coefficient"], constraint_data["forest_stock"], DOMAIN_LEN)
+        osqp_material_balance(problem, constraints_position, constraint_counter,
+                              [self.get_material_balance_structure(DOMAIN_LEN=DOMAIN_LEN, row_index=row_index)
+                               for row_index in self.get_material_balance_rows()],
+                              constraint_data["io_matrix"], self.get_io_coefficient_index(), DOMAIN_LEN)
+        osqp_material_balance_zy(problem, constraints_position, constraint_counter, region_code, commodity_code,
+                                 commodities, constraint_data["export_quantity"], constraint_data["import_quantity"],
+                                 DOMAIN_LEN)
+        if self.UserOptions.global_material_balance:
+            osqp_global_material_balance(problem, constraints_position, constraint_counter,
+                                         self.get_global_material_balance_structure(DOMAIN_LEN=DOMAIN_LEN),
+                                         constraint_data["io_matrix"], self.get_io_coefficient_index(), DOMAIN_LEN)
+        self.Logger.info(f"Optimization constraints for the osqp backend done.")
+
+        # Warm start from the solution of the previous period (layout of optimized quantities is unchanged)
+        if self.osqp_problem is not None and self.osqp_problem.dual_value is not None:
+            problem.set_warm_start(x=osqp_primal_warm_start(problem, self.osqp_problem.results.x, opt_lbs, opt_ubs,
+                                                            trade_mask, ALL_DOMAINS_LEN),
+                                   y=problem.get_dual_warm_start(self.osqp_problem))
+
+        return problem, constraints_position, opt_ubs, opt_lbs, DOMAIN_LEN, ALL_DOMAINS_LEN
+
     def optimization(self, solver_max_iteration: int, solver_rel_accuracy: int, solver_abs_accuracy: int,
                      dynamization_activated: bool):
         """
-        Defines the objective function and the optimization problem, setup the cvxpy-solver environment. Implement
+        Defines the objective function and the optimization problem, setup the solver environment and solves the
+        optimization problem with the selected optimization backend (cvxpy or osqp). Implement
         penalties for trade deviations considered within optimization for the base period.
         :param solver_max_iteration: solver parameter for maximal iteration
         :param solver_rel_accuracy: solver parameter for relative accuracy
@@ -1374,22 +1397,63 @@ class TiMBA(object):
         :return: optimization problem, optimization parameters (opt_quantity), and
         optimization constraints (constraints, constraints_position)
         """
+        if self.UserOptions.optimization_backend == VarNames.OSQP_BACKEND.value:
+            (optimization_problem, opt_quantity, constraints, constraints_position, opt_ubs, opt_lbs
+             ) = self.osqp_optimization(solver_max_iteration=solver_max_iteration,
+                                        solver_rel_accuracy=solver_rel_accuracy,
+                                        solver_abs_accuracy=solver_abs_accuracy,
+                                        dynamization_activated=dynamization_activated)
+        else:
+            (optimization_problem, opt_quantity, constraints, constraints_position, opt_ubs, opt_lbs
+             ) = self.cvxpy_optimization(solver_max_iteration=solver_max_iteration,
+                                         solver_rel_accuracy=solver_rel_accuracy,
+                                         solver_abs_accuracy=solver_abs_accuracy,
+                                         dynamization_activated=dynamization_activated)
+
+        Optimization = DataContainer("optimization_results")
+        Optimization.optimization_problem = optimization_problem
+        Optimization.optimized_quantity = opt_quantity
+        Optimization.optimization_constraints = constraints
+        Optimization.optimization_constraints_position = constraints_position
+        Optimization.optimization_upper_bound = opt_ubs
+        Optimization.optimization_lower_bound = opt_lbs
+
+        # Optimization results are not stored with checkpoints (runs resumed after the base period)
+        if self.present_period == 0 or not hasattr(self.Data, "OptimizationResults"):
+            self.Data.set_attribute("OptimizationResults", Optimization)
+        else:
+            self.Data["OptimizationResults"].optimization_problem = Optimization.optimization_problem
+            self.Data["OptimizationResults"].optimized_quantity = Optimization.optimized_quantity
+            self.Data["OptimizationResults"].optimization_constraints = Optimization.optimization_constraints
+            self.Data["OptimizationResults"].optimization_constraints_position = (
+                Optimization.optimization_constraints_position)
+            self.Data["OptimizationResults"].optimization_upper_bound = Optimization.optimization_upper_bound
+            self.Data["OptimizationResults"].optimization_lower_bound = Optimization.optimization_lower_bound
+
+    def setup_cvxpy_optimization(self, dynamization_activated: bool):
+        """
+        Set-up of the optimization problem for the cvxpy optimization backend (objective function and constraints).
+        :param dynamization_activated: dynamization of the model on or off #TODO remove after validation?
+        :return: cvxpy problem, optimization parameters (opt_quantity), optimization constraints (constraints,
+        constraints_position), upper and lower bounds
+        """
         if self.present_period == 0:
-            (DOMAIN_LEN, ALL_DOMAINS_LEN, opt_quantity, slope, intercept, constraints, constraints_position, opt_ubs,
-             opt_lbs) = self.setup_optimization_constraints(
+            (DOMAIN_LEN, ALL_DOMAINS_LEN, opt_quantity, slope, intercept, constraints, constraints_position,
+             opt_ubs, opt_lbs) = self.setup_optimization_constraints(
                 dynamization_activated=dynamization_activated)
         else:
-            (DOMAIN_LEN, ALL_DOMAINS_LEN, opt_quantity, slope, intercept, constraints, constraints_position, opt_ubs,
-             opt_lbs, delta_trade_upper_bound, delta_trade_lower_bound,
+            (DOMAIN_LEN, ALL_DOMAINS_LEN, opt_quantity, slope, intercept, constraints, constraints_position,
+             opt_ubs, opt_lbs, delta_trade_upper_bound, delta_trade_lower_bound,
              delta_prev_trade_increase, delta_prev_trade_decrease) = self.setup_optimization_constraints(
                 dynamization_activated=dynamization_activated)
 
-            (trade_bound_deviation_penalty, sum_delta_trade_bound, trade_prev_deviation_penalty, sum_delta_trade_prev
-             ) = self.trade_deviation_penalties(ALL_DOMAINS_LEN=ALL_DOMAINS_LEN,
-                                                delta_trade_lower_bound=delta_trade_lower_bound,
-                                                delta_trade_upper_bound=delta_trade_upper_bound,
-                                                delta_prev_trade_decrease=delta_prev_trade_decrease,
-                                                delta_prev_trade_increase=delta_prev_trade_increase)
+            (trade_bound_deviation_penalty, sum_delta_trade_bound, trade_prev_deviation_penalty,
+             sum_delta_trade_prev) = self.trade_deviation_penalties(
+                ALL_DOMAINS_LEN=ALL_DOMAINS_LEN,
+                delta_trade_lower_bound=delta_trade_lower_bound,
+                delta_trade_upper_bound=delta_trade_upper_bound,
+                delta_prev_trade_decrease=delta_prev_trade_decrease,
+                delta_prev_trade_increase=delta_prev_trade_increase)
 
         # Objective function
         if self.present_period == 0:
@@ -1400,20 +1464,44 @@ class TiMBA(object):
                                   + 1 / 2 * cp.multiply(slope, cp.square(opt_quantity))
                                   - cp.multiply(trade_bound_deviation_penalty, sum_delta_trade_bound))
 
-            # Add following to the objective function to introduce second bound penalizing deviation of optimized trade
-            # quantity to trade quantity of last period (allows to limit changes in trade)
+            # Add following to the objective function to introduce second bound penalizing deviation of optimized
+            # trade quantity to trade quantity of last period (allows to limit changes in trade)
             # - cp.multiply(trade_prev_deviation_penalty, sum_delta_trade_prev))
 
-        self.Logger.info(f"Set up objective function done.")
         optimization_problem = cp.Problem(cp.Maximize(cp.sum(objective_function)), constraints)
-        problem_data, chain, inversed_data = optimization_problem.get_problem_data(solver=cp.OSQP)
+
+        return optimization_problem, opt_quantity, constraints, constraints_position, opt_ubs, opt_lbs
+
+    def cvxpy_optimization(self, solver_max_iteration: int, solver_rel_accuracy: int, solver_abs_accuracy: int,
+                           dynamization_activated: bool):
+        """
+        Defines the objective function and the optimization problem with cvxpy and solves it with osqp. The optimization
+        problem is rebuilt in each period and solved without warm start. Building and compiling the problem takes about
+        2.5 sec. per period for the world input (osqp: several minutes), a problem compiled once with cvxpy parameters
+        (DPP) is not used: its compilation with about 130k scalar parameters exceeds 4 GB of memory. The osqp backend
+        keeps the problem structure between periods and updates the osqp solver instead.
+        :param solver_max_iteration: solver parameter for maximal iteration
+        :param solver_rel_accuracy: solver parameter for relative accuracy
+        :param solver_abs_accuracy: solver parameter for absolute accuracy
+        :param dynamization_activated: flag to activate or deactivate the dynamization in the model
+        :return: optimization problem, optimization parameters (opt_quantity), optimization constraints (constraints,
+        constraints_position), upper and lower bounds
+        """
+        (optimization_problem, opt_quantity, constraints, constraints_position, opt_ubs, opt_lbs
+         ) = self.setup_cvxpy_optimization(dynamization_activated=dynamization_activated)
+
+        self.Logger.info(f"Set up objective function done.")
+        num_equalities = sum([constraint.size for constraint in optimization_problem.constraints
+                              if isinstance(constraint, cp.constraints.Equality)])
+        num_inequalities = sum([constraint.size for constraint in optimization_problem.constraints
+                                if isinstance(constraint, cp.constraints.Inequality)])
         self.Logger.info(f"===========================")
         self.Logger.info(f"Optimization problem configurations:")
         self.Logger.info(f"===========================")
+        self.Logger.info(f"Optimization backend: {self.UserOptions.optimization_backend}")
         self.Logger.info(f"Number of optimized variables: {optimization_problem.size_metrics.num_scalar_variables}")
         self.Logger.info(f"Number of optimization constraints: {len(optimization_problem.constraints)}")
-        self.Logger.info(f"Containing {problem_data['n_eq']} equalities and"
-                         f" {problem_data['n_ineq']} inequalities")
+        self.Logger.info(f"Containing {num_equalities} equalities and {num_inequalities} inequalities")
 
         self.Logger.info(f"===========================")
         self.Logger.info(f"Solver settings:")
@@ -1441,57 +1529,140 @@ class TiMBA(object):
         self.Logger.info(f"Problem status: {optimization_problem.solution.status}")
         self.Logger.info(f"Optimal objective: {-1 * optimization_problem.solution.opt_val}")
         self.Logger.info(f"Number of iterations needed: {optimization_problem.solution.attr['num_iters']}")
+        self.Logger.info(f"Compilation time: {optimization_problem.compilation_time} sec.")
         self.Logger.info(f"Run time: {optimization_problem.solution.attr['solve_time']} sec.")
         self.Logger.info(f"===========================")
 
-        Optimization = DataContainer("optimization_results")
-        Optimization.optimization_problem = optimization_problem
-        Optimization.optimized_quantity = opt_quantity
-        Optimization.optimization_constraints = constraints
-        Optimization.optimization_constraints_position = constraints_position
-        Optimization.optimization_upper_bound = opt_ubs
-        Optimization.optimization_lower_bound = opt_lbs
+        self.check_solver_status(status=optimization_problem.status,
+                                 solution_found=optimization_problem.status in cvxpy.settings.SOLUTION_PRESENT,
+                                 accurate=optimization_problem.status == cp.OPTIMAL)
 
-        if self.present_period == 0:
-            self.Data.set_attribute("OptimizationResults", Optimization)
-        else:
-            self.Data["OptimizationResults"].optimization_problem = Optimization.optimization_problem
-            self.Data["OptimizationResults"].optimized_quantity = Optimization.optimized_quantity
-            self.Data["OptimizationResults"].optimization_constraints = Optimization.optimization_constraints
-            self.Data["OptimizationResults"].optimization_constraints_position = (
-                Optimization.optimization_constraints_position)
-            self.Data["OptimizationResults"].optimization_upper_bound = Optimization.optimization_upper_bound
-            self.Data["OptimizationResults"].optimization_lower_bound = Optimization.optimization_lower_bound
+        return optimization_problem, opt_quantity, constraints, constraints_position, opt_ubs, opt_lbs
+
+    def check_solver_status(self, status: str, solution_found: bool, accurate: bool):
+        """
+        Handles the solver status identically for all optimization backends: inaccurate solutions (e.g. max iterations
+        reached) are used with a warning, the computation of the period fails without solution (e.g. infeasible
+        problem).
+        :param status: solver status
+        :param solution_found: flag if the solver returned a solution
+        :param accurate: flag if the solution is accurate
+        """
+        if not solution_found:
+            raise RuntimeError(f"Optimization problem for period {self.present_period} could not be solved "
+                               f"(status: {status}).")
+        if not accurate:
+            self.Logger.warning(f"Solution of the optimization problem for period {self.present_period} may be "
+                                f"inaccurate (status: {status}).")
+
+    def osqp_optimization(self, solver_max_iteration: int, solver_rel_accuracy: int, solver_abs_accuracy: int,
+                          dynamization_activated: bool):
+        """
+        Solves the optimization problem directly with osqp. The osqp solver of the previous period is updated with the
+        problem data of the actual period if the sparsity structure of the problem is unchanged. Following periods are
+        warm started from the primal and dual solution of the previous period.
+        :param solver_max_iteration: solver parameter for maximal iteration
+        :param solver_rel_accuracy: solver parameter for relative accuracy
+        :param solver_abs_accuracy: solver parameter for absolute accuracy
+        :param dynamization_activated: flag to activate or deactivate the dynamization in the model
+        :return: osqp problem, optimization parameters (opt_quantity), optimization constraints (constraints,
+        constraints_position), upper and lower bounds
+        """
+        (optimization_problem, constraints_position, opt_ubs, opt_lbs, DOMAIN_LEN, ALL_DOMAINS_LEN
+         ) = self.setup_osqp_optimization(dynamization_activated=dynamization_activated)
+
+        self.Logger.info(f"Set up objective function done.")
+        self.Logger.info(f"===========================")
+        self.Logger.info(f"Optimization problem configurations:")
+        self.Logger.info(f"===========================")
+        self.Logger.info(f"Optimization backend: {self.UserOptions.optimization_backend}")
+        self.Logger.info(f"Number of optimized variables: {optimization_problem.NUM_VARIABLES}")
+        self.Logger.info(f"Number of optimization constraints: {len(optimization_problem.constraints)}")
+        self.Logger.info(f"Containing {optimization_problem.num_equalities} equalities and "
+                         f"{optimization_problem.num_inequalities} inequalities")
+
+        self.Logger.info(f"===========================")
+        self.Logger.info(f"Solver settings:")
+        self.Logger.info(f"===========================")
+        self.Logger.info(f"Used solver: {cp.OSQP}")
+        self.Logger.info(f"Max iterations: {solver_max_iteration}")
+        self.Logger.info(f"Absolute solver accuracy: {format(solver_abs_accuracy, '.5f')}")
+        self.Logger.info(f"Relative solver accuracy: {format(solver_rel_accuracy, '.5f')}")
+        self.Logger.info(f"===========================")
+
+        # Solver settings as in the cvxpy backend
+        solver_settings = {"verbose": self.UserOptions.verbose_optimization_logger,
+                           "max_iter": solver_max_iteration,
+                           "eps_abs": solver_rel_accuracy,
+                           "eps_rel": solver_abs_accuracy,
+                           "polish": True}
+        results = optimization_problem.solve(solver_settings=solver_settings, previous_problem=self.osqp_problem)
+        # Iterations of warm started periods are compared to the iterations of the previous period
+        previous_iterations = None if self.osqp_problem is None else self.osqp_problem.iterations
+        self.osqp_problem = optimization_problem
+
+        self.Logger.info(f"===========================")
+        self.Logger.info(f"Optimization problem for period {self.present_period} solved")
+        self.Logger.info(f"===========================")
+        self.Logger.info(f"Problem status: {results.info.status}")
+        self.Logger.info(f"Optimal objective: {results.info.obj_val}")
+        self.Logger.info(f"Number of iterations needed: {results.info.iter}")
+        if optimization_problem.warm_start_x is not None:
+            self.Logger.info(f"Warm started from the solution of period {self.present_period - 1}")
+            if previous_iterations is not None:
+                self.Logger.info(f"Iterations saved compared to period {self.present_period - 1}: "
+                                 f"{previous_iterations - results.info.iter} ({previous_iterations} iterations)")
+        self.Logger.info(f"Setup time: {results.info.setup_time} sec.")
+        self.Logger.info(f"Run time: {results.info.solve_time} sec.")
+        self.Logger.info(f"===========================")
+
+        self.check_solver_status(status=results.info.status,
+                                 solution_found=results.info.status_val in SolverParameters.OSQP_SOLVED_STATUS.value,
+                                 accurate=results.info.status_val == SolverParameters.OSQP_SOLVED_STATUS.value[0])
+
+        opt_quantity = OSQPQuantity(value=results.x[:ALL_DOMAINS_LEN].reshape(ALL_DOMAINS_LEN, 1))
+        return (optimization_problem, opt_quantity, optimization_problem.constraints, constraints_position, opt_ubs,
+                opt_lbs)
 
     def dynamize(self, present_period: int, period_length: int, period_block: int, actual_year:int):
-        """Call all functions for dynamization from script model_helpers.py
+        """Call all functions for dynamization from script model_helpers.py, or the fused numpy dynamization kernel
+        (dynamization_kernel.py) with the numpy dynamization backend
         :param present_period: number of target period
         :param period_length: years of the target period
         :param period_block: number of specification section from exogenous change sheet applied for target period
         :param actual_year: final year of target period for the simulation output
         """
         period_info = {"present": present_period, "length": period_length, "block": period_block, "year": actual_year} #TODO Hard code (future work)
-        dynamize_demand(Data=self.Data.Demand.data_aligned,
-                        DataChange=self.Data.ExogChangeDemand.data_aligned,
-                        period_info=period_info)
-        dynamize_supply(self,
-                        Data=self.Data.Supply.data_aligned,
-                        DataChange=self.Data.ExogChangeSupply.data_aligned,
-                        DataForest=self.Data.Forest.data_aligned,
-                        DataForestChange=self.Data.ExogChangeForest.data_aligned,
-                        Logger=self.Logger,
-                        period_info=period_info)
-        dynamize_manufacturing_cost(Data=self.Data.ManufactureCost.data_aligned,
-                                    DataChange=self.Data.ExogChangeManufactureCost.data_aligned,
+        if self.UserOptions.dynamization_backend == VarNames.NUMPY_DYNAMIZATION.value:
+            if self.dynamization_kernel is None:
+                self.dynamization_kernel = DynamizationKernel(self.Data)
+            self.dynamization_kernel.dynamize(period_info=period_info, Logger=self.Logger)
+        else:
+            dynamize_demand(Data=self.Data.Demand.data_aligned,
+                            DataChange=DataManager.get_exog_change_fields(self.Data.ExogChangeDemand),
+                            period_info=period_info)
+            dynamize_supply(self,
+                            Data=self.Data.Supply.data_aligned,
+                            DataChange=DataManager.get_exog_change_fields(self.Data.ExogChangeSupply),
+                            DataForest=self.Data.Forest.data_aligned,
+                            DataForestChange=DataManager.get_exog_change_fields(self.Data.ExogChangeForest),
+                            Logger=self.Logger,
+                            period_info=period_info)
+            dynamize_manufacturing_cost(Data=self.Data.ManufactureCost.data_aligned,
+                                        DataChange=DataManager.get_exog_change_fields(
+                                            self.Data.ExogChangeManufactureCost),
+                                        period_info=period_info)
+            dynamize_manufacturing_coeff(Data=self.Data.ManufactureCoefficients.data_aligned,
+                                         DataChange=DataManager.get_exog_change_fields(
+                                             self.Data.ExogChangeManufactureCoefficients),
+                                         period_info=period_info)
+            dynamize_transportation(DataExport=self.Data.TransportationExport.data_aligned,
+                                    DataImport=self.Data.TransportationImport.data_aligned,
+                                    DataExportChange=DataManager.get_exog_change_fields(
+                                        self.Data.ExogChangeTradeExport),
+                                    DataImportChange=DataManager.get_exog_change_fields(
+                                        self.Data.ExogChangeTradeImport),
                                     period_info=period_info)
-        dynamize_manufacturing_coeff(Data=self.Data.ManufactureCoefficients.data_aligned,
-                                     DataChange=self.Data.ExogChangeManufactureCoefficients.data_aligned,
-                                     period_info=period_info)
-        dynamize_transportation(DataExport=self.Data.TransportationExport.data_aligned,
-                                DataImport=self.Data.TransportationImport.data_aligned,
-                                DataExportChange=self.Data.ExogChangeTradeExport.data_aligned,
-                                DataImportChange=self.Data.ExogChangeTradeImport.data_aligned,
-                                period_info=period_info)
         self.Logger.info(f"Dynamization finished.")
 
     def extract_optimization_results(self, opt_quantity: cp.Variable, constraints: list, constraints_position: dict,
@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+import scipy.sparse as sp
 from TiMBA.parameters.Defines import (Constants, Shifter, ConversionParameters, VarNames)
 
 from TiMBA.helpers.utils import Domains
@@ -147,7 +148,7 @@ def transport_cost_calculation(RegionsData: pd.DataFrame, WorldPrice: pd.DataFra
 
 
 def production_price_calculation(self, AlignedData: pd.DataFrame, RegionsData: pd.DataFrame, SupplyData: pd.DataFrame,
-                                 ImportData: pd.DataFrame, ioMatrix: pd.DataFrame,
+                                 ImportData: pd.DataFrame, ioMatrix: sp.csr_matrix,
                                  ManufactureCostData: pd.DataFrame, capped_prices: bool):
     """
     Compute production prices as the sum of raw material costs and manufacture costs. Raw material costs are calculated
@@ -158,7 +159,7 @@ def production_price_calculation(self, AlignedData: pd.DataFrame, RegionsData: p
     :param RegionsData: DataFrame with region data (containing not aligned data for regions)
     :param SupplyData: aligned DataFrame for Supply (containing all data of supply DataFrame)
     :param ImportData: aligned DataFrame for TransportationImport (containing all data of Import DataFrame)
-    :param ioMatrix: IO-coefficient-matrix of ManufactureCoefficient
+    :param ioMatrix: IO-coefficient-matrix of ManufactureCoefficient (sparse block diagonal matrix)
     :param ManufactureCostData: aligned DataFrame for ManufactureCost (containing all data of manufacture DataFrame)
     :params capped_prices: flag for correction of production prices (demprices=prodprices) #TODO remove after validation?
     :return: Overwrite column "price" of ManufactureCost in World Data Container with computed production prices
@@ -166,61 +167,25 @@ def production_price_calculation(self, AlignedData: pd.DataFrame, RegionsData: p
     total_prod_cost_col_name = VarNames.TOTAL_PRODUCTION_COST.value
     price_col_name = VarNames.PRICE_COLNAME.value
     raw_mat_cost_col_name = VarNames.RAW_MATERIAL_COST.value
-    raw_mat_cost_int_prod_col_name = VarNames.RAW_MATERIAL_COST_INTERM_PROD.value
 
-    supply_price_collector = pd.DataFrame()
     (raw_prod, interm_prod, fin_prod, fuelw, othindrnd) = extract_product_groups(world_data=self.Data,
                                                                                  commodity_data=self.Data.Commodities,
                                                                                  region_data=self.Data.Regions,
                                                                                  all_regions=False,
                                                                                  only_commodity_codes=True)
-    # Calculation of raw material costs for final products based on supply and import prices
-    for region in RegionsData[Domains.Regions.region_code]:
-        help_matrix = SupplyData[SupplyData[Domains.Supply.region_code] == region]
-        supply_price_region = pd.DataFrame()
-        for commodity in help_matrix[Domains.Supply.commodity_code]:
-            commodity_index = help_matrix[help_matrix[Domains.Supply.commodity_code] == commodity].index
-
-            if (commodity in raw_prod) & (float(help_matrix[help_matrix[Domains.Supply.commodity_code] ==
-                                                            commodity][Domains.Supply.price]) == 0):
-                temporary_import_price_region = ImportData[Domains.TransportationImport.price].iloc[commodity_index]
-                supply_price_region = pd.concat([supply_price_region,
-                                                 temporary_import_price_region], axis=0).reset_index(drop=True)
-            else:
-                supply_price_region = pd.concat(
-                    [supply_price_region, SupplyData[Domains.Supply.price].iloc[
-                        commodity_index]], axis=0).reset_index(drop=True)
-
-        supply_price_collector = pd.concat([supply_price_collector,
-                                            supply_price_region], axis=0).reset_index(drop=True)
-
-    supply_price_collector.rename(columns={0: Domains.Supply.price}, inplace=True)
+    raw_prod_select = np.array(AlignedData[Domains.Commodities.commodity_code].isin(raw_prod))
+    interm_prod_select = np.array(AlignedData[Domains.Commodities.commodity_code].isin(interm_prod))
+    supply_price = np.array(SupplyData[Domains.Supply.price], dtype=float)
+    import_price = np.array(ImportData[Domains.TransportationImport.price], dtype=float)
 
-    matrix_mult = ioMatrix.T @ supply_price_collector[Domains.Supply.price]
-    matrix_mult = pd.concat([AlignedData, pd.DataFrame(matrix_mult).rename(
-        columns={0: raw_mat_cost_int_prod_col_name})], axis=1)
+    # Calculation of raw material costs for final products based on supply and import prices
+    raw_prod_price = np.where(raw_prod_select & (supply_price == 0), import_price, supply_price)
+    raw_material_cost_interm_prod = ioMatrix.T @ raw_prod_price
 
     # Retrieving import prices for intermediate products for non-producing countries
-    import_price_collector = pd.DataFrame()
-    for region in RegionsData[Domains.Regions.region_code]:
-        help_matrix = matrix_mult[matrix_mult[Domains.Regions.region_code] == region]
-        import_price_region = pd.DataFrame()
-        for commodity in help_matrix[Domains.Commodities.commodity_code]:
-            if (commodity in interm_prod) & (float(help_matrix[help_matrix[Domains.Commodities.commodity_code] ==
-                                                               commodity][raw_mat_cost_int_prod_col_name]) == 0):
-                commodity_index = help_matrix[help_matrix[Domains.Commodities.commodity_code] == commodity].index
-                temporary_import_price_region = ImportData[Domains.TransportationImport.price].iloc[commodity_index]
-                import_price_region = pd.concat([import_price_region,
-                                                 temporary_import_price_region], axis=0).reset_index(drop=True)
-            else:
-                import_price_region = pd.concat([import_price_region,
-                                                 pd.DataFrame([0])], axis=0).reset_index(drop=True)
-        import_price_collector = pd.concat([import_price_collector,
-                                            import_price_region], axis=0).reset_index(drop=True)
-
-    import_price_collector.rename(columns={0: raw_mat_cost_int_prod_col_name}, inplace=True)
-    raw_material_cost = ioMatrix.T @ (matrix_mult[raw_mat_cost_int_prod_col_name] +
-                                      import_price_collector[raw_mat_cost_int_prod_col_name] +
+    interm_prod_import_price = np.where(interm_prod_select & (raw_material_cost_interm_prod == 0), import_price, 0)
+    raw_material_cost = ioMatrix.T @ (raw_material_cost_interm_prod +
+                                      interm_prod_import_price +
                                       ManufactureCostData[Domains.ManufactureCost.net_manufacturing_cost] +
                                       SupplyData[Domains.Supply.price])
 
@@ -275,39 +240,34 @@ def forest_param_gamma(ForestData: pd.DataFrame):
     return gamma
 
 
-def update_dynamization(DomainData: pd.DataFrame, ChangeData: pd.DataFrame, shifter_exception: int = 1,
+def update_dynamization(DomainData: pd.Series, ChangeData: np.ndarray, shifter_exception: int = 1,
                         period_block: int = 1):
     """
-    Updates last period data. Written to update current data with data from exogenous change. Calculated 
-    with the length of domain data.
+    Updates last period data. Written to update current data with data from exogenous change. The data of the period
+    block are taken as zero-copy view of the exogenous change tensor.
     :param DomainData: Vector with current data which should be updated
-    :param ChangeData: contains the updates from exogenous change
+    :param ChangeData: contains the updates from exogenous change (view of shape (periods, rows))
     :param shifter_exception: Variable to deal with exception from updates. Used if data is unchanged. Defaults to 1.
     :param period_block: Variable for the current period block in exogenous change. Defaults to 1.
     :return: returns vector with updated data
     """
-    lengthDomainData = len(DomainData)
-    index_domain = DomainData.index
-    start_of_period = period_block * lengthDomainData
-    end_of_period = (period_block + 1) * lengthDomainData
-    ChangeDataPeriod = ChangeData[start_of_period:end_of_period].copy().reset_index(drop=True)
+    ChangeDataPeriod = ChangeData[period_block]
 
     if shifter_exception in [Shifter.except_shifter_minus_one.value, Shifter.except_shifter_zero.value]:
-        subset_ChangeDataPeriod = ChangeDataPeriod[ChangeDataPeriod == shifter_exception]
-        index_subset_ChangeDataPeriod = subset_ChangeDataPeriod.index
-        ChangeDataPeriod[index_subset_ChangeDataPeriod] = DomainData[index_subset_ChangeDataPeriod]
+        ChangeDataPeriod = np.where(ChangeDataPeriod == shifter_exception, DomainData, ChangeDataPeriod)
 
-    return ChangeDataPeriod.reset_index(drop=True)
+    return pd.Series(ChangeDataPeriod)
 
 
-def growth_dynamization(DomainData: pd.DataFrame, ChangeData: pd.DataFrame, shifter_exception: int = 1,
+def growth_dynamization(DomainData: pd.Series, ChangeData: np.ndarray, shifter_exception: int = 1,
                         shifter_switch: bool = False,
                         ChangeData_Switch: int = 0, period_block: int = 1, period_length: int = 5):
     """
     Calculate the growth per period. Written to deal with data from exogenous change,
-    where growth is given annually. Calculated with the length of domain data.
+    where growth is given annually. The data of the period block are taken as zero-copy view of the exogenous change
+    tensor.
     :param DomainData: Vector where growth is applied for
-    :param ChangeData: Vector of data with annual growth rate
+    :param ChangeData: Data with annual growth rate (view of shape (periods, rows))
     :param shifter_exception: Variable to deal with exception from growth rates in exogenous change. Defaults to 1.
     :param shifter_switch: Switch data where growth is applied for with another data vector. Defaults to 0.
     :param ChangeData_Switch: Switched data vector. Defaults to 0.
@@ -315,52 +275,52 @@ def growth_dynamization(DomainData: pd.DataFrame, ChangeData: pd.DataFrame, shif
     :param period_length: Variable for the actual period length. Defaults to 5.
     :return: returns vector with periodic growth rate data
     """
-    lengthDomainData = len(DomainData)
-    index_domain = DomainData.index
-    start_of_period = period_block * lengthDomainData
-    end_of_period = (period_block + 1) * lengthDomainData
-    ChangeDataPeriod = ChangeData[start_of_period:end_of_period].copy().reset_index(drop=True)
+    ChangeDataPeriod = ChangeData[period_block]
 
     if shifter_exception in [Shifter.except_shifter_minus_one.value, Shifter.except_shifter_zero.value]:
-        subset_ChangeDataPeriod = ChangeDataPeriod[ChangeDataPeriod == shifter_exception]
-        index_subset_ChangeDataPeriod = subset_ChangeDataPeriod.index
         if shifter_switch:
-            ChangeDataPeriod_Switch = ChangeData_Switch[index_domain]
-            ChangeDataPeriod[index_subset_ChangeDataPeriod] = ChangeDataPeriod_Switch[index_subset_ChangeDataPeriod]
+            ChangeDataPeriod = np.where(ChangeDataPeriod == shifter_exception, ChangeData_Switch[DomainData.index],
+                                        ChangeDataPeriod)
         else:
-            ChangeDataPeriod[index_subset_ChangeDataPeriod] = DomainData[index_subset_ChangeDataPeriod]
+            ChangeDataPeriod = np.where(ChangeDataPeriod == shifter_exception, DomainData, ChangeDataPeriod)
 
-    ChangeDataPeriod = (1 + ChangeDataPeriod) ** period_length - 1
+    return pd.Series((1 + ChangeDataPeriod) ** period_length - 1)
 
-    return ChangeDataPeriod.reset_index(drop=True)
 
-
-def change_dynamization(DomainData: pd.DataFrame, ChangeData: pd.DataFrame, period_block: int = 1,
+def change_dynamization(DomainData: pd.Series, ChangeData: np.ndarray, period_block: int = 1,
                         period_length: int = 5):
     """
     Calculate the change in amount per period. Written to deal with data from exogenous change,
-    where change is given annually. Calculated with the length of domain data.
+    where change is given annually. The data of the period block are taken as zero-copy view of the exogenous change
+    tensor.
     :param DomainData: Vector where change is applied for
-    :param ChangeData: Vector of data with annual change in amount
+    :param ChangeData: Data with annual change in amount (view of shape (periods, rows))
     :param period_block: Variable for the actual period block in exogenous change. Defaults to 1.
     :param period_length: Variable for the actual period length. Defaults to 5.
     :return: returns vector with periodic change in amount
     """
-    lengthDomainData = len(DomainData) 
-    start_of_period = period_block * lengthDomainData
-    end_of_period = (period_block + 1) * lengthDomainData
-    ChangeDataPeriod = ChangeData[start_of_period:end_of_period].copy()
-    ChangeDataPeriod = ChangeDataPeriod * period_length
+    return pd.Series(ChangeData[period_block] * period_length)
+
 
-    return ChangeDataPeriod.reset_index(drop=True)
+def align_first_period_block(DomainData: pd.Series, ChangeData: np.ndarray):
+    """
+    Multiplies domain data with exogenous change in the index alignment of former versions: only the first period block
+    is aligned with the domain data, later period blocks are NaN.
+    :param DomainData: Vector with current data
+    :param ChangeData: Data from exogenous change (view of shape (periods, rows))
+    :return: aligned product of shape (periods, rows)
+    """
+    aligned_change = np.full(ChangeData.shape, np.nan)
+    aligned_change[0] = DomainData.to_numpy() * ChangeData[0]
+    return aligned_change
 
 
-def dynamize_demand(Data: pd.DataFrame, DataChange: pd.DataFrame, period_info: list):
+def dynamize_demand(Data: pd.DataFrame, DataChange: dict, period_info: list):
     """
     Read exogenous change data for growth parameters and elasticities, Calculate new demand as demand from simulation 
     results of the previous period multiplied with growth shifters, update demand data from previous period.
     :param Data: WorldData.Demand.data_aligned
-    :param DataChange: WorldData.ExogChangeDemand.data_aligned
+    :param DataChange: fields of WorldData.ExogChangeDemand.data_tensor (see DataManager.get_exog_change_fields)
     :param period_info: list containing information about the current period
     """
     periodic_trend = growth_dynamization(Data[Domains.Demand.quantity],
@@ -393,7 +353,8 @@ def dynamize_demand(Data: pd.DataFrame, DataChange: pd.DataFrame, period_info: l
                                   Data[Domains.Demand.elasticity_expectations] * growth_expected_demand))
 
     DLB = Data[Domains.Demand.lower_bound]
-    growth_rate_DLB = DataChange[Domains.ExogChangeDemand.growth_lower_bound]
+    # Index alignment of former versions: growth of the lower bound is read from the first period block
+    growth_rate_DLB = DataChange[Domains.ExogChangeDemand.growth_lower_bound][0]
     periodic_grDLB =  (1 + growth_rate_DLB) ** period_info["length"]
     DLB = DLB * periodic_grDLB
 
@@ -403,16 +364,17 @@ def dynamize_demand(Data: pd.DataFrame, DataChange: pd.DataFrame, period_info: l
     Data[Domains.Demand.lower_bound] = DLB
 
 
-def dynamize_forest(Data: pd.DataFrame, DataChange: pd.DataFrame, DataSupply: pd.DataFrame, 
-                    Logger: classmethod, period_info: list):
+def dynamize_forest(Data: pd.DataFrame, DataChange: dict, DataSupply: pd.DataFrame,
+                    FractionFuelwood: np.ndarray, Logger: classmethod, period_info: list):
     """
     Read exogenous change, Calculate and update endogenous growth of forest area and stock (for detailed information
     check: Documentation), update forest data from previous period. Logger is used produce error messages. Calculation
     of growth_rate_stock, growth_rate_area, fraction_fuelwood, max_ratio_inventory_drain and carbon price not activated.
     Exogenous change for these parameters will not be accounted in the dynamisation.
-    :param Data: WorldData.Forest.data
-    :param DataChange: WorldData.ExogChangeForest.data
+    :param Data: WorldData.Forest.data_aligned (one row for each region)
+    :param DataChange: fields of WorldData.ExogChangeForest.data_tensor (one row for each region and period)
     :param DataSupply: WorldData.Supply.data_aligned
+    :param FractionFuelwood: WorldData.Forest.fraction_fuelwood_aligned (fraction of supply harvested from forest)
     :param period_info: list containing information about the current period
     :return: contains data about the endogenous forest stock growth per region code.
     This data is than used in dynamize_supply().
@@ -471,21 +433,7 @@ def dynamize_forest(Data: pd.DataFrame, DataChange: pd.DataFrame, DataSupply: pd
                                                     Shifter.except_shifter_zero.value,
                                                     period_block=period_info["block"])
     
-    if not Data[Data[Domains.Forest.forest_stock] < 0].index.any():
-        pass
-    else:
-        Logger.info(f"Problem negativ forest stock for:")
-        Logger.info(f"\n{Data.loc[min(Data[Data[Domains.Forest.forest_stock] <= 0].index)]}")
-        Logger.info(f"Negativ forest stock set to zero")
-        Data[Domains.Forest.forest_stock] = Data[Domains.Forest.forest_stock].clip(lower=0)
-
-    if not Data[Data[Domains.Forest.forest_area] < 0].index.any():
-        pass
-    else:
-        Logger.info(f"Problem negativ forest area for:")
-        Logger.info(f"\n{Data.loc[min(Data[Data[Domains.Forest.forest_area] <= 0].index)]}")
-        Logger.info(f"Negativ forest area set to zero")
-        Data[Domains.Forest.forest_area] = Data[Domains.Forest.forest_area].clip(lower=0)
+    clip_negative_forest(Data, Logger)
 
     forest_stock_prev = Data[Domains.Forest.forest_stock]
     forest_area_prev = Data[Domains.Forest.forest_area]
@@ -495,18 +443,13 @@ def dynamize_forest(Data: pd.DataFrame, DataChange: pd.DataFrame, DataSupply: pd
     gdp_per_capita = Data[Domains.Forest.gdp_per_capita_base_period] / ConversionParameters.MIO_FACTOR.value
     gdp_per_capita = gdp_per_capita * (1 + growth_rate_gdp.reset_index(drop=True))
 
-    roundwood_supply = pd.concat(
-        [DataSupply[Domains.Supply.region_code],
-         pd.DataFrame(DataSupply[Domains.Supply.quantity] * Data[Domains.Forest.fraction_fuelwood]).fillna(0)
-         ], axis=1).rename(columns={0: Domains.Supply.quantity})
-
-    sum_roundwood_supply = roundwood_supply.groupby(Domains.Supply.region_code).sum().reset_index().rename(
-        columns={Domains.Supply.quantity: "summed_roundwood_supply"})
+    roundwood_supply = pd.DataFrame({
+        Domains.Supply.region_code: DataSupply[Domains.Supply.region_code],
+        Domains.Supply.quantity: (DataSupply[Domains.Supply.quantity] * FractionFuelwood).fillna(0)})
 
-    roundwood_supply = roundwood_supply.merge(sum_roundwood_supply, left_on="RegionCode", right_on="RegionCode",
-                                              how="left")
+    sum_roundwood_supply = roundwood_supply.groupby(Domains.Supply.region_code)[Domains.Supply.quantity].sum()
 
-    roundwood_supply = (roundwood_supply["summed_roundwood_supply"] * period_info["length"] /
+    roundwood_supply = (Data[Domains.Forest.region_code].map(sum_roundwood_supply) * period_info["length"] /
                         ConversionParameters.MIO_FACTOR.value)
 
     alpha = Data["alpha"] # TODO Hard code (future work)
@@ -584,18 +527,54 @@ def dynamize_forest(Data: pd.DataFrame, DataChange: pd.DataFrame, DataSupply: pd
     return growth_df
 
 
-def dynamize_supply(self, Data: pd.DataFrame, DataChange: pd.DataFrame, DataForest: pd.DataFrame,
-                    DataForestChange: pd.DataFrame, Logger: classmethod, period_info: list):
+def clip_negative_forest(Data: pd.DataFrame, Logger: classmethod):
+    """
+    Log regions with negative forest stock or forest area and set negative values to zero.
+    :param Data: WorldData.Forest.data_aligned (one row for each region)
+    :param Logger: Logger
+    """
+    if not Data[Data[Domains.Forest.forest_stock] < 0].index.any():
+        pass
+    else:
+        Logger.info(f"Problem negativ forest stock for:")
+        Logger.info(f"\n{Data.loc[min(Data[Data[Domains.Forest.forest_stock] <= 0].index)]}")
+        Logger.info(f"Negativ forest stock set to zero")
+        Data[Domains.Forest.forest_stock] = Data[Domains.Forest.forest_stock].clip(lower=0)
+
+    if not Data[Data[Domains.Forest.forest_area] < 0].index.any():
+        pass
+    else:
+        Logger.info(f"Problem negativ forest area for:")
+        Logger.info(f"\n{Data.loc[min(Data[Data[Domains.Forest.forest_area] <= 0].index)]}")
+        Logger.info(f"Negativ forest area set to zero")
+        Data[Domains.Forest.forest_area] = Data[Domains.Forest.forest_area].clip(lower=0)
+
+
+def get_supply_raw_commodities(SupplyData: pd.DataFrame):
+    """
+    Commodities supplied as raw materials (zy-region excluded), split into paper raw materials (commodity codes from
+    89) and forest raw materials (fuelwood, roundwood).
+    :param SupplyData: WorldData.Supply.data
+    :return: sorted lists of paper raw commodities and forest raw commodities
+    """
+    zy_region_var = VarNames.ZY_REGION.value
+    supply_commodities = SupplyData[SupplyData[Domains.Supply.region_code] != zy_region_var][
+        Domains.Supply.commodity_code]
+    paper_raw_commodities = sorted(list(set(supply_commodities[supply_commodities >= 89]))) # TODO hard code; maybe with list and not >=
+    forest_raw_commodities = sorted(list(set(supply_commodities[supply_commodities < 89]))) # TODO hard code; maybe with list and not <
+    return paper_raw_commodities, forest_raw_commodities
+
+
+def dynamize_supply(self, Data: pd.DataFrame, DataChange: dict, DataForest: pd.DataFrame,
+                    DataForestChange: dict, Logger: classmethod, period_info: list):
     """
     Read exogenous change data for growth parameters and elasticities, calculate new supply as supply from simulation 
     results of the previous period multiplied with growth shifters, update supply data from previous period.
     :param Data: WorldData.Supply.data_aligned
-    :param DataChange: WorldData.ExogChangeSupply.data_aligned
-    :param DataForest: WorldData.Forest.data
-    :param DataForestChange: WorldData.ExogChangeForest.data
+    :param DataChange: fields of WorldData.ExogChangeSupply.data_tensor
+    :param DataForest: WorldData.Forest.data_aligned (one row for each region)
+    :param DataForestChange: fields of WorldData.ExogChangeForest.data_tensor (one row for each region and period)
     """
-    zy_region_var = VarNames.ZY_REGION.value
-
     elasticity_price = update_dynamization(Data[Domains.Supply.elasticity_price],
                                            DataChange[Domains.ExogChangeSupply.elasticity_price],
                                            Shifter.except_shifter_zero.value,
@@ -606,47 +585,43 @@ def dynamize_supply(self, Data: pd.DataFrame, DataChange: pd.DataFrame, DataFore
                                          period_block=period_info["block"],
                                          period_length=period_info["length"])
     
-    growth_gdp_or_stock = growth_dynamization(Data[Domains.Supply.quantity], 
-                                              DataChange[Domains.ExogChangeSupply.growth_rate_gdp],
-                                              period_block=period_info["block"],
-                                              period_length=period_info["length"])
-    
     gdp_periodic_growth = growth_dynamization(Data[Domains.Supply.quantity],
                                               DataChange[Domains.ExogChangeSupply.growth_rate_gdp],
                                               period_block=period_info["block"],
                                               period_length=period_info["length"])
 
+    # Index alignment of former versions: shifts are only defined in the first period block
     growth_fourth = growth_dynamization(Data[Domains.Supply.quantity],
-                                        Data[Domains.Supply.elasticity_fourth] *
-                                        DataChange[Domains.ExogChangeSupply.growth_rate_fourth_shift],
+                                        align_first_period_block(Data[Domains.Supply.elasticity_fourth],
+                                                                 DataChange[Domains.ExogChangeSupply.growth_rate_fourth_shift]),
                                         period_block=period_info["block"],
                                         period_length=period_info["length"]
                                         )
 
     growth_fifth = growth_dynamization(Data[Domains.Supply.quantity],
-                                       Data[Domains.Supply.elasticity_fifth] * 
-                                       DataChange[Domains.ExogChangeSupply.growth_rate_fifth_shift],
+                                       align_first_period_block(Data[Domains.Supply.elasticity_fifth],
+                                                                DataChange[Domains.ExogChangeSupply.growth_rate_fifth_shift]),
                                        period_block=period_info["block"],
                                        period_length=period_info["length"])
     
     growth_sixth = growth_dynamization(Data[Domains.Supply.quantity],
-                                       Data[Domains.Supply.elasticity_sixth] * 
-                                       DataChange[Domains.ExogChangeSupply.growth_rate_sixth_shift],
+                                       align_first_period_block(Data[Domains.Supply.elasticity_sixth],
+                                                                DataChange[Domains.ExogChangeSupply.growth_rate_sixth_shift]),
                                        period_block=period_info["block"],
                                        period_length=period_info["length"])
     growth_df = dynamize_forest(DataForest, 
                                 DataForestChange, 
                                 Data, 
+                                self.Data.Forest.fraction_fuelwood_aligned,
                                 Logger, 
                                 period_info=period_info)
-    
-    stock_periodic_growth = pd.concat([Data[Domains.Supply.region_code], growth_df], axis=1).fillna(0)[0]
-    area_periodic_growth = pd.concat([Data[Domains.Supply.region_code], growth_df], axis=1).fillna(0)[1]
 
-    paper_raw_commodities = sorted(list(set(self.Data.Supply.data[
-                                                (self.Data.Supply.data[Domains.Supply.region_code] != zy_region_var) &
-                                                (self.Data.Supply.data[Domains.Supply.commodity_code] >= 89)] # TODO hard code; maybe with list and not >=
-                                            [Domains.Supply.commodity_code])))
+    # Forest growth of each region (one row for each region) is broadcast to the supply of the region
+    growth_df = growth_df.set_index(Domains.Forest.region_code)
+    stock_periodic_growth = Data[Domains.Supply.region_code].map(growth_df[0]).fillna(0)
+    area_periodic_growth = Data[Domains.Supply.region_code].map(growth_df[1]).fillna(0)
+
+    paper_raw_commodities, forest_raw_commodities = get_supply_raw_commodities(self.Data.Supply.data)
 
     paper_supply_index = Data[[x not in paper_raw_commodities for x in Data[Domains.Supply.commodity_code]]].index
 
@@ -654,11 +629,6 @@ def dynamize_supply(self, Data: pd.DataFrame, DataChange: pd.DataFrame, DataFore
     paper_supply_shift.loc[paper_supply_index] = 0
     dynamized_supply_paper = Data[Domains.Supply.quantity] * paper_supply_shift
 
-    forest_raw_commodities = sorted(list(set(self.Data.Supply.data[
-                                      (self.Data.Supply.data[Domains.Supply.region_code] != zy_region_var) &
-                                      (self.Data.Supply.data[Domains.Supply.commodity_code] < 89)] # TODO hard code; maybe with list and not <
-                                  [Domains.Supply.commodity_code])))
-
     fuelwood_roundwood_supply_index = Data[[x not in forest_raw_commodities for x in Data[Domains.Supply.commodity_code]
                                             ]].index
 
@@ -692,7 +662,7 @@ def dynamize_supply(self, Data: pd.DataFrame, DataChange: pd.DataFrame, DataFore
     Data[Domains.Supply.elasticity_sixth] = growth_sixth
 
 
-def dynamize_manufacturing_cost(Data: pd.DataFrame, DataChange: pd.DataFrame, period_info: dict):
+def dynamize_manufacturing_cost(Data: pd.DataFrame, DataChange: dict, period_info: dict):
     """
     Dynamization of manufacturing costs in three steps:
     first step: Read in exogenous change data
@@ -700,8 +670,8 @@ def dynamize_manufacturing_cost(Data: pd.DataFrame, DataChange: pd.DataFrame, pe
     periodic growth rate (formula 10 and 22 in Buongiorno (2015))
     third step: Overwrite data from previous period with new manufacturing costs
     :param Data: Aligned data of manufacturing costs (WorldData.ManufactureCost.data_aligned)
-    :param DataChange: Aligned data of exogenous change in manufacturing costs
-    (WorldData.ExogChangeManufactureCost.data_aligned)
+    :param DataChange: Fields of exogenous change in manufacturing costs
+    (WorldData.ExogChangeManufactureCost.data_tensor)
     :param period_info: dict storing information on current period (period number, period length, year)
     """
     periodic_growth_manucost = growth_dynamization(
@@ -714,13 +684,13 @@ def dynamize_manufacturing_cost(Data: pd.DataFrame, DataChange: pd.DataFrame, pe
     Data[Domains.ManufactureCost.net_manufacturing_cost] = dynamized_manucosts
 
 
-def dynamize_manufacturing_coeff(Data: pd.DataFrame, DataChange: pd.DataFrame, period_info: dict):
+def dynamize_manufacturing_coeff(Data: pd.DataFrame, DataChange: dict, period_info: dict):
     """
      Read in exogenous change data, calculate new manufacturing coefficients from previous period plus exogenous change
      in manufacturing coefficients, overwrite data from previous period with new data
     :param Data: Aligned data of manufacturing coefficients (ManufactureCoefficients.data_aligned)
-    :param DataChange: Aligned data of exogenous change in manufacturing coefficients
-    (ExogChangeManufactureCoefficients.data_aligned)
+    :param DataChange: Fields of exogenous change in manufacturing coefficients
+    (ExogChangeManufactureCoefficients.data_tensor)
     :param period_info: dict storing information on current period (period number, period length, year)
     """
 
@@ -735,8 +705,8 @@ def dynamize_manufacturing_coeff(Data: pd.DataFrame, DataChange: pd.DataFrame, p
     Data[Domains.ManufactureCoefficients.quantity] = dynamized_manu_coeff
 
 
-def dynamize_transportation(DataExport: pd.DataFrame, DataImport: pd.DataFrame, DataExportChange: pd.DataFrame,
-                            DataImportChange: pd.DataFrame, period_info: dict):
+def dynamize_transportation(DataExport: pd.DataFrame, DataImport: pd.DataFrame, DataExportChange: dict,
+                            DataImportChange: dict, period_info: dict):
     """
     Read in exogenous change data and previous data, calculate new transport costs with shifted freight costs,
     import costs and export costs from exogenous change, overwrite data from previous period with new data. Calculation
@@ -744,8 +714,8 @@ def dynamize_transportation(DataExport: pd.DataFrame, DataImport: pd.DataFrame,
     Exogenous change for these parameters will not be accounted in the dynamisation.
     :param DataExport: Aligned data of TransportationExport (WorldData.TransportationExport.data_aligned)
     :param DataImport: Aligned data of TransportationImport (WorldData.TransportationImport.data_aligned)
-    :param DataExportChange: Aligned data of ExogChangeTradeExport (WorldData.ExogChangeTradeExport.data_aligned)
-    :param DataImportChange: Aligned data of ExogChangeTradeEImport (WorldData.ExogChangeTradeEImport.data_aligned)
+    :param DataExportChange: Fields of ExogChangeTradeExport (WorldData.ExogChangeTradeExport.data_tensor)
+    :param DataImportChange: Fields of ExogChangeTradeEImport (WorldData.ExogChangeTradeEImport.data_tensor)
     """
     transp_cost_col_name = VarNames.TRANSPORT_COSTS.value
 
@@ -916,10 +886,25 @@ def extract_product_groups(world_data, commodity_data: pd.DataFrame, region_data
                 raw_prod, interm_prod, fin_prod, fuelw, othindrnd)
 
 
+def get_material_balance_row_index(commodity_vector: pd.Series, commodity_list: list):
+    """
+    Retrieves the aligned index of each row of the commodity specific material balance (C_specific_MB). Rows are
+    ordered by commodity (order of commodity_list) and by aligned index within each commodity.
+    :param commodity_vector: aligned commodity codes (zy-region excluded)
+    :param commodity_list: commodity codes
+    :return: aligned index of the material balance rows and number of rows for each commodity
+    """
+    commodity_position = pd.Index(commodity_list).get_indexer(np.array(commodity_vector))
+    row_index = np.argsort(commodity_position, kind="stable")
+    commodity_len = np.bincount(commodity_position, minlength=len(commodity_list))
+    return row_index, commodity_len
+
+
 def calc_product_shadow_price(self, world_data: InterfaceWorldData, domain: str, price_column: str, constraints: list,
                               constraints_position: dict):
     """
-    Extract shadow prices (dual values) from optimization. Depending on chosen material balance type in user input.
+    Extract shadow prices (dual values) from optimization. Depending on chosen material balance type in user input
+    (rows of the material balance constraints are retrieved by get_material_balance_rows).
     RCG_specific MB region and commodity groups specific material balance
     RC_specific MB region and commodity specific material balance
     C_specific MB commodity specific material balance
@@ -931,45 +916,14 @@ def calc_product_shadow_price(self, world_data: InterfaceWorldData, domain: str,
     :return: shadow_price
     """
     material_balance_col_name = VarNames.MATERIAL_BALANCE.value
-    c_specific_mb_var = VarNames.C_SPECIFIC_MB.value
-    rc_specific_mb_var = VarNames.RC_SPECIFIC_MB.value
-    rcg_specific_mb_var = VarNames.RCG_SPECIFIC_MB.value
-
-    shadow_product_price = pd.DataFrame()
-
-    if self.UserOptions.material_balance == rcg_specific_mb_var:
-        # Extraction of shadow prices for country and commodity specific material balance
-        for region_num in range(0, len(world_data.data_aligned) - world_data.Commodities.df_length):
-
-            shadow_product_price = pd.concat([
-                shadow_product_price,
-                pd.DataFrame(abs(
-                    constraints[constraints_position[material_balance_col_name][0] + region_num].dual_value))
-            ], axis=0).reset_index(drop=True)
-
-    if self.UserOptions.material_balance == rcg_specific_mb_var:
-        # Extraction of shadow prices for country and commodity group specific material balance
-        for region_num in range(0, world_data.Regions.df_length - 1):
-            tmp_shadow_product_price = pd.DataFrame(np.zeros([world_data.Commodities.df_length, 1]))
-            for prod_category in range(0, 5):
-                tmp_shadow_product_price = tmp_shadow_product_price + pd.DataFrame(
-                    constraints[
-                        constraints_position[material_balance_col_name][0] + region_num + prod_category].dual_value)
-
-            shadow_product_price = pd.concat([shadow_product_price,
-                                              abs(tmp_shadow_product_price)], axis=0).reset_index(drop=True)
-
-    if self.UserOptions.material_balance == c_specific_mb_var:
-        # Extraction of shadow prices for commodity specific material balance
-        commodity_vector = world_data.data_aligned[Domains.Commodities.commodity_code].iloc[:(
-                len(self.Data.data_aligned) - len(self.Data.Commodities.data))]
-        for commodity, commodity_num in zip(world_data.Commodities.data[Domains.Commodities.commodity_code],
-                                            range(0, world_data.Commodities.df_length)):
-            commodity_index = commodity_vector[commodity_vector == commodity].index
-            tmp_shadow_product_price = pd.DataFrame(constraints[constraints_position[material_balance_col_name][0] +
-                                                                commodity_num].dual_value).set_index(commodity_index)
-            shadow_product_price = pd.concat([shadow_product_price, abs(tmp_shadow_product_price)], axis=0)
-        shadow_product_price = shadow_product_price.sort_index()
+
+    # Extraction of shadow prices (one dual value for each region and commodity, dual values of commodity group
+    # specific constraints are summed up)
+    shadow_product_price = np.zeros(len(world_data.data_aligned) - world_data.Commodities.df_length)
+    for constraint_num, row_index in enumerate(self.get_material_balance_rows()):
+        shadow_product_price[row_index] += np.array(
+            constraints[constraints_position[material_balance_col_name][0] + constraint_num].dual_value).ravel()
+    shadow_product_price = pd.DataFrame(np.abs(shadow_product_price))
 
     zy_price_placeholder = pd.DataFrame(np.zeros(world_data.Commodities.df_length))
     shadow_price = pd.concat([shadow_product_price, zy_price_placeholder]).reset_index(drop=True)
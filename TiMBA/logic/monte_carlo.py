@@ -0,0 +1,351 @@
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from copy import deepcopy
+
+import numpy as np
+import pandas as pd
+
+from TiMBA.logic.model import TiMBA
+from TiMBA.data_management.DataManager import DataManager
+from TiMBA.data_management.DataContainer import InterfaceWorldData, AdditionalInformation, DataContainer
+from TiMBA.data_management.ParameterCollector import ParameterCollector
+from TiMBA.helpers.utils import DomainIterator
+from TiMBA.parameters.Defines import SolverParameters, MonteCarloParameters
+from TiMBA.results_logging.ResultsWriter import ResultsWriter
+from TiMBA.results_logging.base_logger import get_logger
+
+
+class UncertainParameter(object):
+    """
+    Parameter of the input data drawn from a distribution for each Monte Carlo sample, e.g. price elasticities of
+    demand (Demand, DElast), GDP growth (ExogChangeDemand, GDPGrowth) or shifters of the exogenous change. Parameters of
+    ExogChange-Domains are perturbed in the exogenous change tensor (all periods), parameters of other domains in
+    data_aligned (or data for domains without aligned data).
+    """
+    DISTRIBUTIONS = ("normal", "lognormal", "uniform", "triangular")
+    MODES = ("scale", "shift", "replace")
+
+    def __init__(self, domain: str, column: str, distribution: str, arguments: dict, mode: str = "scale",
+                 per_row: bool = False):
+        """
+        :param domain: name of the domain (e.g. "Demand", "ExogChangeDemand")
+        :param column: name of the column of the domain
+        :param distribution: name of the distribution (method of numpy.random.Generator: normal, lognormal, uniform,
+        triangular)
+        :param arguments: arguments of the distribution (e.g. {"loc": 1, "scale": 0.1} for normal)
+        :param mode: scale (value * draw), shift (value + draw) or replace (draw) the input values
+        :param per_row: draw one value for each row (region and commodity), otherwise one value for all rows
+        """
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"Distribution {distribution} not available, choose one of: {self.DISTRIBUTIONS}")
+        if mode not in self.MODES:
+            raise ValueError(f"Mode {mode} not available, choose one of: {self.MODES}")
+        self.domain = domain
+        self.column = column
+        self.distribution = distribution
+        self.arguments = arguments
+        self.mode = mode
+        self.per_row = per_row
+
+    def __repr__(self):
+        return repr(f"{self.domain}.{self.column} ~ {self.distribution}({self.arguments}), mode={self.mode}, "
+                    f"per_row={self.per_row}")
+
+    def draw(self, rng: np.random.Generator, num_rows: int) -> np.ndarray:
+        """
+        Draw the values of a sample.
+        :param rng: random generator of the sample
+        :param num_rows: number of rows of the perturbed data
+        :return: drawn values (one value or one value for each row)
+        """
+        return getattr(rng, self.distribution)(size=num_rows if self.per_row else 1, **self.arguments)
+
+    def apply(self, values: np.ndarray, draw: np.ndarray) -> np.ndarray:
+        """
+        Perturbed values (new array, input values are not changed).
+        :param values: input values (rows or periods x rows)
+        :param draw: drawn values, broadcast over the periods
+        """
+        if self.mode == "scale":
+            return values * draw
+        if self.mode == "shift":
+            return values + draw
+        return np.broadcast_to(draw, values.shape).astype(float)
+
+    @staticmethod
+    def from_dict(parameter: dict):
+        """
+        Parameter declared as dict (e.g. read from a json file of the Monte Carlo configuration).
+        :param parameter: dict with the arguments of UncertainParameter
+        """
+        return UncertainParameter(**parameter)
+
+
+def get_sample_seed(seed: int, sample: int) -> np.random.SeedSequence:
+    """
+    Seed of a sample. Samples are drawn with independent random streams derived from the seed of the run and the number
+    of the sample, so that the draws of a sample do not depend on the number of processes or batches.
+    :param seed: seed of the Monte Carlo run
+    :param sample: number of the sample
+    """
+    return np.random.SeedSequence(entropy=seed, spawn_key=(sample,))
+
+
+def copy_domain(Domain, shared_attributes: list):
+    """
+    Copy of a domain sharing the given attributes with the original domain, all other attributes are deep copies.
+    :param Domain: domain (DataContainer)
+    :param shared_attributes: names of the shared attributes
+    """
+    DomainCopy = Domain.__class__.__new__(Domain.__class__)
+    DomainCopy.__dict__.update({name: attribute if name in shared_attributes else deepcopy(attribute)
+                                for name, attribute in vars(Domain).items()})
+    return DomainCopy
+
+
+def perturb_world_data(WorldData: InterfaceWorldData, parameters: list, seed: int, sample: int):
+    """
+    World data of a sample. Only the data changed by the sample or the model run are copied: domains updated during the
+    computation (except their IO matrices), optimization helpers and world prices are copied (deep copy). All other
+    domains (exogenous change, regions, commodities, ...) are read-only during the computation and shared with the base
+    World data, except for copies of perturbed domains.
+    :param WorldData: preprocessed base World data (not changed)
+    :param parameters: list of UncertainParameter
+    :param seed: seed of the Monte Carlo run
+    :param sample: number of the sample
+    :return: World data of the sample and dict with the drawn values (name of the parameter as key)
+    """
+    rng = np.random.default_rng(get_sample_seed(seed, sample))
+    exog_change_domains = set(DomainIterator.get_domain_names(DomainIterator.EXOG_CHANGE_DOMAINS))
+    update_domains = set(DomainIterator.get_domain_names(DomainIterator.UPDATE_DOMAINS))
+
+    sample_data = copy_domain(WorldData, shared_attributes=[
+        name for name in vars(WorldData) if name not in MonteCarloParameters.COPIED_ATTRIBUTES.value])
+    for domain in update_domains:
+        sample_data[domain] = copy_domain(WorldData[domain],
+                                          shared_attributes=MonteCarloParameters.SHARED_DOMAIN_ATTRIBUTES.value)
+    copied_domains = set(update_domains)
+
+    draws = {}
+    for parameter in parameters:
+        Domain = sample_data[parameter.domain]
+        if parameter.domain in exog_change_domains:
+            if parameter.column not in Domain.tensor_fields:
+                raise KeyError(f"{parameter.column} is not a field of the exogenous change of {parameter.domain}")
+            # Shallow copy of the shared container with a copy of the tensor
+            Domain = Domain.__class__.__new__(Domain.__class__)
+            Domain.__dict__.update(vars(sample_data[parameter.domain]))
+            Domain.data_tensor = Domain.data_tensor.copy()
+            sample_data[parameter.domain] = Domain
+            field_num = Domain.tensor_fields[parameter.column]
+            draw = parameter.draw(rng, num_rows=Domain.data_tensor.shape[1])
+            Domain.data_tensor[:, :, field_num] = parameter.apply(Domain.data_tensor[:, :, field_num], draw)
+        else:
+            if parameter.domain not in copied_domains:
+                # Domain shared with the base World data: copy of the perturbed domain
+                Domain = copy_domain(Domain, shared_attributes=[])
+                sample_data[parameter.domain] = Domain
+                copied_domains.add(parameter.domain)
+            accessor = "data_aligned" if "data_aligned" in vars(Domain) else "data"
+            values = np.asarray(Domain[accessor][parameter.column], dtype=float)
+            draw = parameter.draw(rng, num_rows=len(values))
+            Domain[accessor][parameter.column] = parameter.apply(values, draw)
+        draws[f"{parameter.domain}.{parameter.column}"] = draw
+    return sample_data, draws
+
+
+# Base data of the worker process (set once for each process by init_worker)
+_worker_data = {}
+
+
+def init_worker(WorldData: InterfaceWorldData, AdditionalInfo: AdditionalInformation, WorldPriceData: DataContainer,
+                UserIO: ParameterCollector, parameters: list, seed: int, world_name: str):
+    """
+    Keep the base data of the Monte Carlo run in the worker process (transferred once for each process instead of once
+    for each sample).
+    """
+    Logger = get_logger(UserIO.folderpath, world_name=f"{world_name}_MonteCarlo")
+    # Logs of thousands of samples are limited to warnings and errors
+    Logger.setLevel(logging.WARNING)
+    _worker_data.update({"WorldData": WorldData, "AdditionalInfo": AdditionalInfo, "WorldPriceData": WorldPriceData,
+                         "UserIO": UserIO, "parameters": parameters, "seed": seed, "Logger": Logger})
+
+
+def get_row_draws(sample: int, parameters: list, draws: dict) -> pd.DataFrame:
+    """
+    Drawn values of the parameters drawn for each row (one row of the table for each drawn value).
+    :param sample: number of the sample
+    :param parameters: list of UncertainParameter
+    :param draws: drawn values of the sample (see perturb_world_data)
+    :return: table of the drawn values (sample, parameter, row of the perturbed data and drawn value), None if no
+    parameter is drawn for each row
+    """
+    parameter_colname, row_colname, draw_colname = MonteCarloParameters.DRAW_COLUMNS.value
+    row_names = [f"{parameter.domain}.{parameter.column}" for parameter in parameters if parameter.per_row]
+    row_draws = [pd.DataFrame({parameter_colname: name, row_colname: np.arange(len(draws[name])),
+                               draw_colname: draws[name]}) for name in row_names]
+    if not row_draws:
+        return None
+    row_draws = pd.concat(row_draws, axis=0, ignore_index=True)
+    row_draws.insert(0, MonteCarloParameters.SAMPLE_COLNAME.value, sample)
+    return row_draws
+
+
+def compute_sample(sample: int) -> tuple:
+    """
+    Compute the model for a sample with the base data of the worker process.
+    :param sample: number of the sample
+    :return: results of the sample (optimization results and world prices of all computed periods, values of parameters
+    drawn for each row) and summary of the sample (status, computed periods and drawn values, mean of the values drawn
+    for each row)
+    """
+    UserIO = _worker_data["UserIO"]
+    Logger = _worker_data["Logger"]
+    summary = {MonteCarloParameters.SAMPLE_COLNAME.value: sample, "status": "complete", "periods": []}
+    summary.update({f"{parameter.domain}.{parameter.column}": np.nan for parameter in _worker_data["parameters"]})
+    sample_results = {}
+    try:
+        sample_data, draws = perturb_world_data(_worker_data["WorldData"], _worker_data["parameters"],
+                                                seed=_worker_data["seed"], sample=sample)
+        summary.update({name: float(np.mean(draw)) for name, draw in draws.items()})
+        row_draws = get_row_draws(sample, _worker_data["parameters"], draws)
+        if row_draws is not None:
+            sample_results["draws"] = row_draws
+        Model = TiMBA(Data=sample_data, UserOptions=UserIO, AdditionalInfo=_worker_data["AdditionalInfo"],
+                      WorldPriceData=_worker_data["WorldPriceData"], LogHandler=Logger, ResultHandler=None)
+        Model.compute(max_iteration=SolverParameters.MAX_ITERATION.value,
+                      rel_accuracy=SolverParameters.REL_ACCURACY.value,
+                      abs_accuracy=SolverParameters.ABS_ACCURACY.value,
+                      dynamization_activated=UserIO.dynamization_activated,
+                      constants=UserIO.constants,
+                      capped_prices=UserIO.capped_prices)
+    except Exception as error:
+        Logger.error(f"Monte Carlo sample {sample} failed.", exc_info=True)
+        summary["status"] = f"failed ({type(error).__name__}: {error})"
+        return sample_results, summary
+
+    summary["periods"] = Model.Data.OptimizationHelpers.period_results.get_periods()
+    if summary["periods"] != list(range(len(Model.period_df))):
+        summary["status"] = "stopped early"
+    results = Model.Data.OptimizationHelpers.data_periods[MonteCarloParameters.RESULT_COLUMNS.value].copy()
+    world_prices = Model.Data.WorldPrices.data_periods.copy()
+    for table_data in (results, world_prices):
+        table_data.insert(0, MonteCarloParameters.SAMPLE_COLNAME.value, sample)
+    sample_results.update({"results": results, "world_prices": world_prices})
+    return sample_results, summary
+
+
+def compute_batch(samples: list) -> tuple:
+    """
+    Compute a batch of samples in the worker process.
+    :param samples: numbers of the samples
+    :return: results of the batch (one DataFrame for each result table) and summaries of the samples
+    """
+    batch_results, summaries = {}, []
+    for sample in samples:
+        sample_results, summary = compute_sample(sample)
+        for table, table_data in sample_results.items():
+            batch_results.setdefault(table, []).append(table_data)
+        summaries.append(summary)
+    return {table: pd.concat(table_data, axis=0, ignore_index=True)
+            for table, table_data in batch_results.items()}, summaries
+
+
+class MonteCarlo(object):
+    """
+    Monte Carlo uncertainty analysis of TiMBA. The input data of a world are read in and preprocessed once; for each
+    sample, the uncertain parameters are drawn from their distributions and the model is computed in a pool of worker
+    processes. Samples are computed in batches, the results of each batch are appended to the output tables (results,
+    world prices, samples and draws) as soon as the batch is finished, so that the memory does not grow with the number
+    of samples. The samples table holds the mean of parameters drawn for each row, their values for each row are written
+    to the draws table.
+    """
+    OUTPUT_TABLES = ("results", "world_prices", "samples", "draws")
+
+    def __init__(self, WorldData: InterfaceWorldData, AdditionalInfo: AdditionalInformation,
+                 WorldPriceData: DataContainer, UserIO: ParameterCollector, parameters: list, num_samples: int,
+                 seed: int, output_dir: str, world_name: str, Logger,
+                 workers: int = 1, batch_size: int = MonteCarloParameters.BATCH_SIZE.value):
+        """
+        :param WorldData: preprocessed base World data
+        :param AdditionalInfo: additional information
+        :param WorldPriceData: world prices
+        :param UserIO: Collection of parameters
+        :param parameters: list of UncertainParameter
+        :param num_samples: number of samples
+        :param seed: seed of the run (samples are reproducible with the same seed)
+        :param output_dir: directory of the output tables
+        :param world_name: name of the world
+        :param Logger: Logger of the run
+        :param workers: number of processes computing samples
+        :param batch_size: number of samples computed in one task of a process
+        """
+        self.WorldData = WorldData
+        self.AdditionalInfo = AdditionalInfo
+        self.WorldPriceData = WorldPriceData
+        self.UserIO = UserIO
+        self.parameters = parameters
+        self.num_samples = num_samples
+        self.seed = seed
+        self.output_dir = output_dir
+        self.world_name = world_name
+        self.Logger = Logger
+        self.workers = workers
+        self.batch_size = batch_size
+        # Forest layout is migrated and exogenous change tensors are created once and shared by all samples
+        DataManager.migrate_forest_layout(self.WorldData)
+        DataManager.create_exog_change_tensor(self.WorldData)
+
+    def get_batches(self) -> list:
+        return [list(range(start, min(start + self.batch_size, self.num_samples)))
+                for start in range(0, self.num_samples, self.batch_size)]
+
+    def run(self) -> pd.DataFrame:
+        """
+        Compute all samples and write the output tables.
+        :return: summary of the samples (status, computed periods and mean of the drawn values)
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        writers = {}
+        for table in self.OUTPUT_TABLES:
+            table_path = os.path.join(self.output_dir, f"{table}.csv")
+            if os.path.exists(table_path):
+                os.remove(table_path)
+            writers[table] = ResultsWriter(table_path, overwrite_file=True)
+
+        self.Logger.info(f"Monte Carlo run of {self.world_name}: {self.num_samples} samples (seed: {self.seed}), "
+                         f"{self.workers} processes, batches of {self.batch_size} samples")
+        for parameter in self.parameters:
+            self.Logger.info(f"Uncertain parameter: {parameter}")
+
+        init_args = (self.WorldData, self.AdditionalInfo, self.WorldPriceData, self.UserIO, self.parameters,
+                     self.seed, self.world_name)
+        summaries = []
+        if self.workers > 1:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker,
+                                     initargs=init_args) as executor:
+                futures = [executor.submit(compute_batch, batch) for batch in self.get_batches()]
+                for future in as_completed(futures):
+                    summaries.extend(self.write_batch(writers, *future.result(), len(summaries)))
+        else:
+            init_worker(*init_args)
+            for batch in self.get_batches():
+                summaries.extend(self.write_batch(writers, *compute_batch(batch), len(summaries)))
+
+        return pd.DataFrame(summaries).sort_values(MonteCarloParameters.SAMPLE_COLNAME.value).reset_index(drop=True)
+
+    def write_batch(self, writers: dict, batch_results: dict, summaries: list, num_computed: int) -> list:
+        """
+        Append the results of a batch to the output tables.
+        :param writers: ResultsWriter of the output tables
+        :param batch_results: results of the batch
+        :param summaries: summaries of the samples of the batch
+        :param num_computed: number of samples computed before the batch
+        :return: summaries of the samples of the batch
+        """
+        for table, table_data in batch_results.items():
+            writers[table].write_frame(table_data)
+        writers["samples"].write_frame(pd.DataFrame(summaries).astype({"periods": str}))
+        self.Logger.info(f"Monte Carlo samples computed: {num_computed + len(summaries)}/{self.num_samples}")
+        return summaries
@@ -0,0 +1,494 @@
+import numpy as np
+import scipy.sparse as sp
+import osqp
+
+from TiMBA.parameters.Defines import VarNames
+from TiMBA.logic.model_helpers import constraint_get_position
+
+
+class OSQPQuantity(object):
+    """
+    Optimized quantities of the osqp optimization backend. Provides the value-attribute of cvxpy variables used for the
+    extraction of optimization results.
+    """
+    def __init__(self, value: np.ndarray = None):
+        self.value = value
+
+
+class OSQPSolution(object):
+    """
+    Primal solution of a solved osqp problem restored from a checkpoint. Provides the x-attribute of osqp results used
+    for the warm start of the following period.
+    """
+    def __init__(self, x: np.ndarray):
+        self.x = x
+
+
+class OSQPConstraint(object):
+    """
+    Constraint of the osqp optimization backend. Dual values are mapped from the osqp solution (y) with the row index of
+    the constraint in the constraint matrix (provides the dual_value-attribute of cvxpy constraints).
+    """
+    def __init__(self, rows: np.ndarray, equality: bool):
+        self.rows = rows
+        self.equality = equality
+        self.dual_value = None
+
+    @property
+    def size(self):
+        return len(self.rows)
+
+
+class OSQPProblem(object):
+    """
+    Quadratic program (min 1/2 x'Px + q'x s.t. l <= Ax <= u) assembled with scipy.sparse and solved directly with osqp.
+    Constraint blocks are added in the order of the cvxpy optimization backend. The osqp solver is kept to update the
+    problem data in following periods if the sparsity structure of the problem is unchanged.
+    """
+    def __init__(self, NUM_VARIABLES: int):
+        self.NUM_VARIABLES = NUM_VARIABLES
+        self.P = None
+        self.q = None
+        self.A = None
+        self.row_mapping = None
+        self.l = None
+        self.u = None
+        self.constraints = []
+        self.constraint_blocks = []
+        self.block_rows = {}
+        self.NUM_ROWS = 0
+        self.NUM_EQUALITY_ROWS = 0
+        self.solver = None
+        self.results = None
+        self.dual_value = None
+        self.warm_start_x = None
+        self.warm_start_y = None
+        self.iterations = None
+
+    def set_objective(self, quadratic_coefficient: np.ndarray, linear_coefficient: np.ndarray):
+        """
+        Sets the (diagonal) quadratic and the linear coefficients of the objective function. All diagonal elements are
+        stored (also zeros) to keep the sparsity structure of P constant.
+        :param quadratic_coefficient: diagonal of P
+        :param linear_coefficient: q
+        """
+        VARIABLE_INDEX = np.arange(self.NUM_VARIABLES)
+        self.P = sp.csc_matrix((np.asarray(quadratic_coefficient, dtype=float).ravel(), VARIABLE_INDEX,
+                                np.arange(self.NUM_VARIABLES + 1)), shape=(self.NUM_VARIABLES, self.NUM_VARIABLES))
+        self.q = np.asarray(linear_coefficient, dtype=float).ravel()
+
+    def add_constraint(self, A: sp.coo_matrix, lower: np.ndarray, upper: np.ndarray, constraint_len: list = None,
+                       name: str = None):
+        """
+        Adds a block of constraint rows (lower <= A x <= upper). The block can be split in several constraints (e.g. one
+        constraint for each commodity) to allow the extraction of dual values by constraint positions.
+        :param A: constraint matrix of the block (rows x NUM_VARIABLES)
+        :param lower: lower bounds of the constraint rows
+        :param upper: upper bounds of the constraint rows
+        :param constraint_len: number of rows of each constraint in the block (default: one constraint for the block)
+        :param name: name of the block used to map dual values between periods (warm start)
+        """
+        lower = np.asarray(lower, dtype=float).ravel()
+        upper = np.asarray(upper, dtype=float).ravel()
+        BLOCK_LEN = A.shape[0]
+        if constraint_len is None:
+            constraint_len = [BLOCK_LEN]
+
+        self.constraint_blocks.append((sp.coo_matrix(A), lower, upper))
+        constraint_start = np.concatenate([[0], np.cumsum(constraint_len)])
+        for start, end in zip(constraint_start[:-1], constraint_start[1:]):
+            self.constraints.append(OSQPConstraint(rows=np.arange(self.NUM_ROWS + start, self.NUM_ROWS + end),
+                                                   equality=bool(np.array_equal(lower[start: end], upper[start: end]))))
+        if name is not None:
+            self.block_rows[name] = np.arange(self.NUM_ROWS, self.NUM_ROWS + BLOCK_LEN)
+        self.NUM_ROWS += BLOCK_LEN
+
+    def assemble(self):
+        """
+        Stacks all constraint blocks to the constraint matrix A and bounds l and u. Rows are arranged as in the
+        canonicalized cvxpy problem (equality rows first, inequality rows split into one-sided rows) since the
+        termination criteria of osqp depend on the row layout. The row mapping (row_mapping.T @ y) restores the dual
+        values of the added constraint rows. Explicit zeros are kept to preserve the sparsity structure.
+        """
+        constraint_matrix = sp.vstack([block[0] for block in self.constraint_blocks], format="csr")
+        lower = np.concatenate([block[1] for block in self.constraint_blocks])
+        upper = np.concatenate([block[2] for block in self.constraint_blocks])
+
+        equality = lower == upper
+        equality_rows = np.nonzero(equality)[0]
+        lower_rows = np.nonzero(~equality & np.isfinite(lower))[0]
+        upper_rows = np.nonzero(~equality & np.isfinite(upper))[0]
+        MAPPED_LEN = len(equality_rows) + len(lower_rows) + len(upper_rows)
+        self.NUM_EQUALITY_ROWS = len(equality_rows)
+        self.row_mapping = sp.csr_matrix(
+            (np.concatenate([np.ones(len(equality_rows)), - np.ones(len(lower_rows)), np.ones(len(upper_rows))]),
+             (np.arange(MAPPED_LEN), np.concatenate([equality_rows, lower_rows, upper_rows]))),
+            shape=(MAPPED_LEN, self.NUM_ROWS))
+
+        self.A = sp.vstack([constraint_matrix[equality_rows], - constraint_matrix[lower_rows],
+                            constraint_matrix[upper_rows]], format="csc")
+        self.A.sort_indices()
+        self.l = np.concatenate([lower[equality_rows], np.full(len(lower_rows) + len(upper_rows), - np.inf)])
+        self.u = np.concatenate([upper[equality_rows], - lower[lower_rows], upper[upper_rows]])
+
+    def same_structure(self, other) -> bool:
+        """
+        Checks if the sparsity structure of the problem is identical to another problem (precondition for osqp update).
+        :param other: osqp problem to compare with
+        """
+        return (other is not None and other.A is not None and self.A.shape == other.A.shape and self.P.shape == other.P.shape and
+                np.array_equal(self.A.indptr, other.A.indptr) and np.array_equal(self.A.indices, other.A.indices))
+
+    def get_warm_start_state(self) -> dict:
+        """
+        Solution of the solved problem needed to warm start the problem of the following period (see
+        restore_warm_start_state). The problem data and the osqp solver are not included.
+        """
+        return {"NUM_VARIABLES": self.NUM_VARIABLES, "x": self.results.x, "dual_value": self.dual_value,
+                "block_rows": self.block_rows, "iterations": self.iterations}
+
+    @staticmethod
+    def restore_warm_start_state(state: dict):
+        """
+        Solved problem without problem data and osqp solver, used to warm start the following period after restoring a
+        checkpoint (the osqp solver of the following period is set up anew).
+        :param state: solution of the solved problem (see get_warm_start_state)
+        :return: osqp problem
+        """
+        problem = OSQPProblem(state["NUM_VARIABLES"])
+        problem.results = OSQPSolution(x=state["x"])
+        problem.dual_value = state["dual_value"]
+        problem.block_rows = state["block_rows"]
+        problem.iterations = state.get("iterations")
+        return problem
+
+    def set_warm_start(self, x: np.ndarray, y: np.ndarray):
+        """
+        Sets the starting point of osqp (primal values and dual values of the added constraint rows).
+        :param x: primal starting point
+        :param y: dual starting point (one value for each added constraint row)
+        """
+        self.warm_start_x = np.asarray(x, dtype=float).ravel()
+        self.warm_start_y = np.asarray(y, dtype=float).ravel()
+
+    def get_dual_warm_start(self, previous_problem) -> np.ndarray:
+        """
+        Maps the dual values of a solved problem onto the constraint rows of the problem. Dual values are taken for
+        constraint blocks with identical name and length, remaining dual values are set to zero.
+        :param previous_problem: solved osqp problem (e.g. of the previous period)
+        :return: dual starting point
+        """
+        dual_warm_start = np.zeros(self.NUM_ROWS)
+        for name, rows in self.block_rows.items():
+            previous_rows = previous_problem.block_rows.get(name)
+            if previous_rows is not None and len(previous_rows) == len(rows):
+                dual_warm_start[rows] = previous_problem.dual_value[previous_rows]
+        return dual_warm_start
+
+    def solve(self, solver_settings: dict, previous_problem=None):
+        """
+        Solves the problem with osqp. If the sparsity structure is identical to the previous problem, the osqp solver of
+        the previous problem is updated with the actual problem data instead of a new setup (and factorization). If a
+        warm start is set, osqp starts from the given primal and dual values.
+        :param solver_settings: osqp solver settings
+        :param previous_problem: osqp problem of the previous period
+        :return: osqp results
+        """
+        self.assemble()
+        # Without warm start, osqp starts from zero (also if the solver of the previous problem is updated)
+        solver_settings = dict(solver_settings, warm_start=self.warm_start_x is not None)
+        if self.same_structure(previous_problem):
+            self.solver = previous_problem.solver
+            self.solver.update(Px=self.P.data, q=self.q, Ax=self.A.data, l=self.l, u=self.u)
+            self.solver.update_settings(**solver_settings)
+        else:
+            self.solver = osqp.OSQP()
+            self.solver.setup(P=self.P, q=self.q, A=self.A, l=self.l, u=self.u, **solver_settings)
+
+        if self.warm_start_x is not None:
+            # Dual values of one-sided inequality rows are nonnegative
+            warm_start_y = self.row_mapping @ self.warm_start_y
+            warm_start_y[self.NUM_EQUALITY_ROWS:] = np.maximum(warm_start_y[self.NUM_EQUALITY_ROWS:], 0)
+            self.solver.warm_start(x=self.warm_start_x, y=warm_start_y)
+        self.results = self.solver.solve()
+        self.iterations = self.results.info.iter
+
+        if self.results.x is not None and self.results.y is not None:
+            self.dual_value = self.row_mapping.T @ self.results.y
+            for constraint in self.constraints:
+                constraint.dual_value = self.dual_value[constraint.rows].reshape(-1, 1)
+        return self.results
+
+    @property
+    def num_equalities(self):
+        return sum([constraint.size for constraint in self.constraints if constraint.equality])
+
+    @property
+    def num_inequalities(self):
+        return sum([constraint.size for constraint in self.constraints if not constraint.equality])
+
+
+def get_osqp_coefficient_matrix(rows: np.ndarray, cols: np.ndarray, data: np.ndarray, NUM_ROWS: int,
+                                NUM_VARIABLES: int):
+    """
+    Creates a sparse coefficient matrix of a constraint block.
+    :param rows: row indexes of the coefficients
+    :param cols: column (variable) indexes of the coefficients
+    :param data: coefficients
+    :param NUM_ROWS: number of rows of the constraint block
+    :param NUM_VARIABLES: number of variables of the optimization problem
+    :return: sparse coefficient matrix
+    """
+    return sp.coo_matrix((np.asarray(data, dtype=float).ravel(), (np.asarray(rows).ravel(), np.asarray(cols).ravel())),
+                         shape=(NUM_ROWS, NUM_VARIABLES))
+
+
+def osqp_variable_bounds(problem: OSQPProblem, constraints_position: dict, constraint_counter: list,
+                         opt_lbs: np.ndarray, opt_ubs: np.ndarray, trade_bound_index, DOMAIN_LEN: int,
+                         ALL_DOMAINS_LEN: int):
+    """
+    Adds one bound row for each optimized quantity combining nonnegativity, trade bounds (strictly bounded trade
+    quantities), upper bounds for supply and manufacture and lower bounds for demand (constraint_trade,
+    constraint_supply, constraint_manufacture and constraint_demand of the cvxpy backend).
+    :param problem: osqp problem
+    :param constraints_position: dict where information (constraint name and position) are saved for the result
+    extraction
+    :param constraint_counter: counter tracking of the number of constraints in constraints_position
+    :param opt_lbs: optimization lower bounds
+    :param opt_ubs: optimization upper bounds
+    :param trade_bound_index: index of strictly bounded trade quantities
+    :param DOMAIN_LEN: aligned length of optimized domains
+    :param ALL_DOMAINS_LEN: aligned length of all optimized domains
+    """
+    opt_lbs, opt_ubs = opt_lbs.ravel(), opt_ubs.ravel()
+    lower_bound = np.zeros(ALL_DOMAINS_LEN)
+    upper_bound = np.full(ALL_DOMAINS_LEN, np.inf)
+
+    lower_bound[trade_bound_index] = np.maximum(opt_lbs[trade_bound_index], 0)
+    upper_bound[trade_bound_index] = opt_ubs[trade_bound_index]
+    upper_bound[3 * DOMAIN_LEN: 5 * DOMAIN_LEN] = opt_ubs[3 * DOMAIN_LEN: 5 * DOMAIN_LEN]
+    lower_bound[0: DOMAIN_LEN] = np.maximum(opt_lbs[0: DOMAIN_LEN], 0)
+
+    QUANTITY_INDEX = np.arange(ALL_DOMAINS_LEN)
+    problem.add_constraint(
+        A=get_osqp_coefficient_matrix(QUANTITY_INDEX, QUANTITY_INDEX, np.ones(ALL_DOMAINS_LEN), ALL_DOMAINS_LEN,
+                                      problem.NUM_VARIABLES),
+        lower=lower_bound, upper=upper_bound, name=VarNames.VARIABLE_BOUNDS.value)
+    constraint_get_position(constraints_position, VarNames.VARIABLE_BOUNDS.value, problem.constraints,
+                            constraint_counter)
+
+
+def osqp_trade_bound_deviation(problem: OSQPProblem, constraints_position: dict, constraint_counter: list,
+                               opt_lbs: np.ndarray, opt_ubs: np.ndarray, trade_mask, ALL_DOMAINS_LEN: int):
+    """
+    Adds the epigraph rows of the absolute deviations from trade lower and upper bounds for penalized trade quantities.
+    Deviation variables are placed after the optimized quantities (lower bound deviations, upper bound deviations).
+    :param problem: osqp problem
+    :param constraints_position: dict where information (constraint name and position) are saved for the result
+    extraction
+    :param constraint_counter: counter tracking of the number of constraints in constraints_position
+    :param opt_lbs: optimization lower bounds
+    :param opt_ubs: optimization upper bounds
+    :param trade_mask: index of penalized trade quantities
+    :param ALL_DOMAINS_LEN: aligned length of all optimized domains
+    """
+    trade_mask = np.asarray(trade_mask)
+    TRADE_LEN = len(trade_mask)
+    trade_lbs, trade_ubs = opt_lbs.ravel()[trade_mask], opt_ubs.ravel()[trade_mask]
+    DEVIATION_INDEX = np.arange(TRADE_LEN)
+    rows = np.concatenate([DEVIATION_INDEX + block * TRADE_LEN for block in range(4) for _ in range(2)])
+    cols = np.concatenate([trade_mask, ALL_DOMAINS_LEN + DEVIATION_INDEX,
+                           trade_mask, ALL_DOMAINS_LEN + DEVIATION_INDEX,
+                           trade_mask, ALL_DOMAINS_LEN + TRADE_LEN + DEVIATION_INDEX,
+                           trade_mask, ALL_DOMAINS_LEN + TRADE_LEN + DEVIATION_INDEX])
+    data = np.concatenate([np.ones(TRADE_LEN), np.ones(TRADE_LEN),
+                           - np.ones(TRADE_LEN), np.ones(TRADE_LEN),
+                           - np.ones(TRADE_LEN), np.ones(TRADE_LEN),
+                           np.ones(TRADE_LEN), np.ones(TRADE_LEN)])
+
+    problem.add_constraint(
+        A=get_osqp_coefficient_matrix(rows, cols, data, 4 * TRADE_LEN, problem.NUM_VARIABLES),
+        lower=np.concatenate([trade_lbs, - trade_lbs, - trade_ubs, trade_ubs]),
+        upper=np.full(4 * TRADE_LEN, np.inf), name=VarNames.TRADE_BOUND_DEVIATION.value)
+    constraint_get_position(constraints_position, VarNames.TRADE_BOUND_DEVIATION.value, problem.constraints,
+                            constraint_counter)
+
+
+def osqp_max_harvest(problem: OSQPProblem, constraints_position: dict, constraint_counter: list,
+                     region_aggregation: sp.csr_matrix, region_start_index: np.ndarray,
+                     harvest_coefficient: np.ndarray, forest_stock: np.ndarray, DOMAIN_LEN: int):
+    """
+    Adds one row for each region limiting the harvested wood to the available forest stock (constraint_max_harvest of
+    the cvxpy backend).
+    :param problem: osqp problem
+    :param constraints_position: dict where information (constraint name and position) are saved for the result
+    extraction
+    :param constraint_counter: counter tracking of the number of constraints in constraints_position
+    :param region_aggregation: sparse matrix aggregating aligned quantities to regions (zy-region excluded)
+    :param region_start_index: aligned start index of each region
+    :param harvest_coefficient: aligned harvest coefficients (ratio_inventory_drain * fraction_fuelwood / MIO_FACTOR)
+    :param forest_stock: aligned forest stock
+    :param DOMAIN_LEN: aligned length of optimized domains
+    """
+    region_aggregation = region_aggregation.tocoo()
+    NUM_REGIONS = region_aggregation.shape[0]
+
+    problem.add_constraint(
+        A=get_osqp_coefficient_matrix(region_aggregation.row, 4 * DOMAIN_LEN + region_aggregation.col,
+                                      harvest_coefficient.ravel()[region_aggregation.col], NUM_REGIONS,
+                                      problem.NUM_VARIABLES),
+        lower=np.full(NUM_REGIONS, -np.inf),
+        upper=forest_stock.ravel()[region_start_index],
+        name=VarNames.MAX_HARVEST.value)
+    constraint_get_position(constraints_position, VarNames.MAX_HARVEST.value, problem.constraints, constraint_counter)
+
+
+def osqp_material_balance(problem: OSQPProblem, constraints_position: dict, constraint_counter: list,
+                          material_balance_structures: list, io_matrix: sp.csr_matrix, io_coefficient_index: tuple,
+                          DOMAIN_LEN: int):
+    """
+    Adds the material balance with one constraint for each material balance structure (rows of regions and
+    commodities, zy-region excluded; constraint_material_balance of the cvxpy backend).
+    Coefficients of the io-matrix are stored for all positions of the io-coefficient index to keep the sparsity
+    structure constant between periods.
+    :param problem: osqp problem
+    :param constraints_position: dict where information (constraint name and position) are saved for the result
+    extraction
+    :param constraint_counter: counter tracking of the number of constraints in constraints_position
+    :param material_balance_structures: list of dicts with domain matrix, io weight matrix and aligned index of the rows
+    :param io_matrix: io-matrix
+    :param io_coefficient_index: row and column indexes of all possible io-coefficients
+    :param DOMAIN_LEN: aligned length of optimized domains
+    """
+    for structure_num, material_balance_structure in enumerate(material_balance_structures):
+        domain_matrix = sp.coo_matrix(material_balance_structure["domain_matrix"])
+        ROW_LEN = domain_matrix.shape[0]
+        mb_row = np.full(DOMAIN_LEN, -1)
+        mb_row[material_balance_structure["row_index"]] = np.arange(ROW_LEN)
+        # Each aligned quantity is weighted in (at most) one row
+        io_weight = np.asarray(material_balance_structure["io_weight_matrix"].sum(axis=0)).ravel()
+
+        # Input quantities for manufacturing (raw and intermediate products)
+        io_rows, io_cols = io_coefficient_index
+        io_select = mb_row[io_rows] >= 0
+        io_rows, io_cols = io_rows[io_select], io_cols[io_select]
+
+        problem.add_constraint(
+            A=get_osqp_coefficient_matrix(
+                np.concatenate([domain_matrix.row, mb_row[io_rows]]),
+                np.concatenate([domain_matrix.col, 3 * DOMAIN_LEN + io_cols]),
+                np.concatenate([domain_matrix.data,
+                                io_weight[io_rows] * np.asarray(io_matrix[io_rows, io_cols]).ravel()]),
+                ROW_LEN, problem.NUM_VARIABLES),
+            lower=np.zeros(ROW_LEN), upper=np.zeros(ROW_LEN),
+            name=f"{VarNames.MATERIAL_BALANCE.value}_{structure_num}")
+    constraint_get_position(constraints_position, VarNames.MATERIAL_BALANCE.value, problem.constraints,
+                            constraint_counter)
+
+
+def osqp_global_material_balance(problem: OSQPProblem, constraints_position: dict, constraint_counter: list,
+                                 global_material_balance_structure: dict, io_matrix: sp.csr_matrix,
+                                 io_coefficient_index: tuple, DOMAIN_LEN: int):
+    """
+    Adds the global material balance with one row for each commodity group (constraint_global_material_balance of the
+    cvxpy backend). Coefficients of the io-matrix are stored for all positions of the io-coefficient index to keep the
+    sparsity structure constant between periods.
+    :param problem: osqp problem
+    :param constraints_position: dict where information (constraint name and position) are saved for the result
+    extraction
+    :param constraint_counter: counter tracking of the number of constraints in constraints_position
+    :param global_material_balance_structure: dict with domain matrix and io weight matrix
+    :param io_matrix: io-matrix
+    :param io_coefficient_index: row and column indexes of all possible io-coefficients
+    :param DOMAIN_LEN: aligned length of optimized domains
+    """
+    domain_matrix = sp.coo_matrix(global_material_balance_structure["domain_matrix"])
+    ROW_LEN = domain_matrix.shape[0]
+
+    # Input quantities for manufacturing weighted with the coefficient of their commodity group
+    io_rows, io_cols = io_coefficient_index
+    io_weight = sp.csr_matrix(global_material_balance_structure["io_weight_matrix"])[:, io_rows].tocoo()
+    io_rows, io_cols = io_rows[io_weight.col], io_cols[io_weight.col]
+
+    problem.add_constraint(
+        A=get_osqp_coefficient_matrix(
+            np.concatenate([domain_matrix.row, io_weight.row]),
+            np.concatenate([domain_matrix.col, 3 * DOMAIN_LEN + io_cols]),
+            np.concatenate([domain_matrix.data, io_weight.data * np.asarray(io_matrix[io_rows, io_cols]).ravel()]),
+            ROW_LEN, problem.NUM_VARIABLES),
+        lower=np.zeros(ROW_LEN), upper=np.zeros(ROW_LEN), constraint_len=[1] * ROW_LEN,
+        name=VarNames.GLOBAL_MATERIAL_BALANCE.value)
+    constraint_get_position(constraints_position, VarNames.GLOBAL_MATERIAL_BALANCE.value, problem.constraints,
+                            constraint_counter)
+
+
+def osqp_material_balance_zy(problem: OSQPProblem, constraints_position: dict, constraint_counter: list,
+                             region_code: np.ndarray, commodity_code: np.ndarray, commodities: list,
+                             export_quantity: np.ndarray, import_quantity: np.ndarray, DOMAIN_LEN: int):
+    """
+    Adds the material balance for the zy-region and the constraints fixing zy-region exports and imports to the
+    calibrated trade (constraint_material_balance_zy of the cvxpy backend). One constraint for each commodity.
+    :param problem: osqp problem
+    :param constraints_position: dict where information (constraint name and position) are saved for the result
+    extraction
+    :param constraint_counter: counter tracking of the number of constraints in constraints_position
+    :param region_code: aligned region codes
+    :param commodity_code: aligned commodity codes
+    :param commodities: commodity codes
+    :param export_quantity: aligned export quantities
+    :param import_quantity: aligned import quantities
+    :param DOMAIN_LEN: aligned length of optimized domains
+    """
+    zy_region_var = VarNames.ZY_REGION.value
+    COMMODITY_LEN = len(commodities)
+    commodity_row = {commodity: row for row, commodity in enumerate(commodities)}
+    aligned_row = np.array([commodity_row[commodity] for commodity in commodity_code])
+    zy_index = np.array([np.nonzero((region_code == zy_region_var) & (commodity_code == commodity))[0][0]
+                         for commodity in commodities])
+    ALIGNED_INDEX = np.arange(DOMAIN_LEN)
+
+    # zy-imports + imports of all regions == zy-exports + exports of all regions
+    problem.add_constraint(
+        A=get_osqp_coefficient_matrix(np.concatenate([aligned_row, aligned_row]),
+                                      np.concatenate([2 * DOMAIN_LEN + ALIGNED_INDEX, DOMAIN_LEN + ALIGNED_INDEX]),
+                                      np.concatenate([np.ones(DOMAIN_LEN), - np.ones(DOMAIN_LEN)]),
+                                      COMMODITY_LEN, problem.NUM_VARIABLES),
+        lower=np.zeros(COMMODITY_LEN), upper=np.zeros(COMMODITY_LEN), constraint_len=[1] * COMMODITY_LEN,
+        name=VarNames.MATERIAL_BALANCE_ZY.value)
+    constraint_get_position(constraints_position, VarNames.MATERIAL_BALANCE_ZY.value, problem.constraints,
+                            constraint_counter)
+
+    # zy-exports and zy-imports fixed to calibrated trade
+    for constraint_name, domain_num, trade_quantity in [(VarNames.ZY_EXPORT.value, 1, export_quantity),
+                                                        (VarNames.ZY_IMPORT.value, 2, import_quantity)]:
+        problem.add_constraint(
+            A=get_osqp_coefficient_matrix(np.arange(COMMODITY_LEN), domain_num * DOMAIN_LEN + zy_index,
+                                          np.ones(COMMODITY_LEN), COMMODITY_LEN, problem.NUM_VARIABLES),
+            lower=trade_quantity.ravel()[zy_index], upper=trade_quantity.ravel()[zy_index],
+            constraint_len=[1] * COMMODITY_LEN, name=constraint_name)
+        constraint_get_position(constraints_position, constraint_name, problem.constraints, constraint_counter)
+
+
+def osqp_primal_warm_start(problem: OSQPProblem, previous_quantity: np.ndarray, opt_lbs: np.ndarray,
+                           opt_ubs: np.ndarray, trade_mask, ALL_DOMAINS_LEN: int):
+    """
+    Creates the primal starting point from optimized quantities (e.g. of the previous period). Deviation variables are
+    set to the deviations of the quantities from the actual trade bounds.
+    :param problem: osqp problem
+    :param previous_quantity: optimized quantities
+    :param opt_lbs: optimization lower bounds
+    :param opt_ubs: optimization upper bounds
+    :param trade_mask: index of penalized trade quantities
+    :param ALL_DOMAINS_LEN: aligned length of all optimized domains
+    :return: primal starting point
+    """
+    trade_mask = np.asarray(trade_mask, dtype=int)
+    TRADE_LEN = len(trade_mask)
+    previous_quantity = np.asarray(previous_quantity).ravel()[:ALL_DOMAINS_LEN]
+    primal_warm_start = np.zeros(problem.NUM_VARIABLES)
+    primal_warm_start[:ALL_DOMAINS_LEN] = previous_quantity
+    primal_warm_start[ALL_DOMAINS_LEN: ALL_DOMAINS_LEN + TRADE_LEN] = np.abs(
+        opt_lbs.ravel()[trade_mask] - previous_quantity[trade_mask])
+    primal_warm_start[ALL_DOMAINS_LEN + TRADE_LEN: ALL_DOMAINS_LEN + 2 * TRADE_LEN] = np.abs(
+        previous_quantity[trade_mask] - opt_ubs.ravel()[trade_mask])
+    return primal_warm_start
@@ -1,40 +1,34 @@
-from TiMBA.main_runner.main_runner import main
+from TiMBA.main_runner.main_runner import run_worlds
 from TiMBA.data_management.ParameterCollector import ParameterCollector
+from TiMBA.data_management.DataManager import DataManager
 from TiMBA.parameters import INPUT_WORLD_PATH
 from pathlib import Path
-import datetime as dt
-import os
 import warnings
 warnings.simplefilter(action='ignore', category=FutureWarning)
 
 PACKAGEDIR = Path(__file__).parent.absolute()
 
 if __name__ == '__main__':
-    from TiMBA.user_io.default_parameters import user_input
+    from TiMBA.user_io.default_parameters import user_input, default_jobs
     Parameters = ParameterCollector(user_input=user_input)
-    world_list = os.listdir(INPUT_WORLD_PATH)
-    for world in world_list:
-        current_dt = dt.datetime.now().strftime("%Y%m%dT%H-%M-%S")
-        print(f"The model starts now:", (dt.datetime.now().strftime("%m/%d/%Y, %H:%M:%S")),"\n")
-        print(f"Path:", INPUT_WORLD_PATH)
-        print(f"Name of input file:", world[:len(world) - 5], "\n")
-        print(f"User input for model settings:\n",
-              f"Start year: {Parameters.year}\n",
-              f"Number of periods: {Parameters.max_period}\n",
-              f"Calculation of prices by: {Parameters.calc_product_prices}\n",
-              f"Calculation of world prices by: {Parameters.calc_world_prices}\n",
-              f"Material balance: {Parameters.material_balance}\n",
-              f"Input data through serialization: {Parameters.serialization}\n",
-              f"Dynamization activated: {Parameters.dynamization_activated}\n",
-              f"Prices are capped: {Parameters.capped_prices}\n",
-              f"Optimization gives verbose logs: {Parameters.verbose_optimization_logger}\n",
-              f"TiMBA gives verbose logs: {Parameters.verbose_calculation_logger}\n",
-              f"Read additional informations: {Parameters.addInfo}\n")
-
-        main(UserIO=Parameters,
-             world_version=world,
-             time_stamp=current_dt,
-             package_dir=PACKAGEDIR,
-             sc_name=world[:len(world) - 5])
-
+    world_list = DataManager.get_input_worlds(INPUT_WORLD_PATH)
+    print(f"Path:", INPUT_WORLD_PATH)
+    print(f"Worlds computed in parallel: {min(default_jobs, len(world_list))}\n")
+    print(f"User input for model settings:\n",
+          f"Start year: {Parameters.year}\n",
+          f"Number of periods: {Parameters.max_period}\n",
+          f"Calculation of prices by: {Parameters.calc_product_prices}\n",
+          f"Calculation of world prices by: {Parameters.calc_world_prices}\n",
+          f"Material balance: {Parameters.material_balance}\n",
+          f"Optimization backend: {Parameters.optimization_backend}\n",
+          f"Dynamization backend: {Parameters.dynamization_backend}\n",
+          f"Processes reading input sheets: {Parameters.read_workers}\n",
+          f"Input data through serialization: {Parameters.serialization}\n",
+          f"Checkpoints after each period: {Parameters.checkpoint}\n",
+          f"Dynamization activated: {Parameters.dynamization_activated}\n",
+          f"Prices are capped: {Parameters.capped_prices}\n",
+          f"Optimization gives verbose logs: {Parameters.verbose_optimization_logger}\n",
+          f"TiMBA gives verbose logs: {Parameters.verbose_calculation_logger}\n",
+          f"Read additional informations: {Parameters.addInfo}\n")
 
+    run_worlds(UserIO=Parameters, world_list=world_list, package_dir=PACKAGEDIR, jobs=default_jobs)
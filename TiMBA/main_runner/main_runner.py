@@ -1,44 +1,58 @@
 from timeit import default_timer
+from concurrent.futures import ProcessPoolExecutor
 from TiMBA.logic.model import TiMBA
-from TiMBA.parameters import get_results_writer, get_global_paths, get_pkl_paths, get_output_paths
+from TiMBA.logic.monte_carlo import MonteCarlo, UncertainParameter
+from TiMBA.parameters import (get_results_writer, get_global_paths, get_pkl_paths, get_output_paths,
+                              get_input_cache_path, get_world_name)
 # TODO reactivate and verify if time_stamp and world_version are transfered in output names
 # TODO check if all paths for outputs are provided
 from TiMBA.parameters import FOREST_OUTPUT, RESULTS_OUTPUT, RESULTS_OUTPUT_AGG, WORLD_PRICE_OUTPUT
 from TiMBA.data_management.ParameterCollector import ParameterCollector
 from TiMBA.results_logging.base_logger import get_logger
+from TiMBA.results_logging.ResultsWriter import PeriodResultsWriter
 from TiMBA.data_management.DataManager import DataManager
+from TiMBA.data_management.InputCache import InputCache
+from TiMBA.data_management.ModelCheckpoint import ModelCheckpoint
 from TiMBA.data_management.DataContainer import WorldDataCollector, DataContainer, AdditionalInformation
 from TiMBA.parameters.Defines import SolverParameters
+import datetime as dt
 import os
 
 
-def main(UserIO: ParameterCollector, world_version: list, time_stamp: str, package_dir, sc_name: str):
+def prepare_input_data(UserIO: ParameterCollector, world_version: str, Logger, serialize_input: bool = True):
     """
-    Main function of TiMBA. The function is structured as follow: (1) The read in of input data and the model setup,
-    (2) the computation, (3) the extraction of the model outputs.
-    :param UserIO: Collection of parameters. Default calls values from TiMBA.user_io.default_parameters. Default values
-     are overwritten by CLI input or different call from TiMBA.main.py
+    Read in and preprocess the input data of a world, or restore them from the input cache (memory-mapped bundles)
+    or from serialized input data.
+    :param UserIO: Collection of parameters
     :param world_version: Name of the input world
-    :param time_stamp: Time stamp of the model start
-    :param package_dir: Path of the packages directory
-    :param sc_name: Name of the scenario based on the name of the input world
+    :param Logger: Logger
+    :param serialize_input: write the serialized input data (shared by all worlds, not written by worlds computed in
+     parallel processes)
+    :return: WorldDataContent, AddInfoContent and WorldPriceContent
     """
-    start = default_timer()
-    # TODO removal of ResultHandler/ move to analysis toolbox
-    ResultsHandler = get_results_writer(UserIO.folderpath, agg_flag=False)
-    ResultsHandlerAgg = get_results_writer(UserIO.folderpath, agg_flag=True)
-    # TODO remove until here
-    Logger = get_logger(UserIO.folderpath)
-
     input_world_path, add_info_path, world_price_path = get_global_paths(UserIO.folderpath, world_version)
     WorldDataContent = WorldDataCollector(input_world_path)
     AddInfoContent = AdditionalInformation(add_info_path)
     WorldPriceContent = DataContainer(world_price_path)
-    OUTPUT_PATH, latest_file, PKL_OUTPUT_PATH = get_output_paths(package_dir, time_stamp, sc_name)
+
+    # Preprocessed input data are cached by content of the input files. User options do not change the
+    # preprocessed input data (base year is verified after restoring).
+    input_cache = InputCache(get_input_cache_path(UserIO.folderpath))
+    input_filepaths = [input_world_path, add_info_path, world_price_path]
+    cache_key, cached_contents = None, None
+    if UserIO.serialization and all(DataManager.input_exists(filepath) for filepath in input_filepaths):
+        cache_key = InputCache.get_key(input_filepaths)
+        cached_contents = input_cache.restore(cache_key)
+        Logger.info(f"Input cache {'hit' if cached_contents is not None else 'miss'}: {cache_key}")
 
     # TODO rebase name for serialization_flag
-    if not UserIO.serialization or (not os.path.exists(get_pkl_paths(UserIO.folderpath)[0])):
-        Logger.info(f"World.xlsx from: {input_world_path}")
+    if cached_contents is not None:
+        Logger.info(f"Restore cached Input Data from: {input_cache.get_entry_path(cache_key)}")
+        WorldDataContent, AddInfoContent, WorldPriceContent = cached_contents
+        DataManager.verify_base_year(WorldDataContent, UserIO, Logger)
+    elif (not UserIO.serialization or cache_key is not None or
+          (not os.path.exists(get_pkl_paths(UserIO.folderpath)[0]))):
+        Logger.info(f"World.xlsx ({DataManager.get_input_source(input_world_path)}) from: {input_world_path}")
         Logger.info(f"WorldPrice.xlsx from: {world_price_path}")
         Logger.info(f"AddInfo.xlsx from: {add_info_path}")
         DataManager.readin_preprocess(WorldData=WorldDataContent,
@@ -47,12 +61,19 @@ def main(UserIO: ParameterCollector, world_version: list, time_stamp: str, packa
                                       UserOptions=UserIO,
                                       Logger=Logger)
         Logger.info(f"Readin + Pre-Processing complete.")
-        Logger.info(f"Input Data prepared for serialization")
-        pkl_world_path, pkl_add_info_path, pkl_worldprice_path = get_pkl_paths(UserIO.folderpath)
-        DataManager.serialize_to_pickle(WorldDataContent, pkl_world_path)
-        DataManager.serialize_to_pickle(AddInfoContent, pkl_add_info_path)
-        DataManager.serialize_to_pickle(WorldPriceContent, pkl_worldprice_path)
+        if serialize_input:
+            Logger.info(f"Input Data prepared for serialization")
+            pkl_world_path, pkl_add_info_path, pkl_worldprice_path = get_pkl_paths(UserIO.folderpath)
+            DataManager.serialize_to_pickle(WorldDataContent, pkl_world_path)
+            DataManager.serialize_to_pickle(AddInfoContent, pkl_add_info_path)
+            DataManager.serialize_to_pickle(WorldPriceContent, pkl_worldprice_path)
+        else:
+            Logger.info(f"Serialized Input Data not written (worlds computed in parallel)")
+        if cache_key is not None:
+            evicted_keys = input_cache.store(cache_key, (WorldDataContent, AddInfoContent, WorldPriceContent))
+            Logger.info(f"Input Data cached ({len(evicted_keys)} least recently used entries evicted)")
     else:
+        # Input files not available: restore serialized Input Data
         Logger.info(f"Restore serialized Input Data")
         pkl_world_path, pkl_add_info_path, pkl_worldprice_path = get_pkl_paths(UserIO.folderpath)
         Logger.info(f"World.pkl from: {pkl_world_path}")
@@ -61,28 +82,249 @@ def main(UserIO: ParameterCollector, world_version: list, time_stamp: str, packa
         WorldDataContent = DataManager.restore_from_pickle(pkl_world_path)
         AddInfoContent = DataManager.restore_from_pickle(pkl_add_info_path)
         WorldPriceContent = DataManager.restore_from_pickle(pkl_worldprice_path)
+        DataManager.migrate_forest_layout(WorldDataContent)
         DataManager.verify_base_year(WorldDataContent, UserIO, Logger)
-    
+
+    return WorldDataContent, AddInfoContent, WorldPriceContent
+
+
+def compile_input(UserIO: ParameterCollector, world_version: str):
+    """
+    Compile the input data of a world into the input cache ahead of model runs. Following runs with serialization
+    restore the input data memory-mapped from the cache as long as the input files do not change.
+    :param UserIO: Collection of parameters
+    :param world_version: Name of the input world
+    """
+    Logger = get_logger(UserIO.folderpath)
+    input_filepaths = get_global_paths(UserIO.folderpath, world_version)
+    if not all(DataManager.input_exists(filepath) for filepath in input_filepaths):
+        Logger.info(f"Input files not found, no Input Data compiled for: {world_version}")
+        return
+    UserIO.serialization = True
+    prepare_input_data(UserIO, world_version, Logger)
+    Logger.info(f"Input Data compiled for: {world_version}")
+
+
+def main(UserIO: ParameterCollector, world_version: list, time_stamp: str, package_dir, sc_name: str,
+         world_logger: bool = False, serialize_input: bool = True) -> dict:
+    """
+    Main function of TiMBA. The function is structured as follow: (1) The read in of input data and the model setup,
+    (2) the computation, (3) the extraction of the model outputs.
+    :param UserIO: Collection of parameters. Default calls values from TiMBA.user_io.default_parameters. Default values
+     are overwritten by CLI input or different call from TiMBA.main.py
+    :param world_version: Name of the input world
+    :param time_stamp: Time stamp of the model start
+    :param package_dir: Path of the packages directory
+    :param sc_name: Name of the scenario based on the name of the input world
+    :param world_logger: log to the log file of the world (worlds computed in parallel processes)
+    :param serialize_input: write the serialized input data (see prepare_input_data)
+    :return: summary of the run (see run_model)
+    """
+    start = default_timer()
+    Logger = get_logger(UserIO.folderpath, world_name=sc_name if world_logger else None)
+
+    input_contents = prepare_input_data(UserIO, world_version, Logger, serialize_input=serialize_input)
+    return run_model(UserIO=UserIO, input_contents=input_contents, world_version=world_version, time_stamp=time_stamp,
+              package_dir=package_dir, sc_name=sc_name, Logger=Logger, start=start)
+
+
+def resume(run_dir: str, package_dir, period: int = None) -> dict:
+    """
+    Resume a model run from the checkpoint of a computed period. User options, world version and time stamp of the run
+    are restored from the checkpoint, the output of the run is continued in the run directory.
+    :param run_dir: directory of the model run (directory of the period output)
+    :param package_dir: Path of the packages directory
+    :param period: computed period to resume from (default: last period with checkpoint)
+    :return: summary of the run (see run_model)
+    """
+    start = default_timer()
+    Checkpoint = ModelCheckpoint(run_dir)
+    if period is None:
+        if not Checkpoint.get_periods():
+            raise FileNotFoundError(f"No checkpoints found in: {run_dir}")
+        period = Checkpoint.get_periods()[-1]
+    input_contents, state = Checkpoint.restore(period)
+    UserIO = state["UserIO"]
+    Logger = get_logger(UserIO.folderpath)
+    Logger.info(f"Resume run of {get_world_name(state['world_version'])} from checkpoint of period {period}: "
+                f"{Checkpoint.get_period_path(period)}")
+    Checkpoint.remove_following(period)
+    return run_model(UserIO=UserIO, input_contents=input_contents, world_version=state["world_version"],
+              time_stamp=state["time_stamp"], package_dir=package_dir, sc_name=state["sc_name"], Logger=Logger,
+              start=start, checkpoint_state=state)
+
+
+def run_model(UserIO: ParameterCollector, input_contents: tuple, world_version: str, time_stamp: str, package_dir,
+              sc_name: str, Logger, start: float, checkpoint_state: dict = None) -> dict:
+    """
+    Setup and computation of the model, and extraction of the model outputs.
+    :param UserIO: Collection of parameters
+    :param input_contents: tuple of WorldDataContent, AddInfoContent and WorldPriceContent
+    :param world_version: Name of the input world
+    :param time_stamp: Time stamp of the model start
+    :param package_dir: Path of the packages directory
+    :param sc_name: Name of the scenario based on the name of the input world
+    :param Logger: Logger
+    :param start: start time of the run
+    :param checkpoint_state: state of the checkpoint if the run is resumed (computation continues after its period)
+    :return: summary of the run (world, status, computed periods, duration and run directory)
+    """
+    # TODO removal of ResultHandler/ move to analysis toolbox
+    ResultsHandler = get_results_writer(UserIO.folderpath, agg_flag=False)
+    ResultsHandlerAgg = get_results_writer(UserIO.folderpath, agg_flag=True)
+    # TODO remove until here
+    WorldDataContent, AddInfoContent, WorldPriceContent = input_contents
+    OUTPUT_PATH, latest_file, PKL_OUTPUT_PATH = get_output_paths(package_dir, time_stamp, sc_name)
+    resume_period = None if checkpoint_state is None else checkpoint_state["period"]
+
+    # Output tables are written after each period, runs stopping early keep the output of the computed periods
+    period_output_path = DataManager.get_period_output_path(time_stamp, world_version)
+    PeriodResultsHandler = PeriodResultsWriter(period_output_path, resume_period=resume_period)
+    Logger.info(f"Results of each period written to: {period_output_path}")
+
+    Checkpoint = None
+    if UserIO.checkpoint:
+        Checkpoint = ModelCheckpoint(period_output_path, run_info={"UserIO": UserIO, "world_version": world_version,
+                                                                   "time_stamp": time_stamp, "sc_name": sc_name})
+        Logger.info(f"Checkpoints of each period saved in: {Checkpoint.checkpoint_path}")
+
     Model = TiMBA(Data=WorldDataContent, UserOptions=UserIO, AdditionalInfo=AddInfoContent,
-                  WorldPriceData=WorldPriceContent, LogHandler=Logger, ResultHandler=ResultsHandler)
+                  WorldPriceData=WorldPriceContent, LogHandler=Logger, ResultHandler=ResultsHandler,
+                  PeriodResultHandler=PeriodResultsHandler, Checkpoint=Checkpoint)
+    if checkpoint_state is not None:
+        Model.restore_checkpoint_state(checkpoint_state)
     # Computation
     Model.compute(max_iteration=SolverParameters.MAX_ITERATION.value,
                   rel_accuracy=SolverParameters.REL_ACCURACY.value,
                   abs_accuracy=SolverParameters.ABS_ACCURACY.value,
                   dynamization_activated=UserIO.dynamization_activated,
                   constants=UserIO.constants,
-                  capped_prices=UserIO.capped_prices)
+                  capped_prices=UserIO.capped_prices,
+                  start_period=0 if resume_period is None else resume_period + 1)
     # Output
     print()
     Logger.info(f"Save optimization results")
     output_path = {"output_path": OUTPUT_PATH, "pkl_output_path": PKL_OUTPUT_PATH}
 
-    DataManager.save_model_output(model_data=Model.Data,
-                                  time_stamp=time_stamp,
-                                  world_version=world_version,
-                                  logger=Logger,
-                                  output_path=output_path)
+    if Model.Data.OptimizationHelpers.data_periods is None:
+        Logger.warning(f"No period computed, no optimization results saved")
+    else:
+        DataManager.save_model_output(model_data=Model.Data,
+                                      time_stamp=time_stamp,
+                                      world_version=world_version,
+                                      logger=Logger,
+                                      output_path=output_path)
 
+    if not PeriodResultsHandler.is_complete():
+        Logger.warning(f"Computation stopped early, results of periods {PeriodResultsHandler.written_periods} "
+                       f"saved in: {period_output_path}")
     Logger.info(f"Computing TiMBA complete")
     duration = round(default_timer() - start, 3)
     Logger.info(f"TiMBA Duration: {duration} s | {round(duration / 60, 3)} min | {round(duration / 3600, 3)} h.")
+    return {"world": sc_name, "status": "complete" if PeriodResultsHandler.is_complete() else "stopped early",
+            "periods": PeriodResultsHandler.written_periods, "duration": duration, "run_dir": period_output_path}
+
+
+def run_world(UserIO: ParameterCollector, world_version: str, package_dir, world_logger: bool = False,
+              serialize_input: bool = True) -> dict:
+    """
+    Compute a world with its own time stamp (task of the worker pool of run_worlds). Errors are logged and reported in
+    the summary, so that the other worlds of the batch are still computed.
+    :param UserIO: Collection of parameters
+    :param world_version: Name of the input world
+    :param package_dir: Path of the packages directory
+    :param world_logger: log to the log file of the world
+    :param serialize_input: write the serialized input data (see prepare_input_data)
+    :return: summary of the run (see run_model)
+    """
+    start = default_timer()
+    current_dt = dt.datetime.now().strftime("%Y%m%dT%H-%M-%S")
+    sc_name = get_world_name(world_version)
+    print(f"The model starts now:", (dt.datetime.now().strftime("%m/%d/%Y, %H:%M:%S")), "\n")
+    print(f"Name of input file:", sc_name, "\n")
+    try:
+        return main(UserIO=UserIO,
+                    world_version=world_version,
+                    time_stamp=current_dt,
+                    package_dir=package_dir,
+                    sc_name=sc_name,
+                    world_logger=world_logger,
+                    serialize_input=serialize_input)
+    except Exception as error:
+        Logger = get_logger(UserIO.folderpath, world_name=sc_name if world_logger else None)
+        Logger.error(f"Computing TiMBA failed for world: {sc_name}", exc_info=True)
+        return {"world": sc_name, "status": f"failed ({type(error).__name__}: {error})", "periods": [],
+                "duration": round(default_timer() - start, 3),
+                "run_dir": DataManager.get_period_output_path(current_dt, world_version)}
+
+
+def run_worlds(UserIO: ParameterCollector, world_list: list, package_dir, jobs: int = 1) -> list:
+    """
+    Compute all worlds, one after another or in a pool of jobs processes. The worlds share no data, each world writes
+    its output to its own run directory and, if computed in parallel, logs to its own log file and does not write the
+    serialized input data shared by all worlds. A combined summary of all runs is printed at the end.
+    :param UserIO: Collection of parameters
+    :param world_list: Names of the input worlds
+    :param package_dir: Path of the packages directory
+    :param jobs: number of worlds computed in parallel processes
+    :return: summaries of the runs in order of the world list
+    """
+    start = default_timer()
+    if jobs > 1 and len(world_list) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(world_list))) as executor:
+            summaries = list(executor.map(run_world, [UserIO] * len(world_list), world_list,
+                                          [package_dir] * len(world_list), [True] * len(world_list),
+                                          [False] * len(world_list)))
+    else:
+        summaries = [run_world(UserIO=UserIO, world_version=world, package_dir=package_dir) for world in world_list]
+    print_run_summary(summaries, duration=round(default_timer() - start, 3))
+    return summaries
+
+
+def print_run_summary(summaries: list, duration: float):
+    """
+    Print the combined summary of the runs of all worlds.
+    :param summaries: summaries of the runs (see run_model)
+    :param duration: total duration of all runs in seconds
+    """
+    print()
+    print(f"Summary of {len(summaries)} world(s), total duration: {duration} s | {round(duration / 60, 3)} min")
+    for summary in summaries:
+        print(f" {summary['world']}: {summary['status']}, periods: {summary['periods']}, "
+              f"duration: {summary['duration']} s, output: {summary['run_dir']}")
+
+
+def monte_carlo(UserIO: ParameterCollector, world_version: str, parameters: list, num_samples: int, seed: int,
+                workers: int, batch_size: int):
+    """
+    Monte Carlo uncertainty analysis of a world. The input data are read in and preprocessed once, the samples are
+    computed in a pool of worker processes (see TiMBA.logic.monte_carlo).
+    :param UserIO: Collection of parameters
+    :param world_version: Name of the input world
+    :param parameters: uncertain parameters declared as dicts (see UncertainParameter)
+    :param num_samples: number of samples
+    :param seed: seed of the run
+    :param workers: number of processes computing samples
+    :param batch_size: number of samples computed in one task of a process
+    :return: summary of the samples
+    """
+    start = default_timer()
+    current_dt = dt.datetime.now().strftime("%Y%m%dT%H-%M-%S")
+    sc_name = get_world_name(world_version)
+    Logger = get_logger(UserIO.folderpath)
+    WorldDataContent, AddInfoContent, WorldPriceContent = prepare_input_data(UserIO, world_version, Logger)
+
+    output_dir = DataManager.get_monte_carlo_output_path(current_dt, world_version)
+    Logger.info(f"Monte Carlo results written to: {output_dir}")
+    MonteCarloRun = MonteCarlo(WorldData=WorldDataContent, AdditionalInfo=AddInfoContent,
+                               WorldPriceData=WorldPriceContent, UserIO=UserIO,
+                               parameters=[UncertainParameter.from_dict(parameter) for parameter in parameters],
+                               num_samples=num_samples, seed=seed, output_dir=output_dir, world_name=sc_name,
+                               Logger=Logger, workers=workers, batch_size=batch_size)
+    summary = MonteCarloRun.run()
+
+    duration = round(default_timer() - start, 3)
+    Logger.info(f"Monte Carlo run of {sc_name} complete: {(summary['status'] == 'complete').sum()}/{num_samples} "
+                f"samples complete")
+    Logger.info(f"Monte Carlo Duration: {duration} s | {round(duration / 60, 3)} min | {round(duration / 3600, 3)} h.")
+    return summary
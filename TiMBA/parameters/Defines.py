@@ -17,12 +17,15 @@ class VarNames(Enum):
 
     TRADE_LOWER_BOUND = "trade_lower_bound"
     TRADE_UPPER_BOUND = "trade_upper_bound"
+    TRADE_BOUND_DEVIATION = "trade_bound_deviation"
+    VARIABLE_BOUNDS = "variable_bounds"
     SUPPLY_UPPER_BOUND = "supply_upper_bound"
     DEMAND_LOWER_BOUND = "demand_lower_bound"
     MANU_UPPER_BOUND = "manu_upper_bound"
     MAX_HARVEST = "max_harvest"
     MATERIAL_BALANCE = "material_balance"
     MATERIAL_BALANCE_ZY = "material_balance_zy"
+    GLOBAL_MATERIAL_BALANCE = "Global_Material_Balance_test"
     ZY_EXPORT = "zy_export"
     ZY_IMPORT = "zy_import"
     ZY_REGION = "zy"
@@ -42,6 +45,10 @@ class VarNames(Enum):
     RC_SPECIFIC_MB = "RC_specific_MB"
     RCG_SPECIFIC_MB = "RCG_specific_MB"
     OPT_MB = "optional_MB"
+    CVXPY_BACKEND = "cvxpy"
+    OSQP_BACKEND = "osqp"
+    PANDAS_DYNAMIZATION = "pandas"
+    NUMPY_DYNAMIZATION = "numpy"
 
 
 class Constants(Enum):
@@ -73,6 +80,67 @@ class SolverParameters(Enum):
     MAX_ITERATION_UNIT_TEST = 500000
     REL_ACCURACY_UNIT_TEST = 0.00025
     ABS_ACCURACY_UNIT_TEST = 0.00001
+    # osqp status with solution (solved, solved inaccurate, max iterations reached, time limit reached), only the first
+    # is accurate (cvxpy status with solution: cvxpy.settings.SOLUTION_PRESENT)
+    OSQP_SOLVED_STATUS = (1, 2, -2, -6)
+
+
+class CacheParameters(Enum):
+    """
+    INPUT_CACHE_VERSION: increment if read-in or preprocessing change the serialized input data (invalidates cache)
+    """
+    INPUT_CACHE_VERSION = 3
+    INPUT_CACHE_MAX_SIZE = 500 * 1024 ** 2  # Max size of all input cache entries in bytes (LRU eviction)
+    HASH_CHUNK_SIZE = 1024 ** 2
+
+
+class CheckpointParameters(Enum):
+    CHECKPOINT_DIR = "checkpoints"  # Directory of the checkpoints in the run directory
+
+
+class MonteCarloParameters(Enum):
+    SAMPLE_COLNAME = "Sample"
+    BATCH_SIZE = 10  # Number of samples computed in one task of a worker process
+    DEFAULT_SEED = 0
+    RESULT_COLUMNS = ["RegionCode", "CommodityCode", VarNames.DOMAIN_COLNAME.value, VarNames.PERIOD_COLNAME.value,
+                      VarNames.YEAR_COLNAME.value, VarNames.QUANTITY_COLNAME.value, VarNames.PRICE_COLNAME.value]
+    DRAW_COLUMNS = ["Parameter", "Row", "Draw"]  # Per-row draws of uncertain parameters (draws.csv)
+    # Attributes of the World data changed during the computation besides the updated domains (copied for each sample)
+    COPIED_ATTRIBUTES = ["OptimizationHelpers", "OptimizationResults", "WorldPrices"]
+    # Attributes of the updated domains read-only during the computation (shared by all samples)
+    SHARED_DOMAIN_ATTRIBUTES = ["ioMatrix", "ioMatrixshort"]
+
+
+class InputFormat(Enum):
+    """
+    Input sources of world data: Excel workbook (world.xlsx), directory with one csv file per sheet (world/<sheet>.csv)
+    or world in a SQLite database (worlds.sqlite/<world>)
+    """
+    EXCEL = "Excel"
+    CSV = "csv"
+    CSV_EXTENSION = ".csv"
+    EXCEL_EXTENSION = ".xlsx"
+    SQL = "sql"
+    SQL_EXTENSION = ".sqlite"
+    WORLD_PRICE_SHEET = "worldprice"  # TODO Hard code (future work)
+    DESCRIPTION_MARKER = "="
+
+
+class SQLParameters(Enum):
+    """
+    Tables and columns of the SQLite input database. Each main domain is a table holding the sheets of all worlds,
+    worlds are listed with the hash of their content.
+    """
+    WORLD_TABLE = "Worlds"
+    SHEET_TABLE = "Sheets"
+    WORLD_COLUMN = "World"
+    SHEET_COLUMN = "Sheet"
+    SHEET_COLUMNS_COLUMN = "Columns"
+    HASH_COLUMN = "ContentHash"
+    ROW_COLUMN = "SheetRow"
+    REGION_COLUMN = "RegionCode"
+    COMMODITY_COLUMN = "CommodityCode"
+    PERIOD_COLUMN = "Period"
 
 
 class Shifter(Enum):
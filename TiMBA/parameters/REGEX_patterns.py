@@ -1,3 +1,4 @@
 import re
 
 PERIOD_PATTERN = re.compile(r"PERIOD(\d+)x(\d+)")
+UNNAMED_COLUMN_PATTERN = re.compile(r"Unnamed: (\d+)")
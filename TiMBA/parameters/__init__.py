@@ -13,6 +13,7 @@ from .paths import (
     PKL_WORLD_PATH,
     PKL_ADD_INFO_PATH,
     PKL_WORLDPRICE_PATH,
+    INPUT_CACHE_PATH,
     PKL_OUTPUT_PATH,
     RESULTS_OUTPUT,
     RESULTS_OUTPUT_AGG,
@@ -31,6 +32,7 @@ WORLDPRICE_PATH = path.abspath(path.join(*Path(__file__).parts[:-2], WORLDPRICE_
 PKL_WORLD_PATH = path.abspath(path.join(*Path(__file__).parts[:-2], PKL_WORLD_PATH))
 PKL_ADD_INFO_PATH = path.abspath(path.join(*Path(__file__).parts[:-2], PKL_ADD_INFO_PATH))
 PKL_WORLDPRICE_PATH = path.abspath(path.join(*Path(__file__).parts[:-2], PKL_WORLDPRICE_PATH))
+INPUT_CACHE_PATH = path.abspath(path.join(*Path(__file__).parts[:-2], INPUT_CACHE_PATH))
 RESULTS_OUTPUT = path.abspath(path.join(*Path(__file__).parts[:-2], RESULTS_OUTPUT))
 RESULTS_OUTPUT_AGG = path.abspath(path.join(*Path(__file__).parts[:-2], RESULTS_OUTPUT_AGG))
 FOREST_OUTPUT = path.abspath(path.join(*Path(__file__).parts[:-2], FOREST_OUTPUT))
@@ -78,6 +80,31 @@ def get_pkl_paths(output_path: Union[str, Path, None]) -> Tuple[str, str, str]:
         return pkl_world_path, pkl_add_info_path, pkl_worldprice_path
 
 
+def get_input_cache_path(output_path: Union[str, Path, None]) -> str:
+    """
+    Returns path of the cache for preprocessed input data based on user input.
+    :param output_path: Folderpath given by user
+    :return: path of the input cache directory
+    """
+    if output_path is None:
+        return INPUT_CACHE_PATH
+    else:
+        return os.path.join(output_path, *Path(INPUT_CACHE_PATH).parts[-2:])
+
+
+def get_world_name(world_version: str) -> str:
+    """
+    Name of the input world from the name of the world file (world.xlsx), world directory (one csv file per sheet) or
+    world in a SQLite database (worlds.sqlite/world).
+    :param world_version: Name of the world file or directory
+    :return: name of the world
+    """
+    world_name = os.path.basename(world_version)
+    if world_name.lower().endswith(".xlsx"):
+        return world_name[:-len(".xlsx")]
+    return world_name
+
+
 def get_global_paths(output_path: Union[str, Path, None], worldversion: str) -> Tuple[str, str, str]:
     """
     Returns correct paths for files based on user input.
@@ -128,6 +155,7 @@ def get_output_paths(package_dir, time_stamp: str, sc_name: str, PKL_OUTPUT_PATH
 __all__ = [
     "get_results_writer",
     "get_global_paths",
+    "get_world_name",
     "INPUT_WORLD_PATH",
     "ADDITIONAL_INFORMATION_PATH",
     "WORLDPRICE_PATH",
@@ -47,6 +47,16 @@ domains_to_align_list = [
     Domains.ExogChangeManufactureCoefficients
 ]
 
+exog_change_domains_list = [
+    Domains.ExogChangeDemand,
+    Domains.ExogChangeSupply,
+    Domains.ExogChangeForest,
+    Domains.ExogChangeTradeExport,
+    Domains.ExogChangeTradeImport,
+    Domains.ExogChangeManufactureCost,
+    Domains.ExogChangeManufactureCoefficients
+]
+
 domains_to_optimize_list = [
     Domains.Demand,
     Domains.TransportationExport,
@@ -9,6 +9,7 @@ WORLDPRICE_PATH = r"data/input/02_Additional_Information/worldprice_world500.xls
 PKL_WORLD_PATH = r"data/input/03_Serialization/WorldDataContent.pkl"
 PKL_ADD_INFO_PATH = r"data/input/03_Serialization/AddInfoContent.pkl"
 PKL_WORLDPRICE_PATH = r"data/input/03_Serialization/WorldPriceContent.pkl"
+INPUT_CACHE_PATH = r"data/input/03_Serialization/cache/"
 PKL_OUTPUT_PATH = "E:\\GFPM\\Toolbox for TiMBA\\Archive\\BEPASO_results_with_TiMBA\\"
 
 # output
@@ -17,6 +18,8 @@ RESULTS_OUTPUT_AGG = "data/output/results_aggregated_D"
 FOREST_OUTPUT = "data/output/forest_D"
 WORLD_PRICE_OUTPUT = "data/output/world_prices_D"
 MANUFACTURE_OUTPUT = "data/output/manufacture_D"
+PERIOD_OUTPUT = "data/output/periods_D"
+MONTE_CARLO_OUTPUT = "data/output/montecarlo_D"
 LOGGING_OUTPUT_FOLDER = r"data/output"
 
 # plot
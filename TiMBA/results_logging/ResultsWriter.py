@@ -1,5 +1,7 @@
 from TiMBA.results_logging.FileBaseclass import FileBaseclass
+import pandas as pd
 import csv
+import os
 
 
 class ResultsWriter(FileBaseclass):  # FileBaseclass variables are read in
@@ -39,3 +41,74 @@ class ResultsWriter(FileBaseclass):  # FileBaseclass variables are read in
             log = csv.writer(filestream, delimiter=self.sep)
             for _ in zip(*args):
                 log.writerow(_)
+
+    def write_frame(self, data: pd.DataFrame):
+        """
+        Appends a DataFrame to the file in one buffered write. The column names are only written to an empty file. The
+        data is flushed to disk before returning, so that appended data remain on disk if the run fails afterwards.
+        Example:
+            Writer = ResultsWriter(r"<filepath_to_csv>", True)
+            Writer.write_frame(period_data)
+        """
+        with open(self.filepath, mode="a", newline='') as filestream:
+            data.to_csv(filestream, sep=self.sep, index=False, header=(os.path.getsize(self.filepath) == 0))
+            filestream.flush()
+            os.fsync(filestream.fileno())
+
+
+class PeriodResultsWriter:
+    """
+    Writes the output tables of the model (optimization results, forest, manufacturing and world prices) period by
+    period into one csv file per table, appending each period as soon as it is stored. A completion marker is written
+    after the last period, so that output of runs which stopped early can be recognised and still be used. Writing
+    does not release the periods from memory: the stored periods (PeriodResults) are still needed for the output saved
+    at the end of the run.
+    """
+    COMPLETION_MARKER = "_COMPLETE"
+    OUTPUT_TABLES = ("results", "forest", "manufacture", "world_prices")
+    PERIOD_COLNAME = "Period"
+
+    def __init__(self, output_dir: str, resume_period: int = None):
+        """
+        :param output_dir: directory of the output tables (existing output tables are overwritten)
+        :param resume_period: keep the periods of existing output tables up to this period (run resumed from a
+        checkpoint of the period)
+        """
+        self.output_dir = output_dir
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.marker_path = os.path.join(self.output_dir, self.COMPLETION_MARKER)
+        self.writers = {}
+        self.written_periods = []
+        for table in self.OUTPUT_TABLES:
+            table_path = os.path.join(self.output_dir, f"{table}.csv")
+            if os.path.exists(table_path):
+                if resume_period is None:
+                    os.remove(table_path)
+                else:
+                    table_data = pd.read_csv(table_path)
+                    table_data = table_data[table_data[self.PERIOD_COLNAME] <= resume_period]
+                    table_data.to_csv(table_path, index=False)
+                    self.written_periods = sorted(table_data[self.PERIOD_COLNAME].unique().tolist())
+            self.writers[table] = ResultsWriter(table_path, overwrite_file=True)
+        if os.path.exists(self.marker_path):
+            os.remove(self.marker_path)
+
+    def write_period(self, period_output: dict, period: int):
+        """
+        Append the output tables of a period.
+        :param period_output: dict with the output tables of the period (see DataManager.get_period_output)
+        :param period: number of the period
+        """
+        for table, writer in self.writers.items():
+            writer.write_frame(period_output[table])
+        self.written_periods.append(period)
+
+    def complete(self):
+        """
+        Write the completion marker with the periods written.
+        """
+        with open(self.marker_path, mode="w") as marker:
+            marker.write(",".join(str(period) for period in self.written_periods) + "\n")
+
+    def is_complete(self) -> bool:
+        return os.path.exists(self.marker_path)
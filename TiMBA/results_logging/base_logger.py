@@ -6,9 +6,15 @@ import logging
 from TiMBA.parameters import LOGGING_OUTPUT_FOLDER
 
 
-def get_logger(user_path: Union[str, Path, None]):
+def get_logger(user_path: Union[str, Path, None], world_name: str = None):
+    """
+    Logger of TiMBA writing to the log file of the day and the console. With a world name, the logger of the world
+    writes to its own log file (used for worlds computed in parallel processes).
+    :param user_path: Folderpath given by user
+    :param world_name: name of the world computed with the logger
+    """
     current_dt = dt.datetime.now().strftime("%Y%m%d")
-    filename = rf"{current_dt}_TiMBA.log"
+    filename = rf"{current_dt}_TiMBA.log" if world_name is None else rf"{current_dt}_TiMBA_{world_name}.log"
 
     if user_path is None:
         filepath = os.path.join(LOGGING_OUTPUT_FOLDER, filename)
@@ -17,7 +23,9 @@ def get_logger(user_path: Union[str, Path, None]):
     if not os.path.exists(filepath):
         os.makedirs(Path(filepath).parent, exist_ok=True)
 
-    Logger = logging.getLogger("TiMBA")
+    Logger = logging.getLogger("TiMBA" if world_name is None else f"TiMBA.{world_name}")
+    if world_name is not None:
+        Logger.propagate = False
     if not Logger.hasHandlers():
         Logger.setLevel(logging.DEBUG)
         formatter = logging.Formatter(
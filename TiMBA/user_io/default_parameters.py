@@ -9,7 +9,20 @@ default_MB = "C_specific_MB"  # possibilities:"RC_specific_MB"(= region and comm
 
 default_transportation_impexp_factor = 1
 
-serialization_flag = False  # if true read data from stored pkl files
+default_optimization_backend = "cvxpy"  # possibilities: "cvxpy" (= optimization problem rebuilt in each period,
+#                                                         no warm start),
+#                                                        "osqp" (= sparse problem data assembled and solved directly
+#                                                         with osqp, warm started from the previous period)
+
+default_dynamization_backend = "pandas"  # possibilities: "pandas" (= dynamization functions of model_helpers),
+#                                                         "numpy" (= fused numpy dynamization kernel with the same
+#                                                          results, for many repeated runs)
+
+default_read_workers = 1  # number of processes parsing the input sheets in parallel (1 = sequential read-in)
+default_jobs = 1  # number of worlds computed in parallel processes (1 = worlds computed one after another)
+
+checkpoint_flag = False  # if true the state of the run is saved after each period (resume with --resume-from)
+serialization_flag = False  # if true read data from stored pkl files (input cache keyed by the input files)
 constants = [False, False, False]  # [constant prices, constant slopes, constant intercep] (Only default options were validated extensively)
 dynamization_activated = True
 capped_prices = False # (Only default option was validated extensively)
@@ -22,7 +35,9 @@ test_timba_results = True  # activate unittest to compare TiMBA results with val
 
 user_input = {"year": default_year, "max_period": default_max_period, "product_price": default_calc_product_price,
               "world_price": default_calc_world_price, "transportation_factor": default_transportation_impexp_factor,
-              "material_balance": default_MB, "serialization": serialization_flag, "constants": constants,
+              "material_balance": default_MB, "optimization_backend": default_optimization_backend,
+              "dynamization_backend": default_dynamization_backend, "read_workers": default_read_workers,
+              "serialization": serialization_flag, "checkpoint": checkpoint_flag, "constants": constants,
               "dynamization_activated": dynamization_activated, "capped_prices": capped_prices,
               "cleaned_opt_quantity": cleaned_opt_quantity, "global_material_balance": global_material_balance,
               "verbose_optimization_logger": verbose_optimization_logger,
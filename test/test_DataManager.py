@@ -0,0 +1,329 @@
+import os
+import unittest
+import tempfile
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from TiMBA.parameters import PKL_WORLD_PATH, ADDITIONAL_INFORMATION_PATH, WORLDPRICE_PATH
+from TiMBA.parameters.Defines import InputFormat, VarNames
+from TiMBA.parameters.Domains import Domains
+from TiMBA.data_management.DataManager import DataManager
+from TiMBA.data_management.DataContainer import DataContainer
+from TiMBA.results_logging.ResultsWriter import PeriodResultsWriter
+from TiMBA.helpers.utils import DomainIterator
+from TiMBA.logic.model_helpers import extract_product_groups
+
+
+class TestReadExcel(unittest.TestCase):
+
+    def test_read_excel_sheets(self):
+        add_info_sheets = DataManager.read_excel(ADDITIONAL_INFORMATION_PATH, None)
+        sheet_names = list(add_info_sheets)[:2]
+        selected_sheets = DataManager.read_excel(ADDITIONAL_INFORMATION_PATH, sheet_names)
+
+        self.assertEqual(list(selected_sheets), sheet_names)
+        for sheet_name in sheet_names:
+            sheet_data = DataManager.read_excel(ADDITIONAL_INFORMATION_PATH, sheet_name)
+            self.assertTrue(sheet_data.equals(add_info_sheets[sheet_name]))
+            self.assertTrue(sheet_data.equals(selected_sheets[sheet_name]))
+
+    def test_read_sheets(self):
+        sheet_names = DataManager.get_sheet_names(ADDITIONAL_INFORMATION_PATH)
+        read_tasks = [(ADDITIONAL_INFORMATION_PATH, sheet_name, None) for sheet_name in sheet_names]
+        read_tasks.append((WORLDPRICE_PATH, InputFormat.WORLD_PRICE_SHEET.value, None))
+        add_info_sheets = DataManager.read_excel(ADDITIONAL_INFORMATION_PATH, None)
+        parallel_sheets = DataManager.read_sheets(read_tasks, read_workers=2)
+
+        self.assertEqual(sheet_names, list(add_info_sheets))
+        for sheet_name, sheet_data in zip(sheet_names, parallel_sheets):
+            pd.testing.assert_frame_equal(sheet_data, add_info_sheets[sheet_name])
+        pd.testing.assert_frame_equal(parallel_sheets[-1],
+                                      DataManager.read_excel(WORLDPRICE_PATH, InputFormat.WORLD_PRICE_SHEET.value))
+
+    def test_read_excel_read_plan(self):
+        read_plan = dict(DomainIterator.get_domain_read_plan(DomainIterator.MAIN_DOMAINS))
+        supply_columns = list(Domains.Supply.header_description)
+        supply_sheet = pd.DataFrame([[1] * (len(supply_columns) + 3)],
+                                    columns=supply_columns + ["Unnamed: 15", "Notes", "Unnamed: 17"])
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            filepath = f"{tmp_dir}/world.xlsx"
+            with pd.ExcelWriter(filepath) as writer:
+                supply_sheet.to_excel(writer, sheet_name=str(Domains.Supply), index=False)
+                supply_sheet.to_excel(writer, sheet_name=str(Domains.Specification), index=False)
+            world_sheets = DataManager.read_excel(filepath, [str(Domains.Supply), str(Domains.Specification)],
+                                                  read_plan)
+
+        self.assertEqual(read_plan[str(Domains.Specification)], {})
+        self.assertEqual(list(world_sheets[str(Domains.Supply)].columns), supply_columns + ["Notes"])
+        self.assertEqual(list(world_sheets[str(Domains.Specification)].columns), list(supply_sheet.columns))
+
+    def test_read_csv_sheets(self):
+        supply_columns = list(Domains.Supply.header_description)
+        supply_sheet = pd.DataFrame(
+            [["Description"] * len(supply_columns), ["="] + [None] * (len(supply_columns) - 1),
+             ["a0", "Algeria", 78, 1.5, None] + [3] * (len(supply_columns) - 5),
+             ["NA", "Namibia", 79, 2.5, 4.0] + [5] * (len(supply_columns) - 5)], columns=supply_columns)
+        specification_sheet = pd.DataFrame({"Region Code": ["a0", "a1"], "Property Name": ["Base Year", None],
+                                            "Property Value": [2020, None], "Mixed": ["x", 2]})
+        sheet_names = [str(Domains.Supply), str(Domains.Specification)]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            world_dirpath = f"{tmp_dir}/world"
+            os.makedirs(world_dirpath)
+            with pd.ExcelWriter(f"{tmp_dir}/world.xlsx") as writer:
+                for sheet_name, sheet in zip(sheet_names, [supply_sheet, specification_sheet]):
+                    sheet.to_excel(writer, sheet_name=sheet_name, index=False)
+                    sheet.to_csv(f"{world_dirpath}/{sheet_name}.csv", index=False)
+            excel_sheets = DataManager.read_excel(f"{tmp_dir}/world.xlsx", sheet_names)
+            csv_sheets = DataManager.load_data(world_dirpath, None, DataManager.get_input_source(world_dirpath))
+
+        self.assertEqual(DataManager.get_input_source(f"{tmp_dir}/world.xlsx"), "Excel")
+        self.assertEqual(sorted(csv_sheets), sorted(sheet_names))
+        for sheet_name in sheet_names:
+            pd.testing.assert_frame_equal(csv_sheets[sheet_name], excel_sheets[sheet_name])
+            pd.testing.assert_frame_equal(csv_sheets[sheet_name].applymap(type),
+                                          excel_sheets[sheet_name].applymap(type))
+
+    def test_load_table(self):
+        supply_columns = list(Domains.Supply.header_description)
+        supply_sheet = pd.DataFrame(
+            [["Description"] * len(supply_columns), ["="] + [None] * (len(supply_columns) - 1),
+             ["a0", 78, 1.5, None] + [3] * (len(supply_columns) - 4),
+             ["a1", 79, 2.5, 4.0] + [5] * (len(supply_columns) - 4)], columns=supply_columns)
+        exog_change_sheet = pd.DataFrame(
+            [["Description", None, None, None], ["=", None, None, None], ["PERIOD1x5", None, None, None],
+             ["S", "a0", None, 78], ["S", "a1", None, 79], ["PERIOD2x5", None, None, None], ["S", "a0", None, 78]],
+            columns=["****** EXOGENOUS CHANGE ******", "Unnamed: 1", "Unnamed: 2", "Unnamed: 3"])
+        sheet_names = [str(Domains.Supply), str(Domains.ExogChange)]
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            world_dirpath = f"{tmp_dir}/world"
+            os.makedirs(world_dirpath)
+            for sheet_name, sheet in zip(sheet_names, [supply_sheet, exog_change_sheet]):
+                sheet.to_csv(f"{world_dirpath}/{sheet_name}.csv", index=False)
+            DataManager.write_table(world_dirpath, f"{tmp_dir}/worlds.sqlite")
+            DataManager.write_table(world_dirpath, f"{tmp_dir}/worlds.sqlite", world="world_copy")
+            DataManager.write_table(world_dirpath, f"{tmp_dir}/worlds.sqlite")
+
+            sql_world_path = f"{tmp_dir}/worlds.sqlite/world"
+            csv_sheets = DataManager.read_csv(world_dirpath, sheet_names)
+            sql_sheets = DataManager.load_data(sql_world_path, sheet_names,
+                                               DataManager.get_input_source(sql_world_path))
+            partial_exog_change = DataManager.load_table(sql_world_path, str(Domains.ExogChange), max_period=1,
+                                                         regions=["a0"])
+            partial_supply = DataManager.load_table(sql_world_path, str(Domains.Supply), commodities=[79])
+
+            self.assertEqual(sorted(DataManager.get_input_worlds(tmp_dir)),
+                             ["world", "worlds.sqlite/world", "worlds.sqlite/world_copy"])
+            self.assertTrue(DataManager.input_exists(sql_world_path))
+            self.assertFalse(DataManager.input_exists(f"{tmp_dir}/worlds.sqlite/world_missing"))
+
+        for sheet_name in sheet_names:
+            pd.testing.assert_frame_equal(sql_sheets[sheet_name], csv_sheets[sheet_name])
+        self.assertEqual(list(partial_exog_change.iloc[:, 0]), ["Description", "=", "PERIOD1x5", "S"])
+        self.assertEqual(list(partial_exog_change.iloc[:, 1].dropna()), ["a0"])
+        self.assertEqual(list(partial_supply.iloc[2:, 1]), [79])
+
+
+class TestIOMatrix(unittest.TestCase):
+    WorldDataCont = DataManager.restore_from_pickle(PKL_WORLD_PATH)
+
+    def test_create_io_matrix(self):
+        io_matrix = np.array(self.WorldDataCont.ManufactureCoefficients.ioMatrix)
+        io_matrix_short = np.array(self.WorldDataCont.ManufactureCoefficients.ioMatrixshort)
+        DataManager.create_io_matrix(self.WorldDataCont, update=True, default_io=False)
+
+        self.assertTrue(sp.issparse(self.WorldDataCont.ManufactureCoefficients.ioMatrix))
+        np.testing.assert_array_equal(self.WorldDataCont.ManufactureCoefficients.ioMatrix.toarray(), io_matrix)
+        np.testing.assert_array_equal(self.WorldDataCont.ManufactureCoefficients.ioMatrixshort.toarray(),
+                                      io_matrix_short)
+
+
+class TestAlign(unittest.TestCase):
+    WorldDataCont = DataManager.restore_from_pickle(PKL_WORLD_PATH)
+
+    def test_align_df_exog_change(self):
+        exog_change = self.WorldDataCont.ExogChangeDemand
+        base_matrix = self.WorldDataCont.data_aligned
+        periods = sorted(set(exog_change.data["Period"]))
+        for domain_name in DomainIterator.get_domain_names(DomainIterator.ALIGN_DOMAINS):
+            del self.WorldDataCont[domain_name].data_aligned
+        DataManager.align_df(self.WorldDataCont)
+
+        self.assertEqual(len(exog_change.data_aligned), len(periods) * len(base_matrix))
+        for period_block, period in enumerate(periods):
+            period_data = exog_change.data[exog_change.data["Period"] == period]
+            period_aligned = base_matrix.merge(
+                period_data, left_on=[Domains.Regions.region_code, Domains.Commodities.commodity_code],
+                right_on=[Domains.ExogChangeDemand.region_code, Domains.ExogChangeDemand.commodity_code], how="left")
+            period_aligned["Period"] = period_aligned["Period"].fillna(period)
+            period_aligned["ForecastYears"] = period_aligned["ForecastYears"].fillna(
+                period_data["ForecastYears"].iloc[0])
+            block = exog_change.data_aligned.iloc[period_block * len(base_matrix):
+                                                  (period_block + 1) * len(base_matrix)].reset_index(drop=True)
+            pd.testing.assert_frame_equal(block, period_aligned)
+
+
+class TestExogChangeTensor(unittest.TestCase):
+    WorldDataCont = DataManager.restore_from_pickle(PKL_WORLD_PATH)
+    DataManager.migrate_forest_layout(WorldDataCont)
+
+    def test_create_exog_change_tensor(self):
+        DataManager.create_exog_change_tensor(self.WorldDataCont)
+        for domain_name in DomainIterator.get_domain_names(DomainIterator.EXOG_CHANGE_DOMAINS):
+            exog_change = self.WorldDataCont[domain_name]
+            num_periods = exog_change.data_aligned["Period"].nunique()
+            fields = DataManager.get_exog_change_fields(exog_change)
+
+            self.assertEqual(exog_change.data_tensor.shape,
+                             (num_periods, len(exog_change.data_aligned) // num_periods, len(fields)))
+            for column_name, field in fields.items():
+                self.assertTrue(np.shares_memory(field, exog_change.data_tensor))
+                column_num = list(exog_change.data_aligned.columns).index(column_name)
+                np.testing.assert_array_equal(
+                    field.reshape(-1), np.array(exog_change.data_aligned.iloc[:, column_num], dtype=float))
+        self.assertIn(Domains.ExogChangeDemand.growth_rate_value,
+                      self.WorldDataCont.ExogChangeDemand.tensor_fields)
+
+
+class TestPeriodResults(unittest.TestCase):
+
+    def test_update_period_data(self):
+        container = DataContainer("results")
+        period_data = []
+        for period in range(3):
+            container.data = pd.DataFrame({"quantity": np.arange(4) * (period + 1), "domain": list("abcd")})
+            if period > 0:
+                container.data["growth"] = 0.1 * period
+            DataManager.update_period_data(container, period, accessor="data", num_periods=2)
+            period_data.append(container.data.copy())
+            container.data["quantity"] = -1
+
+        pd.testing.assert_frame_equal(container.data_periods,
+                                      pd.concat(period_data, axis=0).reset_index(drop=True))
+        self.assertEqual(container.period_results.get_periods(), [0, 1, 2])
+        pd.testing.assert_frame_equal(container.period_results.get_period(1), period_data[1])
+        self.assertIs(container.data_periods, container.data_periods)
+
+        container.data = period_data[0].drop(columns="Period")
+        DataManager.update_period_data(container, 0, accessor="data", num_periods=2)
+        self.assertEqual(container.period_results.get_periods(), [0])
+        with self.assertRaises(KeyError):
+            container.period_results.get_period(1)
+
+    def test_base_period_forest_output(self):
+        forest = DataContainer("forest")
+        forest.data_aligned = pd.DataFrame({
+            Domains.Forest.region_code: ["a", "b"], Domains.Forest.forest_stock: [1.0, 2.0],
+            Domains.Forest.forest_area: [3.0, 4.0], Domains.Forest.gdp_per_capita_base_period: [5.0, 6.0],
+            Domains.Forest.alpha: 0.1, Domains.Forest.gamma: 0.2, Domains.Forest.fraction_fuelwood: 0.5})
+        DataManager.update_period_data(forest, 0, accessor="data_aligned", num_periods=2)
+        # Columns of the dynamization only exist from the first period on
+        base_period_output = DataManager.select_forest_output(forest.period_results.get_period(0))
+        self.assertTrue(base_period_output[[Domains.Forest.periodic_growth_rate_of_forest_area,
+                                            Domains.Forest.forest_growth_without_harvest,
+                                            Domains.Forest.supply_from_forest]].isna().all(axis=None))
+
+        forest.data_aligned[Domains.Forest.periodic_growth_rate_of_forest_area] = 0.01
+        forest.data_aligned[Domains.Forest.forest_growth_without_harvest] = 0.02
+        forest.data_aligned[Domains.Forest.supply_from_forest] = 7.0
+        DataManager.update_period_data(forest, 1, accessor="data_aligned", num_periods=2)
+        pd.testing.assert_frame_equal(
+            DataManager.select_forest_output(forest.data_periods),
+            pd.concat([base_period_output, DataManager.select_forest_output(forest.period_results.get_period(1))])
+            .reset_index(drop=True))
+
+    def test_period_results_writer(self):
+        period_data = [pd.DataFrame({"Period": period, "quantity": np.arange(3) * (period + 1.5)})
+                       for period in range(2)]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            for run in range(2):
+                writer = PeriodResultsWriter(tmp_dir)
+                for period, data in enumerate(period_data):
+                    writer.write_period({table: data for table in PeriodResultsWriter.OUTPUT_TABLES}, period)
+                    self.assertFalse(writer.is_complete())
+                    pd.testing.assert_frame_equal(pd.read_csv(os.path.join(tmp_dir, "forest.csv")),
+                                                  pd.concat(period_data[:period + 1]).reset_index(drop=True))
+                writer.complete()
+                self.assertTrue(writer.is_complete())
+                self.assertEqual(writer.written_periods, [0, 1])
+
+
+def reference_fuelwood_forest_param(WorldData):
+    """
+    Per-region, per-commodity loop of former versions of DataManager.update_fuelwood_forest_param (values are
+    collected cell by cell).
+    :return: aligned fraction_fuelwood
+    """
+    (raw_prod, interm_prod, fin_prod, fuelw, othindrnd) = extract_product_groups(
+        world_data=WorldData, commodity_data=WorldData.Commodities, region_data=WorldData.Regions,
+        all_regions=False, only_commodity_codes=True)
+    list_raw_material = sorted(list(set(
+        WorldData.Supply.data[(WorldData.Supply.data[Domains.Supply.region_code] != VarNames.ZY_REGION.value) &
+                              (WorldData.Supply.data[Domains.Supply.commodity_code] <= othindrnd)]
+        [Domains.Supply.commodity_code])))
+
+    index_fuelwood = WorldData.data_aligned[WorldData.data_aligned[Domains.Commodities.commodity_code] == fuelw].index
+    raw_material_from_forest = pd.concat([pd.DataFrame(index_fuelwood).rename(columns={0: "IndexFuelwood"}),
+                                         WorldData.Forest.data[Domains.Forest.fraction_fuelwood]], axis=1).fillna(0)
+    raw_material_from_forest = WorldData.data_aligned.reset_index().merge(
+        raw_material_from_forest, left_on=["index"], right_on=["IndexFuelwood"], how="left")
+
+    fraction_fuelwood = []
+    for region in WorldData.Regions.data[Domains.Regions.region_code]:
+        for commodity in WorldData.Commodities.data[Domains.Commodities.commodity_code]:
+            temporary_var = raw_material_from_forest[
+                (raw_material_from_forest[Domains.Regions.region_code] == region) &
+                (raw_material_from_forest[Domains.Commodities.commodity_code] == commodity)]
+            fill_value = 1 if commodity in list_raw_material else 0
+            fraction_fuelwood.append(float(temporary_var[Domains.Forest.fraction_fuelwood].fillna(fill_value).item()))
+    return np.array(fraction_fuelwood)
+
+
+class TestForest(unittest.TestCase):
+    WorldDataCont = DataManager.restore_from_pickle(PKL_WORLD_PATH)
+    DataManager.migrate_forest_layout(WorldDataCont)
+
+    def test_migrate_forest_layout(self):
+        # Serialized input data of former versions (forest rows replicated for each commodity)
+        world_data = DataManager.restore_from_pickle(PKL_WORLD_PATH)
+        replicated_forest = world_data.Forest.data_aligned.copy()
+        self.assertTrue(replicated_forest[Domains.Forest.region_code].duplicated().any())
+
+        DataManager.migrate_forest_layout(world_data)
+        forest_data = world_data.Forest.data_aligned
+        self.assertEqual(len(forest_data), forest_data[Domains.Forest.region_code].nunique())
+        self.assertFalse(world_data.ExogChangeForest.data_aligned.duplicated(
+            [Domains.ExogChangeForest.region_code, "Period"]).any())
+        for column in [Domains.Forest.forest_stock, Domains.Forest.ratio_inventory_drain]:
+            np.testing.assert_array_equal(DataManager.get_forest_aligned(world_data, column)[:len(replicated_forest)],
+                                          np.array(replicated_forest[column], dtype=float))
+        np.testing.assert_array_equal(world_data.Forest.fraction_fuelwood_aligned,
+                                      self.WorldDataCont.Forest.fraction_fuelwood_aligned)
+
+    def test_get_forest_aligned(self):
+        forest_data = self.WorldDataCont.Forest.data_aligned
+        region_vector = np.array(self.WorldDataCont.data_aligned[Domains.Regions.region_code])
+        forest_stock = DataManager.get_forest_aligned(self.WorldDataCont, Domains.Forest.forest_stock)
+
+        self.assertEqual(len(forest_data), forest_data[Domains.Forest.region_code].nunique())
+        self.assertEqual(len(forest_stock), len(region_vector))
+        for region, region_stock in zip(forest_data[Domains.Forest.region_code], forest_data[Domains.Forest.forest_stock]):
+            np.testing.assert_array_equal(forest_stock[region_vector == region], float(region_stock))
+        self.assertFalse(np.any(forest_stock[~np.isin(region_vector, forest_data[Domains.Forest.region_code])]))
+
+    def test_update_fuelwood_forest_param(self):
+        DataManager.update_fuelwood_forest_param(self.WorldDataCont)
+        region_vector = np.array(self.WorldDataCont.data_aligned[Domains.Regions.region_code])
+        zy_select = region_vector == VarNames.ZY_REGION.value
+        fraction_fuelwood = self.WorldDataCont.Forest.fraction_fuelwood_aligned
+        reference_fraction_fuelwood = reference_fuelwood_forest_param(self.WorldDataCont)
+
+        # The zy-region is not harvested (former versions set 1 for its raw materials)
+        np.testing.assert_array_equal(fraction_fuelwood[~zy_select], reference_fraction_fuelwood[~zy_select])
+        self.assertFalse(np.any(fraction_fuelwood[zy_select]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import logging
+import unittest
+from types import SimpleNamespace
+import numpy as np
+
+from TiMBA.parameters import PKL_WORLD_PATH
+from TiMBA.parameters.Defines import VarNames
+from TiMBA.parameters.Domains import Domains
+from TiMBA.data_management.DataManager import DataManager
+from TiMBA.logic.dynamization_kernel import DynamizationKernel
+from TiMBA.logic.model_helpers import (dynamize_demand, dynamize_supply, dynamize_manufacturing_cost,
+                                       dynamize_manufacturing_coeff, dynamize_transportation, forest_param_alpha,
+                                       forest_param_gamma)
+
+DYNAMIZED_DOMAINS = ["Demand", "Supply", "Forest", "ManufactureCost", "ManufactureCoefficients",
+                     "TransportationExport", "TransportationImport"]
+
+
+def restore_world_data():
+    world_data = DataManager.restore_from_pickle(PKL_WORLD_PATH)
+    DataManager.migrate_forest_layout(world_data)
+    DataManager.create_exog_change_tensor(world_data)
+    world_data.Forest.data_aligned["alpha"] = forest_param_alpha(ForestData=world_data.Forest.data_aligned)
+    world_data.Forest.data_aligned["gamma"] = forest_param_gamma(ForestData=world_data.Forest.data_aligned)
+    world_data.TransportationImport.data_aligned[VarNames.TRANSPORT_COSTS.value] = 1.0
+    return world_data
+
+
+def pandas_dynamization(world_data, period_info: dict, logger: logging.Logger):
+    dynamize_demand(Data=world_data.Demand.data_aligned,
+                    DataChange=DataManager.get_exog_change_fields(world_data.ExogChangeDemand),
+                    period_info=period_info)
+    dynamize_supply(SimpleNamespace(Data=world_data),
+                    Data=world_data.Supply.data_aligned,
+                    DataChange=DataManager.get_exog_change_fields(world_data.ExogChangeSupply),
+                    DataForest=world_data.Forest.data_aligned,
+                    DataForestChange=DataManager.get_exog_change_fields(world_data.ExogChangeForest),
+                    Logger=logger,
+                    period_info=period_info)
+    dynamize_manufacturing_cost(Data=world_data.ManufactureCost.data_aligned,
+                                DataChange=DataManager.get_exog_change_fields(world_data.ExogChangeManufactureCost),
+                                period_info=period_info)
+    dynamize_manufacturing_coeff(Data=world_data.ManufactureCoefficients.data_aligned,
+                                 DataChange=DataManager.get_exog_change_fields(
+                                     world_data.ExogChangeManufactureCoefficients),
+                                 period_info=period_info)
+    dynamize_transportation(DataExport=world_data.TransportationExport.data_aligned,
+                            DataImport=world_data.TransportationImport.data_aligned,
+                            DataExportChange=DataManager.get_exog_change_fields(world_data.ExogChangeTradeExport),
+                            DataImportChange=DataManager.get_exog_change_fields(world_data.ExogChangeTradeImport),
+                            period_info=period_info)
+
+
+class TestDynamizationKernel(unittest.TestCase):
+    PandasWorldData = restore_world_data()
+    NumpyWorldData = restore_world_data()
+
+    def test_kernel_equals_pandas_dynamization(self):
+        logger = logging.getLogger("TestDynamizationKernel")
+        logger.addHandler(logging.NullHandler())
+        kernel = DynamizationKernel(self.NumpyWorldData)
+        period_infos = [{"present": 2, "length": 1, "block": 1, "year": 2021},
+                        {"present": 3, "length": 1, "block": 2, "year": 2022},
+                        {"present": 7, "length": 5, "block": 6, "year": 2030}]
+
+        for period_info in period_infos:
+            pandas_dynamization(self.PandasWorldData, period_info=period_info, logger=logger)
+            kernel.dynamize(period_info=period_info, Logger=logger)
+            for domain_name in DYNAMIZED_DOMAINS:
+                pandas_data = self.PandasWorldData[domain_name].data_aligned
+                numpy_data = self.NumpyWorldData[domain_name].data_aligned
+                self.assertEqual(list(pandas_data.columns), list(numpy_data.columns))
+                for column_name in pandas_data.select_dtypes(exclude="object").columns.union(
+                        numpy_data.select_dtypes(exclude="object").columns):
+                    np.testing.assert_array_equal(np.array(numpy_data[column_name], dtype=float),
+                                                  np.array(pandas_data[column_name], dtype=float),
+                                                  err_msg=f"{domain_name} {column_name} {period_info}")
+
+
+class TestExogChangePeriodBlock(unittest.TestCase):
+    SHIFT_COLUMNS = [(Domains.Supply.elasticity_fourth, Domains.ExogChangeSupply.growth_rate_fourth_shift),
+                     (Domains.Supply.elasticity_fifth, Domains.ExogChangeSupply.growth_rate_fifth_shift),
+                     (Domains.Supply.elasticity_sixth, Domains.ExogChangeSupply.growth_rate_sixth_shift)]
+
+    def test_former_period_block_indexing(self):
+        # Exogenous change tensors keep the index alignment of former versions: growth of the demand lower bound is
+        # read from the first period block, supply shifts are NaN from the second period block on
+        logger = logging.getLogger("TestExogChangePeriodBlock")
+        logger.addHandler(logging.NullHandler())
+        period_info = {"present": 3, "length": 5, "block": 2, "year": 2030}
+
+        for dynamization_backend in ["pandas", "numpy"]:
+            with self.subTest(dynamization_backend=dynamization_backend):
+                world_data = restore_world_data()
+                demand_change = DataManager.get_exog_change_fields(world_data.ExogChangeDemand)
+                supply_change = DataManager.get_exog_change_fields(world_data.ExogChangeSupply)
+                # Annual growth rate of 1 % in the first period block, 2 % in the second block, ...
+                block_growth_rate = 0.01 * np.arange(1, len(demand_change[
+                    Domains.ExogChangeDemand.growth_lower_bound]) + 1).reshape(-1, 1)
+                demand_change[Domains.ExogChangeDemand.growth_lower_bound][:] = block_growth_rate
+                for _, growth_rate in self.SHIFT_COLUMNS:
+                    supply_change[growth_rate][:] = block_growth_rate
+
+                lower_bound = np.array(world_data.Demand.data_aligned[Domains.Demand.lower_bound], dtype=float)
+                if dynamization_backend == "pandas":
+                    pandas_dynamization(world_data, period_info=period_info, logger=logger)
+                else:
+                    DynamizationKernel(world_data).dynamize(period_info=period_info, Logger=logger)
+
+                np.testing.assert_allclose(
+                    np.array(world_data.Demand.data_aligned[Domains.Demand.lower_bound], dtype=float),
+                    lower_bound * 1.01 ** 5, rtol=1e-12)
+                for elasticity, _ in self.SHIFT_COLUMNS:
+                    self.assertTrue(np.isnan(np.array(world_data.Supply.data_aligned[elasticity], dtype=float)).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
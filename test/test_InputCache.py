@@ -0,0 +1,141 @@
+import os
+import time
+import unittest
+import tempfile
+import numpy as np
+import pandas as pd
+
+from TiMBA.parameters import PKL_WORLD_PATH
+from TiMBA.parameters.Domains import Domains
+from TiMBA.data_management.DataManager import DataManager
+from TiMBA.data_management.InputBundle import InputBundle
+from TiMBA.data_management.InputCache import InputCache
+from TiMBA.data_management.ModelCheckpoint import ModelCheckpoint
+from TiMBA.data_management.DataContainer import DataContainer
+
+
+class TestInputCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.input_filepath = os.path.join(self.tmp_dir.name, "world.xlsx")
+        with open(self.input_filepath, "wb") as input_file:
+            input_file.write(b"world")
+        self.cache = InputCache(os.path.join(self.tmp_dir.name, "cache"))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_key_invalidation(self):
+        key = InputCache.get_key([self.input_filepath])
+        self.assertEqual(key, InputCache.get_key([self.input_filepath]))
+        self.assertNotEqual(key, InputCache.get_key([self.input_filepath], parameters={"year": 2020}))
+
+        with open(self.input_filepath, "ab") as input_file:
+            input_file.write(b"changed")
+        self.assertNotEqual(key, InputCache.get_key([self.input_filepath]))
+
+    def test_store_restore(self):
+        key = InputCache.get_key([self.input_filepath])
+        self.assertIsNone(self.cache.restore(key))
+
+        self.cache.store(key, ({"world": 1}, {"add_info": 2}, {"world_price": 3}))
+        self.assertEqual(self.cache.restore(key), ({"world": 1}, {"add_info": 2}, {"world_price": 3}))
+
+    def test_store_atomic(self):
+        key = InputCache.get_key([self.input_filepath])
+        # Incomplete entry (e.g. of an interrupted process) and temporary directory of a concurrent process
+        os.makedirs(self.cache.get_entry_bundle_paths(key)[0])
+        os.makedirs(f"{self.cache.get_entry_path(key)}.0{InputCache.TMP_SUFFIX}")
+        self.assertIsNone(self.cache.restore(key))
+
+        self.cache.store(key, ({"world": 1}, {"add_info": 2}, {"world_price": 3}))
+        self.assertEqual(self.cache.restore(key), ({"world": 1}, {"add_info": 2}, {"world_price": 3}))
+        self.assertFalse(os.path.exists(f"{self.cache.get_entry_path(key)}.{os.getpid()}{InputCache.TMP_SUFFIX}"))
+
+        # Entry stored by another process is kept
+        self.cache.store(key, ({"world": 4}, {"add_info": 5}, {"world_price": 6}))
+        self.assertEqual(self.cache.restore(key), ({"world": 1}, {"add_info": 2}, {"world_price": 3}))
+        self.cache.max_size = 0
+        self.assertEqual(self.cache.evict(), [key])
+
+    def test_lru_eviction(self):
+        for key in ["a", "b", "c"]:
+            self.cache.store(key, ("x" * 1000, "", ""))
+        self.cache.max_size = 2 * self.cache.get_entry_size("a")
+        access_time = time.time()
+        for offset, key in enumerate(["b", "a", "c"]):
+            os.utime(self.cache.get_entry_path(key), (access_time + offset, access_time + offset))
+
+        self.assertEqual(self.cache.evict(keep_key="c"), ["b"])
+        self.assertIsNotNone(self.cache.restore("a"))
+        self.assertIsNone(self.cache.restore("b"))
+
+
+class TestInputBundle(unittest.TestCase):
+    WorldDataCont = DataManager.restore_from_pickle(PKL_WORLD_PATH)
+    DataManager.migrate_forest_layout(WorldDataCont)
+
+    def test_bundle_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            InputBundle.compile(self.WorldDataCont, tmp_dir)
+            world_data = InputBundle.restore(tmp_dir)
+
+            self.assertEqual(type(world_data), type(self.WorldDataCont))
+            self.assertEqual(vars(world_data).keys(), vars(self.WorldDataCont).keys())
+            self.assertEqual(world_data.periods_forecast, self.WorldDataCont.periods_forecast)
+            for domain_name in ["Demand", "Forest", "ExogChangeTradeImport"]:
+                pd.testing.assert_frame_equal(world_data[domain_name].data, self.WorldDataCont[domain_name].data)
+            pd.testing.assert_frame_equal(world_data.Supply.data_aligned, self.WorldDataCont.Supply.data_aligned)
+            self.assertTrue(world_data.Supply.data_aligned[self.WorldDataCont.Supply.data_aligned.columns[0]].equals(
+                self.WorldDataCont.Supply.data_aligned.iloc[:, 0]))
+
+            fraction_fuelwood = world_data.Forest.fraction_fuelwood_aligned
+            self.assertIsInstance(fraction_fuelwood, np.memmap)
+            np.testing.assert_array_equal(fraction_fuelwood, self.WorldDataCont.Forest.fraction_fuelwood_aligned)
+
+            # Columns are memory-mapped copy-on-write: modified by one process without changing the bundle
+            column = world_data.Supply.data_aligned[Domains.Supply.quantity].to_numpy()
+            column_base = column.base
+            while isinstance(column_base, np.ndarray) and not isinstance(column_base, np.memmap):
+                column_base = column_base.base
+            self.assertIsInstance(column_base, np.memmap)
+            world_data.Supply.data_aligned.loc[0, Domains.Supply.quantity] = -1
+            self.assertEqual(column[0], -1)
+            pd.testing.assert_frame_equal(InputBundle.restore(tmp_dir).Supply.data_aligned,
+                                          self.WorldDataCont.Supply.data_aligned)
+            del world_data, fraction_fuelwood, column, column_base
+
+
+
+class TestModelCheckpoint(unittest.TestCase):
+
+    def test_store_restore(self):
+        world_data = DataContainer("world")
+        world_data.data_aligned = pd.DataFrame({"quantity": np.arange(4, dtype=float), "Period": 1})
+        world_data.io_matrix = np.ones((2, 2))
+        world_data.OptimizationResults = DataContainer("optimization_results")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            checkpoint = ModelCheckpoint(tmp_dir, run_info={"world_version": "world.xlsx"})
+            self.assertEqual(checkpoint.get_periods(), [])
+            for period in range(3):
+                checkpoint.store(period, (world_data, {"add_info": 2}, {"world_price": 3}),
+                                 {"period": period, "warm_start": None})
+            self.assertEqual(checkpoint.get_periods(), [0, 1, 2])
+            self.assertIn("OptimizationResults", vars(world_data))
+
+            (restored_data, add_info, world_price), state = checkpoint.restore(1)
+            self.assertEqual(state, {"world_version": "world.xlsx", "period": 1, "warm_start": None})
+            self.assertNotIn("OptimizationResults", vars(restored_data))
+            pd.testing.assert_frame_equal(restored_data.data_aligned, world_data.data_aligned)
+            restored_data.io_matrix[0, 0] = 2
+            self.assertEqual(add_info, {"add_info": 2})
+
+            checkpoint.remove_following(1)
+            self.assertEqual(checkpoint.get_periods(), [0, 1])
+            with self.assertRaises(FileNotFoundError):
+                checkpoint.restore(2)
+
+
+if __name__ == '__main__':
+    unittest.main()
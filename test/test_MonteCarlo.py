@@ -0,0 +1,97 @@
+import unittest
+import numpy as np
+
+from TiMBA.parameters import PKL_WORLD_PATH
+from TiMBA.parameters.Domains import Domains
+from TiMBA.data_management.DataManager import DataManager
+from TiMBA.parameters.Defines import MonteCarloParameters
+from TiMBA.logic.monte_carlo import UncertainParameter, perturb_world_data, get_row_draws
+
+
+class TestMonteCarlo(unittest.TestCase):
+    WorldDataCont = DataManager.restore_from_pickle(PKL_WORLD_PATH)
+    DataManager.migrate_forest_layout(WorldDataCont)
+    DataManager.create_exog_change_tensor(WorldDataCont)
+    parameters = [
+        UncertainParameter(domain="Demand", column=Domains.Demand.elasticity_price, distribution="normal",
+                           arguments={"loc": 1, "scale": 0.1}),
+        UncertainParameter(domain="ExogChangeDemand", column=Domains.ExogChangeDemand.growth_rate_gdp,
+                           distribution="uniform", arguments={"low": -0.01, "high": 0.01}, mode="shift",
+                           per_row=True)]
+
+    def test_perturb_world_data(self):
+        base_elasticity = self.WorldDataCont.Demand.data_aligned[Domains.Demand.elasticity_price].copy()
+        base_tensor = self.WorldDataCont.ExogChangeDemand.data_tensor.copy()
+        sample_data, draws = perturb_world_data(self.WorldDataCont, self.parameters, seed=1, sample=3)
+        sample_data_repeated, draws_repeated = perturb_world_data(self.WorldDataCont, self.parameters, seed=1, sample=3)
+        _, draws_other = perturb_world_data(self.WorldDataCont, self.parameters, seed=1, sample=4)
+
+        for name, draw in draws.items():
+            np.testing.assert_array_equal(draw, draws_repeated[name])
+            self.assertFalse(np.array_equal(draw, draws_other[name]))
+
+        # Base data unchanged, unperturbed exogenous change shared
+        np.testing.assert_array_equal(
+            self.WorldDataCont.Demand.data_aligned[Domains.Demand.elasticity_price], base_elasticity)
+        np.testing.assert_array_equal(self.WorldDataCont.ExogChangeDemand.data_tensor, base_tensor)
+        self.assertIs(sample_data.ExogChangeSupply, self.WorldDataCont.ExogChangeSupply)
+        self.assertIsNot(sample_data.ExogChangeDemand, self.WorldDataCont.ExogChangeDemand)
+        # Updated domains and world prices copied, read-only data (IO matrices, regions, commodities) shared
+        for domain in ["Demand", "Supply", "Forest", "ManufactureCoefficients", "WorldPrices"]:
+            self.assertIsNot(sample_data[domain], self.WorldDataCont[domain])
+        self.assertIsNot(sample_data.Supply.data_aligned, self.WorldDataCont.Supply.data_aligned)
+        self.assertIs(sample_data.ManufactureCoefficients.ioMatrix, self.WorldDataCont.ManufactureCoefficients.ioMatrix)
+        self.assertIs(sample_data.Regions, self.WorldDataCont.Regions)
+        self.assertIs(sample_data.Commodities, self.WorldDataCont.Commodities)
+        self.assertIs(sample_data.data_aligned, self.WorldDataCont.data_aligned)
+
+        np.testing.assert_allclose(sample_data.Demand.data_aligned[Domains.Demand.elasticity_price],
+                                   base_elasticity * draws[f"Demand.{Domains.Demand.elasticity_price}"])
+        field_num = sample_data.ExogChangeDemand.tensor_fields[Domains.ExogChangeDemand.growth_rate_gdp]
+        np.testing.assert_allclose(
+            sample_data.ExogChangeDemand.data_tensor[:, :, field_num],
+            base_tensor[:, :, field_num] + draws[f"ExogChangeDemand.{Domains.ExogChangeDemand.growth_rate_gdp}"])
+
+    def test_perturb_mixed_parameters(self):
+        # Exogenous change parameters listed after parameters of other domains are perturbed in the tensor
+        parameters = [
+            UncertainParameter(domain="Supply", column=Domains.Supply.elasticity_price, distribution="normal",
+                               arguments={"loc": 1, "scale": 0.1}, per_row=True),
+            UncertainParameter(domain="ExogChangeDemand", column=Domains.ExogChangeDemand.growth_rate_gdp,
+                               distribution="uniform", arguments={"low": -0.01, "high": 0.01}, mode="shift",
+                               per_row=True),
+            UncertainParameter(domain="Demand", column=Domains.Demand.elasticity_price, distribution="normal",
+                               arguments={"loc": 1, "scale": 0.1}),
+            UncertainParameter(domain="ExogChangeSupply", column=Domains.ExogChangeSupply.growth_rate_upper_bound,
+                               distribution="normal", arguments={"loc": 1, "scale": 0.1})]
+        base_demand_aligned = self.WorldDataCont.ExogChangeDemand.data_aligned
+        sample_data, draws = perturb_world_data(self.WorldDataCont, parameters, seed=1, sample=3)
+
+        for parameter, mode in [(parameters[1], "shift"), (parameters[3], "scale")]:
+            base_domain = self.WorldDataCont[parameter.domain]
+            field_num = base_domain.tensor_fields[parameter.column]
+            base_values = base_domain.data_tensor[:, :, field_num]
+            draw = draws[f"{parameter.domain}.{parameter.column}"]
+            np.testing.assert_allclose(sample_data[parameter.domain].data_tensor[:, :, field_num],
+                                       base_values + draw if mode == "shift" else base_values * draw)
+            self.assertFalse(np.array_equal(sample_data[parameter.domain].data_tensor[:, :, field_num], base_values))
+        self.assertIs(sample_data.ExogChangeDemand.data_aligned, base_demand_aligned)
+        self.assertIs(sample_data.ManufactureCoefficients.ioMatrix, self.WorldDataCont.ManufactureCoefficients.ioMatrix)
+
+    def test_row_draws(self):
+        _, draws = perturb_world_data(self.WorldDataCont, self.parameters, seed=1, sample=3)
+        row_draws = get_row_draws(3, self.parameters, draws)
+        name = f"ExogChangeDemand.{Domains.ExogChangeDemand.growth_rate_gdp}"
+
+        # Only the parameter drawn for each row, all drawn values
+        self.assertEqual(list(row_draws.columns),
+                         [MonteCarloParameters.SAMPLE_COLNAME.value] + MonteCarloParameters.DRAW_COLUMNS.value)
+        self.assertEqual(set(row_draws["Parameter"]), {name})
+        self.assertTrue((row_draws[MonteCarloParameters.SAMPLE_COLNAME.value] == 3).all())
+        np.testing.assert_array_equal(row_draws["Row"], np.arange(len(draws[name])))
+        np.testing.assert_array_equal(row_draws["Draw"], draws[name])
+        self.assertIsNone(get_row_draws(3, self.parameters[:1], draws))
+
+
+if __name__ == '__main__':
+    unittest.main()
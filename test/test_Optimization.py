@@ -0,0 +1,534 @@
+import unittest
+import logging
+from copy import deepcopy
+from types import SimpleNamespace
+import numpy as np
+import scipy.sparse as sp
+import cvxpy as cp
+
+from TiMBA.parameters import PKL_WORLD_PATH, PKL_ADD_INFO_PATH, PKL_WORLDPRICE_PATH
+from TiMBA.parameters.Domains import Domains
+from TiMBA.parameters.Defines import VarNames, SolverParameters, ConversionParameters
+from TiMBA.data_management.DataManager import DataManager
+from TiMBA.logic.model import TiMBA
+from TiMBA.logic.model_helpers import (get_material_balance_row_index, extract_product_groups,
+                                       production_price_calculation, transport_cost_calculation)
+from TiMBA.user_io.default_parameters import user_input
+from TiMBA.data_management.ParameterCollector import ParameterCollector
+from TiMBA.logic.osqp_backend import (OSQPProblem, get_osqp_coefficient_matrix, osqp_global_material_balance,
+                                     osqp_primal_warm_start)
+
+
+class TestOptimizationStructure(unittest.TestCase):
+    WorldDataCont = DataManager.restore_from_pickle(PKL_WORLD_PATH)
+    AddInfoCont = DataManager.restore_from_pickle(PKL_ADD_INFO_PATH)
+    WorldPriceCont = DataManager.restore_from_pickle(PKL_WORLDPRICE_PATH)
+    UserData = ParameterCollector(user_input=user_input)
+
+    model = TiMBA(Data=WorldDataCont,
+                  UserOptions=UserData,
+                  AdditionalInfo=AddInfoCont,
+                  WorldPriceData=WorldPriceCont,
+                  LogHandler=logging.getLogger(__name__),
+                  ResultHandler=None)
+
+    def test_io_coefficient_index(self):
+        io_matrix = self.WorldDataCont.ManufactureCoefficients.ioMatrix
+        io_rows, io_cols = self.model.get_io_coefficient_index()
+        io_support = np.zeros(io_matrix.shape, dtype=bool)
+        io_support[io_rows, io_cols] = True
+
+        self.assertFalse(np.any(io_matrix[~io_support]))
+
+    def test_material_balance_structure(self):
+        commodity_vector = np.array(self.WorldDataCont.data_aligned[Domains.Commodities.commodity_code])
+        commodities = list(self.WorldDataCont.Commodities.data[Domains.Commodities.commodity_code])
+        DOMAIN_LEN = len(commodity_vector)
+        MB_LEN = DOMAIN_LEN - len(commodities)
+        row_index, commodity_len = get_material_balance_row_index(commodity_vector=commodity_vector[:MB_LEN],
+                                                                  commodity_list=commodities)
+        material_balance_structure = self.model.get_material_balance_structure(DOMAIN_LEN=DOMAIN_LEN,
+                                                                               row_index=row_index)
+
+        self.assertEqual(sorted(row_index), list(range(MB_LEN)))
+        self.assertEqual(list(np.repeat(commodities, commodity_len)), list(commodity_vector[row_index]))
+        self.assertEqual(material_balance_structure["domain_matrix"].shape, (MB_LEN, 5 * DOMAIN_LEN))
+        self.assertEqual(material_balance_structure["io_weight_matrix"].shape, (MB_LEN, DOMAIN_LEN))
+
+    def test_material_balance_rows(self):
+        MB_LEN = len(self.WorldDataCont.data_aligned) - len(self.WorldDataCont.Commodities.data)
+        material_balance = self.model.UserOptions.material_balance
+        try:
+            for material_balance_type, constraint_num in [(VarNames.C_SPECIFIC_MB.value, 1),
+                                                          (VarNames.RC_SPECIFIC_MB.value, 1),
+                                                          (VarNames.RCG_SPECIFIC_MB.value, 5)]:
+                self.model.UserOptions.material_balance = material_balance_type
+                material_balance_rows = self.model.get_material_balance_rows()
+
+                self.assertEqual(len(material_balance_rows), constraint_num)
+                self.assertEqual(sorted(np.concatenate(material_balance_rows)), list(range(MB_LEN)))
+        finally:
+            self.model.UserOptions.material_balance = material_balance
+
+    def test_region_aggregation(self):
+        region_vector = np.array(self.WorldDataCont.data_aligned[Domains.Regions.region_code])
+        harvest_regions = list(self.WorldDataCont.Regions.data[Domains.Regions.region_code].iloc[:-1])
+        region_aggregation, region_start_index = self.model.get_region_aggregation()
+
+        self.assertEqual(region_aggregation.shape, (len(harvest_regions), len(region_vector)))
+        for row, region in enumerate(harvest_regions):
+            region_index = np.nonzero(region_vector == region)[0]
+            self.assertEqual(list(region_aggregation[row].indices), list(region_index))
+            self.assertEqual(region_start_index[row], region_index.min())
+
+
+    def test_global_material_balance(self):
+        DOMAIN_LEN = len(self.WorldDataCont.data_aligned)
+        constraint_data = self.model.get_constraint_data()
+        opt_quantity = cp.Variable((5 * DOMAIN_LEN, 1))
+        opt_quantity.value = np.random.default_rng(0).uniform(0, 100, (5 * DOMAIN_LEN, 1))
+
+        constraints = []
+        self.model.constraint_global_material_balance(constraints, {}, [0], opt_quantity, constraint_data, DOMAIN_LEN)
+        problem = OSQPProblem(NUM_VARIABLES=5 * DOMAIN_LEN)
+        osqp_global_material_balance(problem, {}, [0],
+                                     self.model.get_global_material_balance_structure(DOMAIN_LEN=DOMAIN_LEN),
+                                     constraint_data["io_matrix"], self.model.get_io_coefficient_index(), DOMAIN_LEN)
+
+        # Rows of the osqp backend equal lhs - rhs of the cvxpy constraints
+        np.testing.assert_allclose(problem.constraint_blocks[0][0] @ opt_quantity.value.ravel(),
+                                   [constraint.expr.value.item() for constraint in constraints], rtol=1e-9, atol=1e-6)
+
+
+class TestVectorizedConstraints(unittest.TestCase):
+    """
+    Compares the vectorized constraints with the per-commodity and per-region constraints of former model versions
+    (rebuilt below as reference). The base period is solved once with each variant.
+    """
+    UserData = ParameterCollector(user_input=user_input)
+
+    def setup_base_period(self, material_balance: str):
+        UserData = deepcopy(self.UserData)
+        UserData.material_balance = material_balance
+        model = TiMBA(Data=DataManager.restore_from_pickle(PKL_WORLD_PATH),
+                      UserOptions=UserData,
+                      AdditionalInfo=DataManager.restore_from_pickle(PKL_ADD_INFO_PATH),
+                      WorldPriceData=DataManager.restore_from_pickle(PKL_WORLDPRICE_PATH),
+                      LogHandler=logging.getLogger(__name__),
+                      ResultHandler=None)
+        model.present_period = model.period_df["Period"].iloc[0]
+        model.period_length = model.period_df["PeriodLength"].iloc[0]
+        model.actual_year = model.period_df["ActualYear"].iloc[0]
+        model.base_period_compute(capped_prices=False)
+        model.loop_slope_intercept_calculation(constant_prices=False, constant_slopes=False, constant_intercepts=False)
+        model.vectorize_domains()
+        return model
+
+    @staticmethod
+    def solve(opt_quantity: cp.Variable, slope: np.ndarray, intercept: np.ndarray, constraints: list):
+        objective_function = cp.multiply(intercept, opt_quantity) + 1 / 2 * cp.multiply(slope, cp.square(opt_quantity))
+        problem = cp.Problem(cp.Maximize(cp.sum(objective_function)), constraints)
+        problem.solve(solver=cp.OSQP,
+                      max_iter=SolverParameters.MAX_ITERATION_UNIT_TEST.value,
+                      eps_abs=SolverParameters.ABS_ACCURACY_UNIT_TEST.value,
+                      eps_rel=SolverParameters.REL_ACCURACY_UNIT_TEST.value)
+        return problem
+
+    @staticmethod
+    def get_row_values(constraint_values: list, row_index: np.ndarray, ROW_LEN: int):
+        # Rows with a negative index (e.g. rows without product of the group) are not compared
+        values = np.concatenate([np.ravel(value) for value in constraint_values])
+        row_values = np.full(ROW_LEN, np.nan)
+        row_values[row_index[row_index >= 0]] = values[row_index >= 0]
+        return row_values
+
+    def assert_constraint_equivalence(self, model: TiMBA, constraint_name: str, row_index: np.ndarray,
+                                      reference_constraint):
+        """
+        Checks that the vectorized constraint (constraint_name) and the reference constraints define the same rows: the
+        constraints are affine, rows with equal values at the origin and at random points have equal coefficients
+        (almost surely). The optimal objective of the base period is compared as well. Optimized quantities and dual
+        values are not compared, as they are not unique within the solver accuracy.
+        :param model: model prepared for the optimization of the base period
+        :param constraint_name: name of the vectorized constraint in constraints_position
+        :param row_index: row index (aligned index or region index) of the vectorized constraint rows
+        :param reference_constraint: function returning the reference constraints and their row index
+        """
+        (DOMAIN_LEN, ALL_DOMAINS_LEN, opt_quantity, slope, intercept, constraints, constraints_position, _,
+         _) = model.setup_optimization_constraints(dynamization_activated=True)
+        start, end = constraints_position[constraint_name]
+        reference_constraints, reference_row_index = reference_constraint(model, opt_quantity, DOMAIN_LEN)
+        ROW_LEN = max(row_index.max(), reference_row_index.max()) + 1
+
+        self.assertEqual({type(constraint) for constraint in constraints[start:end]},
+                         {type(constraint) for constraint in reference_constraints})
+        rng = np.random.default_rng(0)
+        # Optimized quantities are nonnegative
+        for point in [np.zeros((ALL_DOMAINS_LEN, 1)), rng.uniform(0, 100, (ALL_DOMAINS_LEN, 1)),
+                      rng.uniform(0, 10000, (ALL_DOMAINS_LEN, 1))]:
+            opt_quantity.value = point
+            np.testing.assert_allclose(
+                self.get_row_values([constraint.expr.value for constraint in constraints[start:end]], row_index,
+                                    ROW_LEN),
+                self.get_row_values([constraint.expr.value for constraint in reference_constraints],
+                                    reference_row_index, ROW_LEN), rtol=1e-9, atol=1e-6)
+
+        objective_value = self.solve(opt_quantity, slope, intercept, constraints).value
+        reference_objective_value = self.solve(opt_quantity, slope, intercept,
+                                               constraints[:start] + reference_constraints + constraints[end:]).value
+        np.testing.assert_allclose(objective_value, reference_objective_value, rtol=1e-5)
+
+    @staticmethod
+    def reference_c_specific_material_balance(model: TiMBA, opt_quantity: cp.Variable, DOMAIN_LEN: int):
+        # Commodity specific material balance: one constraint for each commodity over all regions (zy excluded)
+        (_, _, _, _, _, raw_prod, interm_prod, fin_prod, fuelw, othindrnd) = extract_product_groups(
+            world_data=model.Data, commodity_data=model.Data.Commodities, region_data=model.Data.Regions,
+            all_regions=False, only_commodity_codes=False)
+        MB_LEN = DOMAIN_LEN - model.Data.Commodities.df_length
+        io_matrix = sp.csr_matrix(model.Data.ManufactureCoefficients.ioMatrix)[:MB_LEN, :MB_LEN]
+        manuS_opt_quantity = io_matrix @ opt_quantity[3 * DOMAIN_LEN: 3 * DOMAIN_LEN + MB_LEN]
+        commodity_vector = np.array(model.Data.data_aligned[Domains.Commodities.commodity_code].iloc[:MB_LEN])
+
+        constraints, row_index = [], []
+        for commodity in model.Data.Commodities.data[Domains.Commodities.commodity_code]:
+            commodity_index = np.nonzero(commodity_vector == commodity)[0]
+            demand, export, imports, manuD, supply = [opt_quantity[domain_num * DOMAIN_LEN + commodity_index]
+                                                      for domain_num in range(5)]
+            manuS = manuS_opt_quantity[commodity_index]
+
+            commodity_constraints = []
+            if commodity in raw_prod:
+                commodity_constraints += [imports + supply == manuS + export]
+            if commodity == fuelw:
+                commodity_constraints += [imports + supply == demand + export]
+            if commodity == othindrnd:
+                commodity_constraints += [supply == demand]
+            if commodity in interm_prod:
+                commodity_constraints += [imports + manuD == manuS + export]
+            if commodity in fin_prod:
+                commodity_constraints += [imports + manuD == demand + export]
+            constraints += commodity_constraints
+            row_index += [commodity_index] * len(commodity_constraints)
+        return constraints, np.concatenate(row_index)
+
+    @staticmethod
+    def reference_max_harvest(model: TiMBA, opt_quantity: cp.Variable, DOMAIN_LEN: int):
+        # Maximal harvest: one constraint for each region (zy excluded)
+        ratio_inventory_drain = DataManager.get_forest_aligned(model.Data, Domains.Forest.ratio_inventory_drain)
+        forest_stock = DataManager.get_forest_aligned(model.Data, Domains.Forest.forest_stock)
+        region_vector = np.array(model.Data.data_aligned[Domains.Regions.region_code])
+
+        constraints = []
+        for region in model.Data.Regions.data[Domains.Regions.region_code].iloc[:model.Data.Regions.df_length - 1]:
+            region_index = np.nonzero(region_vector == region)[0]
+            total_harvest = ratio_inventory_drain[region_index.min()] * cp.sum(
+                cp.multiply(opt_quantity[4 * DOMAIN_LEN + region_index.min(): 4 * DOMAIN_LEN + region_index.max() + 1],
+                            model.Data.Forest.fraction_fuelwood_aligned[region_index].reshape(-1, 1))
+            ) / ConversionParameters.MIO_FACTOR.value
+            constraints += [total_harvest <= forest_stock[region_index.min()]]
+        return constraints, np.arange(len(constraints))
+
+    def test_max_harvest(self):
+        model = self.setup_base_period(VarNames.C_SPECIFIC_MB.value)
+        self.assert_constraint_equivalence(model, VarNames.MAX_HARVEST.value,
+                                           np.arange(model.Data.Regions.df_length - 1), self.reference_max_harvest)
+
+    @staticmethod
+    def reference_region_material_balance(model: TiMBA, opt_quantity: cp.Variable, DOMAIN_LEN: int):
+        # Region and commodity (RC_specific_MB) or region and commodity group (RCG_specific_MB) specific material
+        # balance: constraints for each region (zy excluded)
+        (raw_prod_vector, interm_prod_vector, fin_prod_vector, fuelw_vector, othindrnd_vector,
+         raw_prod, interm_prod, fin_prod, fuelw, othindrnd) = extract_product_groups(
+            world_data=model.Data, commodity_data=model.Data.Commodities, region_data=model.Data.Regions,
+            all_regions=False, only_commodity_codes=False)
+        commodities = np.array(model.Data.Commodities.data[Domains.Commodities.commodity_code])
+        io_matrix = sp.csr_matrix(model.Data.ManufactureCoefficients.ioMatrix)
+        region_vector = np.array(model.Data.data_aligned[Domains.Regions.region_code])
+
+        constraints, row_index = [], []
+        for region in model.Data.Regions.data[Domains.Regions.region_code].iloc[:model.Data.Regions.df_length - 1]:
+            region_index = np.nonzero(region_vector == region)[0]
+            region_index_min, region_index_max = region_index.min(), region_index.max() + 1
+            io_matrix_region = io_matrix[region_index_min:region_index_max, region_index_min:region_index_max].toarray()
+            demand, export, imports, manuD, supply = [
+                opt_quantity[domain_num * DOMAIN_LEN + region_index_min: domain_num * DOMAIN_LEN + region_index_max]
+                for domain_num in range(5)]
+            manuS = io_matrix_region @ manuD
+
+            if model.UserOptions.material_balance == VarNames.RC_SPECIFIC_MB.value:
+                for commodity_num, commodity in enumerate(commodities):
+                    help_vector = np.where(commodities == commodity, 1, 0).reshape(-1, 1)
+                    manuS_commodity = cp.sum(cp.multiply(manuS, help_vector))
+                    (demand_commodity, export_commodity, import_commodity, manu_commodity,
+                     supply_commodity) = [domain_opt[commodity_num] for domain_opt in [demand, export, imports,
+                                                                                         manuD, supply]]
+                    commodity_constraints = []
+                    if commodity in raw_prod:
+                        commodity_constraints += [import_commodity + supply_commodity ==
+                                                  manuS_commodity + export_commodity]
+                    if commodity == fuelw:
+                        commodity_constraints += [import_commodity + supply_commodity ==
+                                                  demand_commodity + export_commodity]
+                    if commodity == othindrnd:
+                        commodity_constraints += [supply_commodity == demand_commodity]
+                    if commodity in interm_prod:
+                        commodity_constraints += [import_commodity + manu_commodity ==
+                                                  manuS_commodity + export_commodity]
+                    if commodity in fin_prod:
+                        commodity_constraints += [import_commodity + manu_commodity ==
+                                                  demand_commodity + export_commodity]
+                    constraints += commodity_constraints
+                    row_index += [[region_index_min + commodity_num]] * len(commodity_constraints)
+            else:
+                group_constraints = [
+                    (cp.multiply(imports, raw_prod_vector) + cp.multiply(supply, raw_prod_vector) ==
+                     cp.multiply(manuS, raw_prod_vector) + cp.multiply(export, raw_prod_vector), raw_prod_vector),
+                    (cp.multiply(imports, interm_prod_vector) + cp.multiply(manuD, interm_prod_vector) ==
+                     cp.multiply(manuS, interm_prod_vector) + cp.multiply(export, interm_prod_vector),
+                     interm_prod_vector),
+                    (cp.multiply(imports, fin_prod_vector) + cp.multiply(manuD, fin_prod_vector) ==
+                     cp.multiply(demand, fin_prod_vector) + cp.multiply(export, fin_prod_vector), fin_prod_vector),
+                    (cp.multiply(imports, fuelw_vector) + cp.multiply(supply, fuelw_vector) ==
+                     cp.multiply(demand, fuelw_vector) + cp.multiply(export, fuelw_vector), fuelw_vector),
+                    (cp.multiply(supply, othindrnd_vector) == cp.multiply(demand, othindrnd_vector),
+                     othindrnd_vector)]
+                for constraint, group_vector in group_constraints:
+                    constraints += [constraint]
+                    # Rows of products outside the group are trivial (0 == 0)
+                    row_index += [np.where(group_vector.ravel() == 1, region_index_min + np.arange(len(commodities)),
+                                           -1)]
+        return constraints, np.concatenate(row_index)
+
+    def test_c_specific_material_balance(self):
+        model = self.setup_base_period(VarNames.C_SPECIFIC_MB.value)
+        self.assert_constraint_equivalence(model, VarNames.MATERIAL_BALANCE.value,
+                                           np.concatenate(model.get_material_balance_rows()),
+                                           self.reference_c_specific_material_balance)
+
+    def test_region_material_balance(self):
+        for material_balance in [VarNames.RC_SPECIFIC_MB.value, VarNames.RCG_SPECIFIC_MB.value]:
+            with self.subTest(material_balance=material_balance):
+                model = self.setup_base_period(material_balance)
+                self.assert_constraint_equivalence(model, VarNames.MATERIAL_BALANCE.value,
+                                                   np.concatenate(model.get_material_balance_rows()),
+                                                   self.reference_region_material_balance)
+
+
+def reference_production_price_calculation(world_data, capped_prices: bool):
+    """
+    Per-cell loop over regions and commodities of former model versions computing production prices (values are
+    collected cell by cell).
+    :return: production costs, raw material costs and net manufacturing costs
+    """
+    (raw_prod, interm_prod, fin_prod, fuelw, othindrnd) = extract_product_groups(
+        world_data=world_data, commodity_data=world_data.Commodities, region_data=world_data.Regions,
+        all_regions=False, only_commodity_codes=True)
+    SupplyData = world_data.Supply.data_aligned
+    io_matrix = sp.csr_matrix(world_data.ManufactureCoefficients.ioMatrix).toarray()
+    import_price = np.array(world_data.TransportationImport.data_aligned[Domains.TransportationImport.price],
+                            dtype=float)
+    net_manufacturing_cost = np.array(
+        world_data.ManufactureCost.data_aligned[Domains.ManufactureCost.net_manufacturing_cost], dtype=float)
+    region_vector = np.array(world_data.data_aligned[Domains.Regions.region_code])
+    commodity_vector = np.array(world_data.data_aligned[Domains.Commodities.commodity_code])
+
+    # Raw material costs for final products based on supply and import prices
+    supply_price_collector = []
+    for region in world_data.Regions.data[Domains.Regions.region_code]:
+        help_matrix = SupplyData[SupplyData[Domains.Supply.region_code] == region]
+        for commodity_index, commodity, supply_price in zip(help_matrix.index, help_matrix[Domains.Supply.commodity_code],
+                                                            help_matrix[Domains.Supply.price]):
+            if (commodity in raw_prod) & (float(supply_price) == 0):
+                supply_price_collector.append(import_price[commodity_index])
+            else:
+                supply_price_collector.append(float(supply_price))
+    matrix_mult = io_matrix.T @ np.array(supply_price_collector)
+
+    # Import prices for intermediate products for non-producing countries
+    import_price_collector = []
+    for region in world_data.Regions.data[Domains.Regions.region_code]:
+        for commodity_index in np.nonzero(region_vector == region)[0]:
+            if (commodity_vector[commodity_index] in interm_prod) & (matrix_mult[commodity_index] == 0):
+                import_price_collector.append(import_price[commodity_index])
+            else:
+                import_price_collector.append(0)
+    raw_material_cost = io_matrix.T @ (matrix_mult + np.array(import_price_collector) + net_manufacturing_cost +
+                                       np.array(SupplyData[Domains.Supply.price], dtype=float))
+
+    production_cost = raw_material_cost + net_manufacturing_cost
+    if capped_prices:
+        delta_production_cost = import_price - production_cost
+        delta_production_cost[delta_production_cost > 0] = 0
+        net_manufacturing_cost = net_manufacturing_cost + delta_production_cost
+        net_manufacturing_cost[net_manufacturing_cost < 0] = 0
+    return production_cost, raw_material_cost, net_manufacturing_cost
+
+
+class TestProductionPriceCalculation(unittest.TestCase):
+
+    def test_production_price_calculation(self):
+        for capped_prices in [False, True]:
+            with self.subTest(capped_prices=capped_prices):
+                world_data = DataManager.restore_from_pickle(PKL_WORLD_PATH)
+                transport_cost_calculation(ImportData=world_data.TransportationImport.data_aligned,
+                                           ExportData=world_data.TransportationExport.data_aligned,
+                                           WorldPrice=world_data.WorldPrices.data,
+                                           RegionsData=world_data.Regions.df_length)
+                (reference_production_cost, reference_raw_material_cost,
+                 reference_net_manufacturing_cost) = reference_production_price_calculation(world_data, capped_prices)
+
+                ManufactureCostData = world_data.ManufactureCost.data_aligned
+                production_cost = production_price_calculation(
+                    SimpleNamespace(Data=world_data),
+                    AlignedData=world_data.data_aligned,
+                    RegionsData=world_data.Regions.data,
+                    SupplyData=world_data.Supply.data_aligned,
+                    ImportData=world_data.TransportationImport.data_aligned,
+                    ioMatrix=world_data.ManufactureCoefficients.ioMatrix,
+                    ManufactureCostData=ManufactureCostData,
+                    capped_prices=capped_prices)
+
+                np.testing.assert_allclose(np.array(production_cost, dtype=float), reference_production_cost,
+                                           rtol=1e-9, atol=1e-9)
+                np.testing.assert_allclose(np.array(ManufactureCostData[VarNames.RAW_MATERIAL_COST.value],
+                                                    dtype=float), reference_raw_material_cost, rtol=1e-9, atol=1e-9)
+                np.testing.assert_allclose(np.array(ManufactureCostData[Domains.ManufactureCost.net_manufacturing_cost],
+                                                    dtype=float), reference_net_manufacturing_cost, rtol=1e-9,
+                                           atol=1e-9)
+
+
+class TestOSQPBackend(unittest.TestCase):
+    solver_settings = {"verbose": False, "eps_abs": 1e-9, "eps_rel": 1e-9, "polish": True, "warm_start": False}
+
+    @staticmethod
+    def build_problem(linear_coefficient):
+        # min 1/2 (x1^2 + x2^2) + q'x  s.t.  x1 + x2 == 2, 0 <= x1 <= 0.5
+        problem = OSQPProblem(NUM_VARIABLES=2)
+        problem.set_objective(quadratic_coefficient=np.ones(2), linear_coefficient=linear_coefficient)
+        problem.add_constraint(A=get_osqp_coefficient_matrix([0, 0], [0, 1], [1, 1], 1, 2), lower=[2], upper=[2],
+                               name="balance")
+        problem.add_constraint(A=get_osqp_coefficient_matrix([0], [0], [1], 1, 2), lower=[0], upper=[0.5],
+                               name="bound")
+        return problem
+
+    def test_osqp_solution_and_dual_values(self):
+        problem = self.build_problem(linear_coefficient=[-2, -2])
+        results = problem.solve(solver_settings=self.solver_settings)
+
+        np.testing.assert_allclose(results.x, [0.5, 1.5], atol=1e-6)
+        np.testing.assert_allclose(problem.constraints[0].dual_value, [[0.5]], atol=1e-6)
+        np.testing.assert_allclose(problem.constraints[1].dual_value, [[1.0]], atol=1e-6)
+        self.assertEqual(problem.num_equalities, 1)
+        self.assertEqual(problem.num_inequalities, 1)
+
+    def test_osqp_solver_update(self):
+        previous_problem = self.build_problem(linear_coefficient=[-2, -2])
+        previous_problem.solve(solver_settings=self.solver_settings)
+        problem = self.build_problem(linear_coefficient=[-2, -1])
+        results = problem.solve(solver_settings=self.solver_settings, previous_problem=previous_problem)
+
+        self.assertIs(problem.solver, previous_problem.solver)
+        np.testing.assert_allclose(results.x, [0.5, 1.5], atol=1e-6)
+        np.testing.assert_allclose(problem.constraints[0].dual_value, [[-0.5]], atol=1e-6)
+
+    def test_osqp_warm_start(self):
+        previous_problem = self.build_problem(linear_coefficient=[-2, -2])
+        previous_problem.solve(solver_settings=self.solver_settings)
+        cold_start_problem = self.build_problem(linear_coefficient=[-2, -1.9])
+        cold_start_results = cold_start_problem.solve(solver_settings=self.solver_settings)
+
+        problem = self.build_problem(linear_coefficient=[-2, -1.9])
+        problem.set_warm_start(x=previous_problem.results.x, y=problem.get_dual_warm_start(previous_problem))
+        results = problem.solve(solver_settings=self.solver_settings)
+
+        np.testing.assert_allclose(problem.warm_start_y, previous_problem.dual_value)
+        np.testing.assert_allclose(results.x, cold_start_results.x, atol=1e-6)
+        self.assertLessEqual(results.info.iter, cold_start_results.info.iter)
+        # Iterations are kept in the warm start state (compared with the following period)
+        self.assertEqual(problem.iterations, results.info.iter)
+        self.assertEqual(OSQPProblem.restore_warm_start_state(problem.get_warm_start_state()).iterations,
+                         results.info.iter)
+
+
+class BackendComparisonTiMBA(TiMBA):
+    """
+    TiMBA model setting up the optimization problem of both backends from the same model state in each period. Objective
+    values and constraint violations of both problems are evaluated at random quantities before the period is solved.
+    """
+    POINT_SCALES = [100, 10000]
+
+    def optimization(self, solver_max_iteration: int, solver_rel_accuracy: int, solver_abs_accuracy: int,
+                     dynamization_activated: bool):
+        cvxpy_problem, opt_quantity, constraints, _, opt_ubs, opt_lbs = self.setup_cvxpy_optimization(
+            dynamization_activated=dynamization_activated)
+        osqp_problem, _, _, _, _, ALL_DOMAINS_LEN = self.setup_osqp_optimization(
+            dynamization_activated=dynamization_activated)
+        osqp_problem.assemble()
+        trade_mask = (np.array([], dtype=int) if self.present_period == 0 else
+                      np.array(self.get_trade_bound_deviation_penalty(ALL_DOMAINS_LEN)[1], dtype=int))
+
+        rng = np.random.default_rng(self.present_period)
+        for point_scale in self.POINT_SCALES:
+            opt_quantity.value = rng.uniform(0, point_scale, (ALL_DOMAINS_LEN, 1))
+            # Deviation variables of the osqp backend are set to the deviations from the trade bounds
+            x = osqp_primal_warm_start(osqp_problem, opt_quantity.value.ravel(), opt_lbs, opt_ubs, trade_mask,
+                                       ALL_DOMAINS_LEN)
+            constraint_value = osqp_problem.A @ x
+            osqp_violation = np.maximum(np.maximum(osqp_problem.l - constraint_value,
+                                                   constraint_value - osqp_problem.u), 0)
+            cvxpy_violation = np.concatenate([np.ravel(constraint.violation()) for constraint in constraints])
+            self.backend_values.append({
+                "period": self.present_period,
+                "cvxpy_objective": cvxpy_problem.objective.value,
+                "osqp_objective": - (1 / 2 * x @ (osqp_problem.P @ x) + osqp_problem.q @ x),
+                "cvxpy_violation": np.sort(cvxpy_violation[cvxpy_violation > 1e-9]),
+                "osqp_violation": np.sort(osqp_violation[osqp_violation > 1e-9])})
+
+        super().optimization(solver_max_iteration=solver_max_iteration, solver_rel_accuracy=solver_rel_accuracy,
+                             solver_abs_accuracy=solver_abs_accuracy, dynamization_activated=dynamization_activated)
+
+
+class TestOptimizationBackends(unittest.TestCase):
+    UserData = ParameterCollector(user_input=user_input)
+
+    def compute(self, optimization_backend: str, global_material_balance: bool):
+        UserData = deepcopy(self.UserData)
+        UserData.optimization_backend = optimization_backend
+        UserData.global_material_balance = global_material_balance
+        UserData.max_period = 1
+        model = BackendComparisonTiMBA(Data=DataManager.restore_from_pickle(PKL_WORLD_PATH),
+                                       UserOptions=UserData,
+                                       AdditionalInfo=DataManager.restore_from_pickle(PKL_ADD_INFO_PATH),
+                                       WorldPriceData=DataManager.restore_from_pickle(PKL_WORLDPRICE_PATH),
+                                       LogHandler=logging.getLogger(__name__),
+                                       ResultHandler=None)
+        model.backend_values = []
+        model.compute(max_iteration=SolverParameters.MAX_ITERATION_UNIT_TEST.value,
+                      rel_accuracy=SolverParameters.REL_ACCURACY_UNIT_TEST.value,
+                      abs_accuracy=SolverParameters.ABS_ACCURACY_UNIT_TEST.value,
+                      dynamization_activated=True,
+                      constants=[False, False, False],
+                      capped_prices=False)
+        return model
+
+    def test_osqp_backend_equivalence(self):
+        # Optima of both backends are not unique at the solver accuracy (results of following periods depend on the
+        # trade of the previous period), the optimization problems set up from the same model state are compared
+        for global_material_balance in [False, True]:
+            with self.subTest(global_material_balance=global_material_balance):
+                model = self.compute(VarNames.OSQP_BACKEND.value, global_material_balance)
+
+                self.assertEqual(list(model.Data.OptimizationHelpers.data_periods[
+                                          VarNames.PERIOD_COLNAME.value].unique()), [0, 1])
+                self.assertEqual([backend_values["period"] for backend_values in model.backend_values],
+                                 [0] * len(model.POINT_SCALES) + [1] * len(model.POINT_SCALES))
+                for backend_values in model.backend_values:
+                    np.testing.assert_allclose(backend_values["osqp_objective"], backend_values["cvxpy_objective"],
+                                               rtol=1e-9)
+                    self.assertEqual(len(backend_values["osqp_violation"]), len(backend_values["cvxpy_violation"]))
+                    np.testing.assert_allclose(backend_values["osqp_violation"], backend_values["cvxpy_violation"],
+                                               rtol=1e-9, atol=1e-6)
+
+
+if __name__ == '__main__':
+    unittest.main()